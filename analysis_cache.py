@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for per-file analysis results.
+
+Fragments are keyed by the SHA-256 of the file contents and stored under a
+directory per namespace and parser version, so bumping a parser version
+invalidates every fragment it produced.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional, Set
+
+CACHE_DIR_NAME = '.analysis_cache'
+
+def file_sha256(file_path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash a file in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """Persistent store of analysis fragments keyed by file content."""
+
+    def __init__(self, root: Path, namespace: str, version: str, enabled: bool = True):
+        self.directory = root / CACHE_DIR_NAME / namespace / version
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._used: Set[str] = set()
+
+    def _fragment_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached fragment for key, or None."""
+        path = self._fragment_path(key)
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, fragment: Dict[str, Any]):
+        """Write a fragment atomically so an interrupted run never leaves a torn file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._fragment_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(fragment, f)
+        os.replace(tmp_path, path)
+
+    def get_or_compute(self, file_path: Path, compute: Callable[[Path], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the analysis of file_path, computing and storing it on a miss."""
+        if not self.enabled:
+            self.misses += 1
+            return compute(file_path)
+
+        key = file_sha256(file_path)
+        self._used.add(key)
+        fragment = self.load(key)
+        if fragment is not None:
+            self.hits += 1
+            # Identical content may live under another name
+            fragment['file'] = file_path.name
+            return fragment
+
+        self.misses += 1
+        fragment = compute(file_path)
+        self.store(key, fragment)
+        return fragment
+
+    def prune(self) -> int:
+        """Delete fragments that were not used in this run."""
+        if not self.enabled or not self.directory.exists():
+            return 0
+        removed = 0
+        for path in self.directory.glob('*.json'):
+            if path.stem not in self._used:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        return f"Cache: {self.hits} hits, {self.misses} misses ({total} files)"
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+SQLite store for analysis results with per-run history.
+
+Every pipeline run gets a row in `runs`; tables, columns, indexes, spec
+features, components, file classifications and report rows are stored in
+indexed tables keyed by that run id. Consumers query only what they need,
+and trends over past runs are a single aggregate query.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_STORE_NAME = 'analysis_history.sqlite3'
+
+# Bump when the schema changes incompatibly
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_root TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_project ON runs(project_root, status, id);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    analysis TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (run_id, analysis)
+);
+
+CREATE TABLE IF NOT EXISTS db_tables (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    column_count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_db_tables_name ON db_tables(run_id, name);
+
+CREATE TABLE IF NOT EXISTS db_columns (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    is_primary_key INTEGER NOT NULL,
+    is_foreign_key INTEGER NOT NULL,
+    is_not_null INTEGER NOT NULL,
+    has_default INTEGER NOT NULL,
+    is_unique INTEGER NOT NULL,
+    references_table TEXT,
+    references_column TEXT,
+    on_delete TEXT,
+    PRIMARY KEY (run_id, table_name, position)
+);
+CREATE INDEX IF NOT EXISTS idx_db_columns_references ON db_columns(run_id, references_table);
+
+CREATE TABLE IF NOT EXISTS db_indexes (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    migration TEXT NOT NULL,
+    name TEXT,
+    table_name TEXT NOT NULL,
+    is_unique INTEGER NOT NULL,
+    method TEXT,
+    columns TEXT NOT NULL,
+    has_expressions INTEGER NOT NULL,
+    where_clause TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_db_indexes_table ON db_indexes(run_id, table_name);
+
+CREATE TABLE IF NOT EXISTS documents (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    line_count INTEGER,
+    PRIMARY KEY (run_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS spec_features (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    document INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (run_id, document, position)
+);
+CREATE INDEX IF NOT EXISTS idx_spec_features_phase ON spec_features(run_id, phase);
+
+CREATE TABLE IF NOT EXISTS spec_tables (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    document INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    column_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spec_tables_name ON spec_tables(run_id, name);
+
+CREATE TABLE IF NOT EXISTS spec_components (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    document INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    first_line INTEGER,
+    first_offset INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_spec_components_name ON spec_components(run_id, name);
+
+CREATE TABLE IF NOT EXISTS files (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (run_id, section, category, position)
+);
+
+CREATE TABLE IF NOT EXISTS report_rows (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    specification TEXT NOT NULL,
+    status TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    gap TEXT,
+    details TEXT,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_report_rows_phase ON report_rows(run_id, phase);
+"""
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def iter_file_classifications(structure: Dict[str, Any]) -> Iterator[Tuple[str, str, int, str]]:
+    """Flatten an implementation structure into (section, category, position, path)."""
+    for app, categories in structure.get('apps', {}).items():
+        for category, paths in categories.items():
+            for position, path in enumerate(paths):
+                yield f"apps/{app}", category, position, path
+    for pkg, categories in structure.get('packages', {}).items():
+        for category, paths in categories.items():
+            for position, path in enumerate(paths):
+                yield f"packages/{pkg}", category, position, path
+    for category, paths in structure.get('database', {}).items():
+        for position, path in enumerate(paths):
+            yield 'database', category, position, path
+
+class AnalysisStore:
+    """Run-keyed analysis results in one SQLite file.
+
+    Writes are serialized with a lock so pipeline stages on different
+    threads can share a store.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{path} uses store schema {version}; this version understands up to {SCHEMA_VERSION}")
+        with self._lock, self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Runs
+
+    def begin_run(self, project_root: Path) -> int:
+        with self._lock, self.connection:
+            cursor = self.connection.execute('INSERT INTO runs (project_root, started_at) VALUES (?, ?)',
+                                             (str(project_root), _now()))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int, status: str = 'complete'):
+        with self._lock, self.connection:
+            self.connection.execute('UPDATE runs SET finished_at = ?, status = ? WHERE id = ?',
+                                    (_now(), status, run_id))
+
+    def latest_run(self, project_root: Optional[Path] = None) -> Optional[int]:
+        """Id of the most recent complete run, optionally for one project."""
+        if project_root is None:
+            row = self.connection.execute(
+                "SELECT MAX(id) FROM runs WHERE status = 'complete'").fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT MAX(id) FROM runs WHERE status = 'complete' AND project_root = ?",
+                (str(project_root),)).fetchone()
+        return row[0]
+
+    def runs(self, limit: int = 30) -> List[Dict[str, Any]]:
+        rows = self.connection.execute('SELECT * FROM runs ORDER BY id DESC LIMIT ?', (limit,))
+        return [dict(row) for row in rows]
+
+    # Writing analyses
+
+    def _save_summary(self, run_id: int, analysis: str, summary: Dict[str, Any]):
+        self.connection.execute('INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)',
+                                (run_id, analysis, json.dumps(summary)))
+
+    def save_database(self, run_id: int, database: Dict[str, Any]):
+        """Store the tables, columns and indexes of a database analysis."""
+        tables, columns, indexes = [], [], []
+        for position, table in enumerate(database.get('tables', [])):
+            tables.append((run_id, position, table['name'], table.get('column_count', len(table['columns']))))
+            for column_position, column in enumerate(table['columns']):
+                references = column.get('references') or {}
+                columns.append((run_id, table['name'], column_position, column['name'], column.get('type'),
+                                column.get('is_primary_key', False), column.get('is_foreign_key', False),
+                                column.get('is_not_null', False), column.get('has_default', False),
+                                column.get('is_unique', False), references.get('table'),
+                                references.get('column'), references.get('on_delete')))
+        for migration in database.get('migrations', []):
+            for index in migration.get('indexes', []):
+                indexes.append((run_id, migration['file'], index.get('name'), index['table'],
+                                index.get('unique', False), index.get('method'), json.dumps(index.get('columns', [])),
+                                index.get('has_expressions', False), index.get('where')))
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT INTO db_tables VALUES (?, ?, ?, ?)', tables)
+            self.connection.executemany('INSERT INTO db_columns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', columns)
+            self.connection.executemany('INSERT INTO db_indexes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', indexes)
+            self._save_summary(run_id, 'database', database.get('summary', {}))
+
+    def save_specifications(self, run_id: int, specs: Dict[str, Any]):
+        """Store the documents, features, tables and components of a specification analysis."""
+        documents, features, tables, components = [], [], [], []
+        for document, doc in enumerate(specs.get('documents', [])):
+            phase = doc.get('phase', 'Master')
+            documents.append((run_id, document, doc['file'], phase, doc.get('line_count')))
+            for position, feature in enumerate(doc.get('features', [])):
+                features.append((run_id, document, position, phase, feature['title'], feature['description']))
+            for table in doc.get('tables', []):
+                tables.append((run_id, document, table['name'], len(table.get('columns', []))))
+            for component in doc.get('components', []):
+                components.append((run_id, document, component['name'], component['kind'], component['count'],
+                                   component.get('first_line'), component.get('first_offset')))
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT INTO documents VALUES (?, ?, ?, ?, ?)', documents)
+            self.connection.executemany('INSERT INTO spec_features VALUES (?, ?, ?, ?, ?, ?)', features)
+            self.connection.executemany('INSERT INTO spec_tables VALUES (?, ?, ?, ?)', tables)
+            self.connection.executemany('INSERT INTO spec_components VALUES (?, ?, ?, ?, ?, ?, ?)', components)
+            self._save_summary(run_id, 'specifications', specs.get('summary', {}))
+
+    def save_implementation(self, run_id: int, implementation: Dict[str, Any]):
+        """Store the file classifications and counts of an implementation analysis."""
+        files = [(run_id, *entry) for entry in iter_file_classifications(implementation.get('structure', {}))]
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?)', files)
+            self._save_summary(run_id, 'implementation', {'counts': implementation.get('counts', {}),
+                                                          'summary': implementation.get('summary', {})})
+
+    def clear_report_rows(self, run_id: int):
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM report_rows WHERE run_id = ?', (run_id,))
+
+    def insert_report_rows(self, run_id: int, rows: Iterable[Tuple[int, Dict[str, Any]]],
+                           complete: Callable[[str], bool]):
+        """Add (position, row) report rows; complete(status) decides if a row counts as done."""
+        batch = [(run_id, position, row['phase'], row['specification'], row['status'],
+                  bool(complete(row['status'])), row['gap'], row['details']) for position, row in rows]
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT INTO report_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?)', batch)
+
+    # Reading analyses
+
+    def iter_features(self, run_id: int) -> Iterator[Tuple[str, str, str]]:
+        """(phase, title, description) of every spec feature, in document order, fetched lazily."""
+        cursor = self.connection.execute(
+            'SELECT phase, title, description FROM spec_features WHERE run_id = ? ORDER BY document, position',
+            (run_id,))
+        for row in cursor:
+            yield row['phase'], row['title'], row['description']
+
+    def iter_components(self, run_id: int) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """(phase, document file, component) of every spec component reference, in document order."""
+        cursor = self.connection.execute(
+            'SELECT d.phase, d.file, c.name, c.kind, c.count, c.first_line, c.first_offset '
+            'FROM spec_components c JOIN documents d ON d.run_id = c.run_id AND d.position = c.document '
+            'WHERE c.run_id = ? ORDER BY c.document, c.name, c.kind', (run_id,))
+        for row in cursor:
+            yield row['phase'], row['file'], {'name': row['name'], 'kind': row['kind'], 'count': row['count'],
+                                              'first_line': row['first_line'], 'first_offset': row['first_offset']}
+
+    def tables(self, run_id: int) -> List[Dict[str, Any]]:
+        """Database tables in analysis order, with their column names."""
+        columns: Dict[str, List[str]] = {}
+        for row in self.connection.execute(
+                'SELECT table_name, name FROM db_columns WHERE run_id = ? ORDER BY table_name, position', (run_id,)):
+            columns.setdefault(row['table_name'], []).append(row['name'])
+        return [{'name': row['name'], 'column_count': row['column_count'], 'columns': columns.get(row['name'], [])}
+                for row in self.connection.execute(
+                    'SELECT name, column_count FROM db_tables WHERE run_id = ? ORDER BY position', (run_id,))]
+
+    def files(self, run_id: int, section: str, category: str) -> List[str]:
+        rows = self.connection.execute(
+            'SELECT path FROM files WHERE run_id = ? AND section = ? AND category = ? ORDER BY position',
+            (run_id, section, category))
+        return [row['path'] for row in rows]
+
+    def summary(self, run_id: int, analysis: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute('SELECT summary FROM summaries WHERE run_id = ? AND analysis = ?',
+                                      (run_id, analysis)).fetchone()
+        return json.loads(row['summary']) if row else None
+
+    # Trends
+
+    def completion_history(self, project_root: Optional[Path] = None, limit: int = 30) -> List[Dict[str, Any]]:
+        """Per-phase completion of the last limit complete runs, oldest first."""
+        project_filter = 'AND project_root = ?' if project_root is not None else ''
+        params: Tuple[Any, ...] = (str(project_root), limit) if project_root is not None else (limit,)
+        rows = self.connection.execute(f"""
+            SELECT r.id AS run_id, r.started_at, rr.phase,
+                   COUNT(*) AS total, SUM(rr.complete) AS complete
+            FROM (SELECT id, started_at FROM runs
+                  WHERE status = 'complete' {project_filter}
+                  ORDER BY id DESC LIMIT ?) AS r
+            JOIN report_rows AS rr ON rr.run_id = r.id
+            GROUP BY r.id, rr.phase
+            ORDER BY r.id, rr.phase
+        """, params)
+        return [dict(row) for row in rows]
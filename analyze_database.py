@@ -3,143 +3,411 @@
 Analyze database schema from migration files.
 """
 
+import argparse
 import json
-import re
+import sys
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from analysis_cache import AnalysisCache
+from instrumentation import Metrics, add_metrics_arguments, metrics_path, peak_memory_mb
+from sql_lexer import LEXER_VERSION, Token, parse_sql, parse_sql_stream, tokenize_sql
+
+# Bump whenever analyze_migration_file output changes
+PARSER_VERSION = '1'
+
+# Files above this size are always streamed instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 16 * 1024 * 1024
 
 def extract_tables_from_sql(sql_content: str) -> List[Dict[str, Any]]:
     """Extract table definitions from SQL."""
-    tables = []
-    
-    # Pattern to match CREATE TABLE statements
-    pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\);'
-    matches = re.finditer(pattern, sql_content, re.DOTALL | re.IGNORECASE)
-    
-    for match in matches:
-        table_name = match.group(1)
-        columns_text = match.group(2)
-        
-        # Extract columns
-        columns = []
-        for line in columns_text.split('\n'):
-            line = line.strip()
-            if line and not line.startswith('--') and not line.upper().startswith('CONSTRAINT') and not line.upper().startswith('UNIQUE') and not line.upper().startswith('CHECK'):
-                # Extract column name and type
-                parts = line.split()
-                if len(parts) >= 2 and not parts[0].upper() in ['PRIMARY', 'FOREIGN', 'REFERENCES', 'ON', 'DEFAULT']:
-                    col_name = parts[0].strip(',')
-                    col_type = parts[1].strip(',')
-                    
-                    # Check for constraints
-                    is_primary = 'PRIMARY KEY' in line.upper()
-                    is_foreign = 'REFERENCES' in line.upper()
-                    is_not_null = 'NOT NULL' in line.upper()
-                    has_default = 'DEFAULT' in line.upper()
-                    is_unique = 'UNIQUE' in line.upper()
-                    
-                    columns.append({
-                        'name': col_name,
-                        'type': col_type,
-                        'is_primary_key': is_primary,
-                        'is_foreign_key': is_foreign,
-                        'is_not_null': is_not_null,
-                        'has_default': has_default,
-                        'is_unique': is_unique
-                    })
-        
-        tables.append({
-            'name': table_name,
-            'column_count': len(columns),
-            'columns': columns
-        })
-    
-    return tables
+    return parse_sql(sql_content)['tables']
 
 def extract_indexes_from_sql(sql_content: str) -> List[Dict[str, str]]:
     """Extract index definitions from SQL."""
-    indexes = []
-    
-    pattern = r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)'
-    matches = re.finditer(pattern, sql_content, re.IGNORECASE)
-    
-    for match in matches:
-        indexes.append({
-            'name': match.group(1),
-            'table': match.group(2)
-        })
-    
-    return indexes
+    return parse_sql(sql_content)['indexes']
 
 def extract_functions_from_sql(sql_content: str) -> List[str]:
     """Extract function names from SQL."""
-    functions = []
-    
-    pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(\w+)\s*\('
-    matches = re.finditer(pattern, sql_content, re.IGNORECASE)
-    
-    for match in matches:
-        functions.append(match.group(1))
-    
-    return functions
+    return [function['name'] for function in parse_sql(sql_content)['functions']]
 
 def extract_triggers_from_sql(sql_content: str) -> List[Dict[str, str]]:
     """Extract trigger definitions from SQL."""
-    triggers = []
-    
-    pattern = r'CREATE\s+TRIGGER\s+(\w+)\s+.*?ON\s+(\w+)'
-    matches = re.finditer(pattern, sql_content, re.DOTALL | re.IGNORECASE)
-    
-    for match in matches:
-        triggers.append({
-            'name': match.group(1),
-            'table': match.group(2)
-        })
-    
-    return triggers
+    return parse_sql(sql_content)['triggers']
+
+def extract_policies_from_sql(sql_content: str) -> List[Dict[str, Any]]:
+    """Extract row-level security policy definitions from SQL."""
+    return parse_sql(sql_content)['policies']
 
-def analyze_migration_file(file_path: Path) -> Dict[str, Any]:
+def analyze_migration_file(file_path: Path, streaming: bool = False) -> Dict[str, Any]:
     """Analyze a single migration file."""
-    content = file_path.read_text()
+    if streaming or file_path.stat().st_size > STREAMING_THRESHOLD_BYTES:
+        # Read statements incrementally; data statements are skipped unbuffered
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            parsed = parse_sql_stream(f)
+    else:
+        # Single lexer pass over the file for every kind of object
+        parsed = parse_sql(file_path.read_text())
     
     return {
         'file': file_path.name,
-        'tables': extract_tables_from_sql(content),
-        'indexes': extract_indexes_from_sql(content),
-        'functions': extract_functions_from_sql(content),
-        'triggers': extract_triggers_from_sql(content)
+        'tables': parsed['tables'],
+        'indexes': parsed['indexes'],
+        'functions': [function['name'] for function in parsed['functions']],
+        'function_definitions': parsed['functions'],
+        'triggers': parsed['triggers'],
+        'policies': parsed['policies']
     }
 
-def main():
-    """Main analysis function."""
-    project_root = Path('/home/ubuntu/b2bplus')
+SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+def table_index_definitions(table: Dict[str, Any], indexes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the explicit indexes on a table plus those implied by PRIMARY KEY and UNIQUE."""
+    definitions = [dict(index, implicit=False) for index in indexes if index['table'] == table['name']]
+    
+    implied = []
+    for column in table['columns']:
+        if column['is_primary_key']:
+            implied.append((f"{table['name']}_pkey", [column['name']]))
+        elif column['is_unique']:
+            implied.append((f"{table['name']}_{column['name']}_key", [column['name']]))
+    for constraint in table.get('constraints', []):
+        if constraint['type'] == 'primary_key':
+            implied.append((f"{table['name']}_pkey", constraint['columns']))
+        elif constraint['type'] == 'unique':
+            implied.append((f"{table['name']}_{'_'.join(constraint['columns'])}_key", constraint['columns']))
+    
+    for name, columns in implied:
+        definitions.append({
+            'name': name,
+            'table': table['name'],
+            'unique': True,
+            'method': 'btree',
+            'columns': columns,
+            'has_expressions': False,
+            'where': None,
+            'implicit': True
+        })
+    return definitions
+
+def table_foreign_keys(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return every foreign key on a table as column lists with their references."""
+    foreign_keys = []
+    for column in table['columns']:
+        if column['is_foreign_key']:
+            foreign_keys.append({'columns': [column['name']], 'references': column.get('references')})
+    for constraint in table.get('constraints', []):
+        if constraint['type'] == 'foreign_key' and constraint['columns']:
+            foreign_keys.append({'columns': constraint['columns'], 'references': constraint.get('references')})
+    return foreign_keys
+
+def covers_leading_columns(index: Dict[str, Any], columns: List[str]) -> bool:
+    """Check whether a btree index can serve lookups on columns via its leading columns."""
+    if index['method'] != 'btree' or index['where']:
+        return False
+    return set(index['columns'][:len(columns)]) == set(columns)
+
+def advise_indexes(tables: List[Dict[str, Any]], indexes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cross-check foreign keys against indexes and return ranked advice."""
+    advice = []
+    
+    for table in tables:
+        definitions = table_index_definitions(table, indexes)
+        
+        # Foreign keys without an index on their leading columns
+        for foreign_key in table_foreign_keys(table):
+            if any(covers_leading_columns(index, foreign_key['columns']) for index in definitions):
+                continue
+            reference = foreign_key['references'] or {}
+            cascades = reference.get('on_delete') in ('CASCADE', 'SET NULL', 'SET DEFAULT')
+            columns = foreign_key['columns']
+            detail = f"References {reference.get('table', 'another table')}"
+            if cascades:
+                detail += f" with ON DELETE {reference['on_delete']}; deletes scan {table['name']} sequentially"
+            else:
+                detail += f"; joins and parent deletes scan {table['name']} sequentially"
+            advice.append({
+                'severity': 'high',
+                'kind': 'unindexed_foreign_key',
+                'table': table['name'],
+                'columns': columns,
+                'index': None,
+                'covered_by': None,
+                'detail': detail,
+                'recommendation': f"CREATE INDEX idx_{table['name']}_{'_'.join(columns)} ON {table['name']}({', '.join(columns)});",
+                '_cascades': cascades
+            })
+        
+        # Explicit indexes that repeat another index exactly
+        flagged = set()
+        seen = {}
+        for index in sorted(definitions, key=lambda d: (not d['implicit'], not d['unique'])):
+            signature = (index['method'], tuple(index['columns']), index['where'])
+            if signature not in seen:
+                seen[signature] = index
+                continue
+            if index['implicit']:
+                continue
+            flagged.add(index['name'])
+            advice.append({
+                'severity': 'medium',
+                'kind': 'duplicate_index',
+                'table': table['name'],
+                'columns': index['columns'],
+                'index': index['name'],
+                'covered_by': seen[signature]['name'],
+                'detail': f"Same definition as {seen[signature]['name']}; every write maintains both",
+                'recommendation': f"DROP INDEX {index['name']};",
+                '_cascades': False
+            })
+        
+        # Non-unique indexes whose columns are a prefix of a wider index
+        for index in definitions:
+            if index['implicit'] or index['unique'] or index['name'] in flagged or not index['columns']:
+                continue
+            if index['method'] != 'btree' or index['where'] or index['has_expressions']:
+                continue
+            for other in definitions:
+                if other is index or len(other['columns']) <= len(index['columns']):
+                    continue
+                if other['method'] == 'btree' and not other['where'] and other['columns'][:len(index['columns'])] == index['columns']:
+                    advice.append({
+                        'severity': 'low',
+                        'kind': 'redundant_prefix_index',
+                        'table': table['name'],
+                        'columns': index['columns'],
+                        'index': index['name'],
+                        'covered_by': other['name'],
+                        'detail': f"Leading columns of {other['name']} ({', '.join(other['columns'])}) already serve these lookups",
+                        'recommendation': f"DROP INDEX {index['name']};",
+                        '_cascades': False
+                    })
+                    break
+    
+    advice.sort(key=lambda item: (SEVERITY_ORDER[item['severity']], not item['_cascades'], item['table'], item['columns']))
+    for rank, item in enumerate(advice, 1):
+        del item['_cascades']
+        item['rank'] = rank
+    return advice
+
+# Weights used to rank tables by the per-row cost of their policies
+POLICY_FINDING_WEIGHTS = {
+    'unwrapped_auth_call': 3,
+    'unindexed_subquery': 5,
+    'volatile_function': 3
+}
+
+# Words followed by '(' that are not function calls
+_NON_FUNCTION_WORDS = {'SELECT', 'IN', 'EXISTS', 'ANY', 'ALL', 'AND', 'OR', 'NOT', 'ON', 'WHERE', 'FROM', 'JOIN', 'USING', 'VALUES'}
+
+def _is_auth_call(toks: List[Token], i: int) -> bool:
+    """Check for auth.<fn>( starting at token i."""
+    return (i + 3 < len(toks) and toks[i].value.lower() == 'auth' and toks[i + 1].value == '.'
+            and toks[i + 2].kind == 'word' and toks[i + 3].value == '(')
+
+def _matching_paren(toks: List[Token], i: int) -> int:
+    """Return the index of the ')' closing the '(' at i."""
+    depth = 0
+    for k in range(i, len(toks)):
+        if toks[k].value == '(' and toks[k].kind == 'op':
+            depth += 1
+        elif toks[k].value == ')' and toks[k].kind == 'op':
+            depth -= 1
+            if depth == 0:
+                return k
+    return len(toks) - 1
+
+def _subquery_filters(toks: List[Token]) -> Dict[str, Any]:
+    """Return the tables and WHERE-clause equality/IN filter columns of a subquery's tokens."""
+    aliases = {}
+    filters = []
+    in_where = False
+    i = 0
+    while i < len(toks):
+        word = toks[i].value.upper() if toks[i].kind == 'word' else None
+        if word in ('FROM', 'JOIN') and i + 1 < len(toks) and toks[i + 1].kind == 'word':
+            k = i + 1
+            table = toks[k].value
+            while k + 2 < len(toks) and toks[k + 1].value == '.' and toks[k + 2].kind == 'word':
+                table = toks[k + 2].value
+                k += 2
+            aliases[table] = table
+            nxt = toks[k + 1] if k + 1 < len(toks) else None
+            if nxt is not None and nxt.kind == 'word' and nxt.value.upper() == 'AS' and k + 2 < len(toks):
+                nxt = toks[k + 2]
+                k += 1
+            if nxt is not None and nxt.kind == 'word' and nxt.value.upper() not in ('WHERE', 'JOIN', 'ON', 'INNER', 'LEFT', 'RIGHT', 'GROUP', 'ORDER', 'LIMIT'):
+                aliases[nxt.value] = table
+                k += 1
+            i = k + 1
+            continue
+        if word == 'WHERE':
+            in_where = True
+        elif in_where and (toks[i].kind == 'op' and toks[i].value == '=' or word == 'IN'):
+            # Column references on either side of the comparison
+            for k in (i - 1, i + 1):
+                if 0 <= k < len(toks) and toks[k].kind == 'word':
+                    qualified = k >= 2 and toks[k - 1].value == '.'
+                    if k == i + 1 and k + 1 < len(toks) and toks[k + 1].value in ('.', '('):
+                        if toks[k + 1].value == '(' or k + 2 >= len(toks):
+                            continue
+                        filters.append((toks[k].value, toks[k + 2].value))
+                    elif qualified:
+                        filters.append((toks[k - 2].value, toks[k].value))
+                    elif not (k + 1 < len(toks) and toks[k + 1].value == '('):
+                        filters.append((None, toks[k].value))
+        i += 1
+    return {'aliases': aliases, 'filters': filters}
+
+def analyze_policy_costs(policies: List[Dict[str, Any]], functions: List[Dict[str, Any]],
+                         tables: List[Dict[str, Any]], indexes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flag row-level security predicates that are expensive to evaluate per row."""
+    functions_by_name = {function['name'].lower(): function for function in functions}
+    tables_by_name = {table['name']: table for table in tables}
+    
+    costs = {}
+    for policy in policies:
+        table_cost = costs.setdefault(policy['table'], {'policies': 0, 'cost_score': 0, 'findings': []})
+        table_cost['policies'] += 1
+        
+        for clause in ('using', 'with_check'):
+            expression = policy.get(clause)
+            if not expression:
+                continue
+            toks = list(tokenize_sql(expression))
+            findings = []
+            flagged_functions = set()
+            
+            for i, tok in enumerate(toks):
+                # auth.uid() is re-evaluated for every row unless hoisted into an initPlan
+                if _is_auth_call(toks, i):
+                    wrapped = (i >= 2 and toks[i - 1].value.upper() == 'SELECT' and toks[i - 2].value == '('
+                               and _matching_paren(toks, i + 3) + 1 < len(toks)
+                               and toks[_matching_paren(toks, i + 3) + 1].value == ')')
+                    if not wrapped:
+                        call = f"auth.{toks[i + 2].value}()"
+                        findings.append({
+                            'kind': 'unwrapped_auth_call',
+                            'detail': f"{call} is evaluated once per row",
+                            'recommendation': f"Wrap it as (select {call}) so it is evaluated once per statement"
+                        })
+                
+                # User-defined functions called from the predicate
+                if tok.kind == 'word' and i + 1 < len(toks) and toks[i + 1].value == '(' and not (i > 0 and toks[i - 1].value == '.'):
+                    if tok.value.upper() in _NON_FUNCTION_WORDS:
+                        continue
+                    function = functions_by_name.get(tok.value.lower())
+                    if function is None:
+                        continue
+                    # Only a function that is neither STABLE/IMMUTABLE nor SECURITY DEFINER is flagged,
+                    # once per clause however often the clause calls it
+                    if (function['volatility'] == 'VOLATILE' and not function['security_definer']
+                            and function['name'] not in flagged_functions):
+                        flagged_functions.add(function['name'])
+                        findings.append({
+                            'kind': 'volatile_function',
+                            'detail': f"{function['name']}() is VOLATILE and runs as the caller, so it cannot be "
+                                      f"cached, runs per row and its own queries are filtered by RLS again",
+                            'recommendation': f"ALTER FUNCTION {function['name']} STABLE;",
+                            'note': "Mark it STABLE only if it just reads data. SECURITY DEFINER also avoids the "
+                                    "nested RLS checks but bypasses RLS entirely, so use it only for vetted helpers "
+                                    "and pin SET search_path = '' with it."
+                        })
+                
+                # Subqueries need an index on the column they filter by
+                if tok.kind == 'word' and tok.value.upper() == 'SELECT' and i > 0 and toks[i - 1].value == '(':
+                    subquery = _subquery_filters(toks[i:_matching_paren(toks, i - 1)])
+                    for table_name in sorted(set(subquery['aliases'].values())):
+                        table = tables_by_name.get(table_name)
+                        if table is None:
+                            continue
+                        column_names = {column['name'] for column in table['columns']}
+                        filter_columns = []
+                        correlated = False
+                        outer_columns = {column['name'] for column in tables_by_name.get(policy['table'], {}).get('columns', [])}
+                        for qualifier, column in subquery['filters']:
+                            if qualifier is not None and qualifier not in subquery['aliases']:
+                                # Reference to the policy's own table
+                                correlated = True
+                            elif qualifier is not None and subquery['aliases'][qualifier] != table_name:
+                                continue
+                            elif column in column_names:
+                                filter_columns.append(column)
+                            elif column in outer_columns:
+                                correlated = True
+                        if not filter_columns:
+                            continue
+                        definitions = table_index_definitions(table, indexes)
+                        if any(covers_leading_columns(index, [column]) for column in filter_columns for index in definitions):
+                            continue
+                        label = 'Correlated subquery' if correlated else 'Subquery'
+                        findings.append({
+                            'kind': 'unindexed_subquery',
+                            'detail': f"{label} on {table_name} filters by {', '.join(sorted(set(filter_columns)))} without a supporting index",
+                            'recommendation': f"CREATE INDEX idx_{table_name}_{filter_columns[0]} ON {table_name}({filter_columns[0]});"
+                        })
+            
+            for finding in findings:
+                finding.update({'policy': policy['name'], 'command': policy['command'], 'clause': clause})
+                table_cost['cost_score'] += POLICY_FINDING_WEIGHTS[finding['kind']]
+                table_cost['findings'].append(finding)
+    
+    return dict(sorted(costs.items(), key=lambda item: (-item[1]['cost_score'], item[0])))
+
+def analyze_migrations(project_root: Path, cache: AnalysisCache, streaming: bool = False,
+                       verbose: bool = True, metrics: Optional[Metrics] = None) -> Optional[Dict[str, Any]]:
+    """Analyze every migration under project_root; None if there are none."""
+    metrics = metrics or Metrics('analyze_database')
     migrations_path = project_root / 'supabase' / 'migrations'
     
     if not migrations_path.exists():
-        print("Migrations directory not found!")
-        return
+        return None
     
     all_migrations = []
     all_tables = {}
     all_indexes = []
     all_functions = set()
     all_triggers = []
+    all_policies = []
+    all_function_definitions = []
     
-    # Analyze each migration file
+    # Analyze each migration file, reusing fragments for unchanged files
     for migration_file in sorted(migrations_path.glob('*.sql')):
-        print(f"Analyzing {migration_file.name}...")
-        analysis = analyze_migration_file(migration_file)
+        if verbose:
+            print(f"Analyzing {migration_file.name}...")
+        misses = cache.misses
+        with metrics.stage('parse_migrations'):
+            analysis = cache.get_or_compute(migration_file, partial(analyze_migration_file, streaming=streaming))
         all_migrations.append(analysis)
+        metrics.count('migrations_read')
+        metrics.count('migrations_parsed', cache.misses - misses)
+        metrics.count('migration_bytes_read', migration_file.stat().st_size)
         
         # Collect all tables
         for table in analysis['tables']:
             if table['name'] not in all_tables:
                 all_tables[table['name']] = table
         
-        # Collect indexes, functions, triggers
+        # Collect indexes, functions, triggers, policies
         all_indexes.extend(analysis['indexes'])
         all_functions.update(analysis['functions'])
         all_triggers.extend(analysis['triggers'])
+        all_policies.extend(analysis['policies'])
+        all_function_definitions.extend(analysis['function_definitions'])
+    
+    metrics.count('db_tables', len(all_tables))
+    metrics.count('db_indexes', len(all_indexes))
+    metrics.count('db_policies', len(all_policies))
+    
+    # Cross-check foreign keys and indexes
+    with metrics.stage('advise_indexes'):
+        index_advice = advise_indexes(list(all_tables.values()), all_indexes)
+    
+    # Estimate the per-row cost of row-level security predicates
+    with metrics.stage('policy_costs'):
+        policy_costs = analyze_policy_costs(all_policies, all_function_definitions, list(all_tables.values()),
+                                            all_indexes)
     
     # Create summary
     database_analysis = {
@@ -149,16 +417,49 @@ def main():
             'total_tables': len(all_tables),
             'total_indexes': len(all_indexes),
             'total_functions': len(all_functions),
-            'total_triggers': len(all_triggers)
+            'total_triggers': len(all_triggers),
+            'total_policies': len(all_policies),
+            'total_index_advice': len(index_advice),
+            'total_policy_findings': sum(len(cost['findings']) for cost in policy_costs.values())
         },
         'tables': list(all_tables.values()),
-        'table_names': sorted(all_tables.keys())
+        'table_names': sorted(all_tables.keys()),
+        'index_advice': index_advice,
+        'policy_costs': policy_costs
     }
     
-    # Save to JSON
+    return database_analysis
+
+def main():
+    """Main analysis function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-cache', action='store_true', help='re-parse every migration')
+    parser.add_argument('--streaming', action='store_true', help='read migrations statement by statement')
+    parser.add_argument('--max-memory', type=float, metavar='MB',
+                        help='report peak RSS and exit non-zero if it exceeds MB')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parent,
+                        help='project to analyze (default: %(default)s)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    
+    project_root = args.root
     output_path = project_root / 'database_analysis.json'
-    with open(output_path, 'w') as f:
-        json.dump(database_analysis, f, indent=2)
+    cache = AnalysisCache(project_root, 'migrations', f"{PARSER_VERSION}-{LEXER_VERSION}", enabled=not args.no_cache)
+    with Metrics.from_args('analyze_database', args) as metrics:
+        database_analysis = analyze_migrations(project_root, cache, streaming=args.streaming, metrics=metrics)
+        
+        if database_analysis is None:
+            print("Migrations directory not found!")
+            return
+        
+        # Save to JSON
+        with metrics.stage('write_json'):
+            with open(output_path, 'w') as f:
+                json.dump(database_analysis, f, indent=2)
+        metrics.count('cache_hits', cache.hits)
+    metrics.write(metrics_path(output_path))
+    index_advice = database_analysis['index_advice']
+    policy_costs = database_analysis['policy_costs']
     
     print("\nDatabase Analysis Complete!")
     print(f"Total Migrations: {database_analysis['summary']['total_migrations']}")
@@ -166,8 +467,33 @@ def main():
     print(f"Total Indexes: {database_analysis['summary']['total_indexes']}")
     print(f"Total Functions: {database_analysis['summary']['total_functions']}")
     print(f"Total Triggers: {database_analysis['summary']['total_triggers']}")
+    print(f"Total Policies: {database_analysis['summary']['total_policies']}")
     print(f"\nTables: {', '.join(database_analysis['table_names'])}")
+    if index_advice:
+        print("\nIndex advice:")
+        for item in index_advice:
+            print(f"  {item['rank']}. [{item['severity']}] {item['kind']} {item['table']}({', '.join(item['columns'])}): {item['recommendation']}")
+    if database_analysis['summary']['total_policy_findings']:
+        print("\nPolicy cost findings:")
+        for table_name, cost in policy_costs.items():
+            if cost['findings']:
+                print(f"  {table_name} (score {cost['cost_score']}, {cost['policies']} policies)")
+                for finding in cost['findings']:
+                    print(f"    - {finding['policy']} [{finding['clause']}]: {finding['detail']}")
     print(f"\nResults saved to: {output_path}")
+    print(f"Metrics saved to: {metrics_path(output_path)}")
+    cache.prune()
+    print(cache.report())
+    
+    if args.streaming or args.max_memory is not None:
+        peak = peak_memory_mb()
+        if peak is None:
+            print("Peak memory: unavailable on this platform")
+        else:
+            print(f"Peak memory: {peak:.1f} MB")
+            if args.max_memory is not None and peak > args.max_memory:
+                print(f"Peak memory exceeds the {args.max_memory:.1f} MB budget!")
+                sys.exit(1)
 
 if __name__ == '__main__':
     main()
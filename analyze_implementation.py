@@ -3,15 +3,238 @@
 Analyze current implementation status of the B2B+ project.
 """
 
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
 import json
 import os
+import re
+import select
+import struct
+import subprocess
+import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
 
-def analyze_file_structure() -> Dict[str, Any]:
-    """Analyze the current file structure."""
-    project_root = Path('/home/ubuntu/b2bplus')
+from instrumentation import Metrics, add_metrics_arguments, metrics_path
+
+# Directories never worth descending into, whatever .gitignore says
+IGNORED_DIRS = {
+    'node_modules', '.git', '.next', '.npm-cache', '.turbo', '.expo', '.vercel',
+    '.analysis_cache', '__pycache__'
+}
+# Build output directories; only pruned at the project root or next to a
+# package.json, since app/build/ or app/(shop)/out/ may be real route segments
+BUILD_OUTPUT_DIRS = {'dist', 'build', 'out', 'coverage'}
+
+# Structure lists and counters a file contributes to; keys are paths into
+# the structure dict, or ('counts', name) and ('seed_files', group)
+Classification = List[Tuple[Tuple[str, ...], Optional[str]]]
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_ONLYDIR)
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# Seconds to keep collecting events after the first one, so an editor's
+# save (write, rename, chmod) is handled as one change
+WATCH_DEBOUNCE = 0.2
+
+class GitIgnore:
+    """The subset of .gitignore semantics needed to prune a walk.
+
+    Rules from nested .gitignore files only apply below their own directory
+    and the last matching rule wins, so later '!' patterns re-include paths.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.loaded: Set[str] = set()
+
+    def add_file(self, path: Path, base: str):
+        """Load the rules of a .gitignore living in the directory base, once."""
+        if base in self.loaded:
+            return
+        self.loaded.add(base)
+        try:
+            lines = path.read_text(errors='replace').splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            if line.startswith('**/'):
+                line, anchored = line[3:], '/' in line[3:]
+            line = line.lstrip('/')
+            if line:
+                match = re.compile(fnmatch.translate(line)).match
+                self.rules.append((base, match, negate, dir_only, anchored))
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        for base, match, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + '/'):
+                    continue
+                sub_path = rel_path[len(base) + 1:]
+            else:
+                sub_path = rel_path
+            if match(sub_path if anchored else sub_path.rsplit('/', 1)[-1]):
+                result = not negate
+        return result
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+def _excluded(rel_path: str, exclude: Tuple[str, ...]) -> bool:
+    """Whether rel_path matches one of the exclude patterns (relative to the root)."""
+    return any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in exclude)
+
+def walk_project(project_root: Path, use_gitignore: bool = True, start: str = '',
+                 ignore: Optional[GitIgnore] = None, recursive: bool = True,
+                 exclude: Tuple[str, ...] = ()) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """Walk the tree once with os.scandir, pruning ignored directories.
+
+    Yields (relative directory, subdirectories, files) in sorted order, with
+    '' for the root and '/' separated paths. Walking from start with an
+    existing ignore assumes the .gitignore files above start are loaded.
+    Paths matching an exclude pattern are skipped like ignored ones.
+    """
+    if ignore is None:
+        ignore = GitIgnore()
+    pending = [start]
+    while pending:
+        rel_dir = pending.pop()
+        directory = project_root / rel_dir if rel_dir else project_root
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        
+        if use_gitignore and any(entry.name == '.gitignore' for entry in entries):
+            ignore.add_file(directory / '.gitignore', rel_dir)
+        
+        package_root = not rel_dir or any(entry.name == 'package.json' for entry in entries)
+        dirs, files = [], []
+        for entry in entries:
+            rel_path = _join(rel_dir, entry.name)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and (entry.name in IGNORED_DIRS or package_root and entry.name in BUILD_OUTPUT_DIRS):
+                continue
+            if ignore.rules and ignore.ignored(rel_path, is_dir):
+                continue
+            if exclude and _excluded(rel_path, exclude):
+                continue
+            (dirs if is_dir else files).append(entry.name)
+        
+        yield rel_dir, dirs, files
+        if recursive:
+            pending.extend(_join(rel_dir, name) for name in reversed(dirs))
+
+def _under(rel_path: str, prefix: str) -> Optional[str]:
+    """Return rel_path relative to the directory prefix, or None if outside it."""
+    if rel_path.startswith(prefix + '/'):
+        return rel_path[len(prefix) + 1:]
+    return None
+
+def classify_file(rel_dir: str, name: str) -> Classification:
+    """Return the structure lists and counters a single file belongs to."""
+    entries = []
+    rel_path = _join(rel_dir, name)
+    
+    if fnmatch.fnmatchcase(name, '*.test.ts*'):
+        entries.append((('counts', 'total_tests'), None))
+    
+    if rel_dir.startswith('apps/web/'):
+        # Pages and API routes
+        sub_path = _under(rel_path, 'apps/web/app')
+        if sub_path is not None:
+            if name.endswith('.tsx'):
+                entries.append((('apps', 'web', 'pages'), sub_path))
+                if name == 'page.tsx':
+                    entries.append((('counts', 'total_pages'), None))
+            api_path = _under(rel_path, 'apps/web/app/api')
+            if api_path is not None and name.endswith('.ts'):
+                entries.append((('apps', 'web', 'api_routes'), api_path))
+                if name == 'route.ts':
+                    entries.append((('counts', 'total_api_routes'), None))
+            return entries
+        
+        # Components
+        sub_path = _under(rel_path, 'apps/web/components')
+        if sub_path is not None:
+            if name.endswith('.tsx'):
+                entries.append((('apps', 'web', 'components'), sub_path))
+            return entries
+        
+        # Hooks
+        if rel_dir == 'apps/web/hooks' and name.endswith('.ts'):
+            entries.append((('apps', 'web', 'hooks'), name))
+            return entries
+        
+        # Lib
+        sub_path = _under(rel_path, 'apps/web/lib')
+        if sub_path is not None and name.endswith('.ts'):
+            entries.append((('apps', 'web', 'lib'), sub_path))
+    
+    elif rel_dir.startswith('apps/mobile/'):
+        sub_path = _under(rel_path, 'apps/mobile/app')
+        if sub_path is not None:
+            if name.endswith('.tsx'):
+                entries.append((('apps', 'mobile', 'screens'), sub_path))
+        elif rel_dir == 'apps/mobile/contexts' and name.endswith('.tsx'):
+            entries.append((('apps', 'mobile', 'contexts'), name))
+        elif rel_dir == 'apps/mobile/lib' and name.endswith('.ts'):
+            entries.append((('apps', 'mobile', 'lib'), name))
+    
+    elif rel_dir.startswith('packages/'):
+        for pkg in ('shared', 'ui', 'supabase'):
+            sub_path = _under(rel_path, f"packages/{pkg}/src")
+            if sub_path is not None:
+                if fnmatch.fnmatchcase(name, '*.ts*'):
+                    entries.append((('packages', pkg, 'files'), sub_path))
+                break
     
+    elif rel_dir == 'supabase/migrations' and name.endswith('.sql'):
+        entries.append((('database', 'migrations'), name))
+    
+    elif rel_dir == '':
+        # Seed files in root, seed*.sql first then the comprehensive *seed*.sql ones
+        if fnmatch.fnmatchcase(name, 'seed*.sql'):
+            entries.append((('seed_files', 'primary'), name))
+        elif fnmatch.fnmatchcase(name, '*seed*.sql'):
+            entries.append((('seed_files', 'other'), name))
+    
+    return entries
+
+def assemble_analysis(classified: Dict[str, Classification], root_dirs: Iterable[str],
+                      package_dirs: Iterable[str]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Build the file structure and feature counts from per-file classifications."""
     structure = {
         'apps': {
             'web': {
@@ -39,98 +262,6 @@ def analyze_file_structure() -> Dict[str, Any]:
         }
     }
     
-    # Analyze web app
-    web_path = project_root / 'apps' / 'web'
-    if web_path.exists():
-        # Pages
-        app_path = web_path / 'app'
-        if app_path.exists():
-            for item in app_path.rglob('*.tsx'):
-                rel_path = item.relative_to(app_path)
-                structure['apps']['web']['pages'].append(str(rel_path))
-        
-        # Components
-        comp_path = web_path / 'components'
-        if comp_path.exists():
-            for item in comp_path.rglob('*.tsx'):
-                rel_path = item.relative_to(comp_path)
-                structure['apps']['web']['components'].append(str(rel_path))
-        
-        # API routes
-        api_path = web_path / 'app' / 'api'
-        if api_path.exists():
-            for item in api_path.rglob('*.ts'):
-                rel_path = item.relative_to(api_path)
-                structure['apps']['web']['api_routes'].append(str(rel_path))
-        
-        # Hooks
-        hooks_path = web_path / 'hooks'
-        if hooks_path.exists():
-            for item in hooks_path.glob('*.ts'):
-                structure['apps']['web']['hooks'].append(item.name)
-        
-        # Lib
-        lib_path = web_path / 'lib'
-        if lib_path.exists():
-            for item in lib_path.rglob('*.ts'):
-                rel_path = item.relative_to(lib_path)
-                structure['apps']['web']['lib'].append(str(rel_path))
-    
-    # Analyze mobile app
-    mobile_path = project_root / 'apps' / 'mobile'
-    if mobile_path.exists():
-        # Screens
-        app_path = mobile_path / 'app'
-        if app_path.exists():
-            for item in app_path.rglob('*.tsx'):
-                rel_path = item.relative_to(app_path)
-                structure['apps']['mobile']['screens'].append(str(rel_path))
-        
-        # Contexts
-        ctx_path = mobile_path / 'contexts'
-        if ctx_path.exists():
-            for item in ctx_path.glob('*.tsx'):
-                structure['apps']['mobile']['contexts'].append(item.name)
-        
-        # Lib
-        lib_path = mobile_path / 'lib'
-        if lib_path.exists():
-            for item in lib_path.glob('*.ts'):
-                structure['apps']['mobile']['lib'].append(item.name)
-    
-    # Analyze packages
-    packages_path = project_root / 'packages'
-    if packages_path.exists():
-        for pkg in ['shared', 'ui', 'supabase']:
-            pkg_path = packages_path / pkg / 'src'
-            if pkg_path.exists():
-                for item in pkg_path.rglob('*.ts*'):
-                    rel_path = item.relative_to(pkg_path)
-                    structure['packages'][pkg]['files'].append(str(rel_path))
-    
-    # Analyze database
-    supabase_path = project_root / 'supabase'
-    if supabase_path.exists():
-        migrations_path = supabase_path / 'migrations'
-        if migrations_path.exists():
-            for item in sorted(migrations_path.glob('*.sql')):
-                structure['database']['migrations'].append(item.name)
-        
-        # Seed files in root
-        for item in project_root.glob('seed*.sql'):
-            structure['database']['seed_files'].append(item.name)
-        
-        # Comprehensive seed file
-        for item in project_root.glob('*seed*.sql'):
-            if item.name not in structure['database']['seed_files']:
-                structure['database']['seed_files'].append(item.name)
-    
-    return structure
-
-def count_features() -> Dict[str, int]:
-    """Count implemented features."""
-    project_root = Path('/home/ubuntu/b2bplus')
-    
     counts = {
         'total_pages': 0,
         'total_components': 0,
@@ -141,49 +272,293 @@ def count_features() -> Dict[str, int]:
         'total_tests': 0
     }
     
-    # Count pages
-    web_app = project_root / 'apps' / 'web' / 'app'
-    if web_app.exists():
-        counts['total_pages'] = len(list(web_app.rglob('page.tsx')))
-    
-    # Count components
-    web_comp = project_root / 'apps' / 'web' / 'components'
-    if web_comp.exists():
-        counts['total_components'] = len(list(web_comp.rglob('*.tsx')))
+    seed_files = {'primary': [], 'other': []}
+    for rel_path in sorted(classified):
+        for key, value in classified[rel_path]:
+            if key[0] == 'counts':
+                counts[key[1]] += 1
+            elif key[0] == 'seed_files':
+                seed_files[key[1]].append(value)
+            else:
+                target = structure
+                for part in key:
+                    target = target[part]
+                target.append(value)
     
-    # Count API routes
-    api_path = project_root / 'apps' / 'web' / 'app' / 'api'
-    if api_path.exists():
-        counts['total_api_routes'] = len(list(api_path.rglob('route.ts')))
+    if 'supabase' in root_dirs:
+        structure['database']['seed_files'] = seed_files['primary'] + seed_files['other']
     
-    # Count hooks
-    hooks_path = project_root / 'apps' / 'web' / 'hooks'
-    if hooks_path.exists():
-        counts['total_hooks'] = len(list(hooks_path.glob('*.ts')))
+    structure['database']['migrations'].sort()
+    counts['total_components'] = len(structure['apps']['web']['components'])
+    counts['total_hooks'] = len(structure['apps']['web']['hooks'])
+    counts['total_migrations'] = len(structure['database']['migrations'])
+    counts['total_packages'] = len(list(package_dirs))
     
-    # Count migrations
-    migrations_path = project_root / 'supabase' / 'migrations'
-    if migrations_path.exists():
-        counts['total_migrations'] = len(list(migrations_path.glob('*.sql')))
+    return structure, counts
+
+def analyze_project(project_root: Path, use_gitignore: bool = True,
+                    metrics: Optional[Metrics] = None) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Build the file structure and feature counts from a single walk."""
+    metrics = metrics or Metrics('analyze_implementation')
+    classified = {}
+    root_dirs, package_dirs = [], []
+    dirs_scanned = files_scanned = 0
+    with metrics.stage('walk_project'):
+        for rel_dir, dirs, files in walk_project(project_root, use_gitignore):
+            if rel_dir == '':
+                root_dirs = dirs
+            elif rel_dir == 'packages':
+                package_dirs = dirs
+            dirs_scanned += 1
+            files_scanned += len(files)
+            for name in files:
+                entries = classify_file(rel_dir, name)
+                if entries:
+                    classified[_join(rel_dir, name)] = entries
+    metrics.count('dirs_scanned', dirs_scanned)
+    metrics.count('files_scanned', files_scanned)
+    metrics.count('files_classified', len(classified))
+    with metrics.stage('assemble_analysis'):
+        return assemble_analysis(classified, root_dirs, package_dirs)
+
+class ProjectSnapshot:
+    """(path, mtime, size) of every scanned file, kept up to date incrementally.
+
+    Only files that appeared, disappeared or changed since the last scan are
+    re-classified. A changed .gitignore, or a package.json appearing or
+    disappearing, invalidates the pruning, so it triggers a full rebuild.
+    """
+
+    def __init__(self, project_root: Path, use_gitignore: bool = True, exclude: Tuple[str, ...] = ()):
+        self.project_root = project_root
+        self.use_gitignore = use_gitignore
+        self.exclude = exclude
+        # rel_dir -> (subdirectories, {file name: (mtime_ns, size)})
+        self.dirs: Dict[str, Tuple[List[str], Dict[str, Tuple[int, int]]]] = {}
+        self.classified: Dict[str, Classification] = {}
+        self.new_dirs: List[str] = []
+        self.ignore = GitIgnore()
+        self._ignore_changed = False
+
+    def rebuild(self) -> int:
+        """Rescan everything from scratch; returns the number of entries now known."""
+        self.ignore = GitIgnore()
+        self.dirs.clear()
+        self.classified.clear()
+        self._scan('', recursive=True)
+        self._ignore_changed = False
+        return sum(len(files) for _, files in self.dirs.values())
+
+    def poll(self) -> int:
+        """Rescan the whole tree against the snapshot; returns the number of changed entries."""
+        changed = self._scan('', recursive=True)
+        return self.rebuild() if self._ignore_changed else changed
+
+    def refresh(self, rel_dirs: Iterable[str]) -> int:
+        """Rescan only the given directories (and any new subdirectories)."""
+        changed = 0
+        for rel_dir in sorted(rel_dirs):
+            if rel_dir in self.dirs:
+                changed += self._scan(rel_dir, recursive=False)
+        return self.rebuild() if self._ignore_changed else changed
+
+    def take_new_dirs(self) -> List[str]:
+        """Directories discovered since the last call, for adding watches."""
+        new_dirs, self.new_dirs = self.new_dirs, []
+        return new_dirs
+
+    def analysis(self) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        return assemble_analysis(self.classified, self.dirs.get('', ([], {}))[0],
+                                 self.dirs.get('packages', ([], {}))[0])
+
+    def _scan(self, start: str, recursive: bool) -> int:
+        changed = 0
+        for rel_dir, subdirs, names in walk_project(self.project_root, self.use_gitignore, start,
+                                                    self.ignore, recursive, self.exclude):
+            known = rel_dir in self.dirs
+            old_subdirs, old_files = self.dirs.get(rel_dir, ([], {}))
+            if not known:
+                self.new_dirs.append(rel_dir)
+            
+            files = {}
+            for name in names:
+                rel_path = _join(rel_dir, name)
+                try:
+                    stat = os.stat(self.project_root / rel_path)
+                except OSError:
+                    continue
+                files[name] = (stat.st_mtime_ns, stat.st_size)
+                if old_files.get(name) != files[name]:
+                    self._classify(rel_dir, name)
+                    changed += 1
+            for name in old_files.keys() - files.keys():
+                self.classified.pop(_join(rel_dir, name), None)
+                changed += 1
+            if known and old_files.get('.gitignore') != files.get('.gitignore'):
+                self._ignore_changed = True
+            if known and rel_dir and ('package.json' in old_files) != ('package.json' in files):
+                self._ignore_changed = True
+            
+            self.dirs[rel_dir] = (subdirs, files)
+            for name in set(old_subdirs) - set(subdirs):
+                changed += self._drop(_join(rel_dir, name))
+            added = set(subdirs) - set(old_subdirs)
+            changed += len(added)
+            if not recursive:
+                for name in sorted(added):
+                    changed += self._scan(_join(rel_dir, name), recursive=True)
+        return changed
+
+    def _classify(self, rel_dir: str, name: str):
+        entries = classify_file(rel_dir, name)
+        if entries:
+            self.classified[_join(rel_dir, name)] = entries
+        else:
+            self.classified.pop(_join(rel_dir, name), None)
+
+    def _drop(self, rel_dir: str) -> int:
+        """Forget a removed directory and everything below it."""
+        dropped = 0
+        prefix = rel_dir + '/'
+        for known in [d for d in self.dirs if d == rel_dir or d.startswith(prefix)]:
+            _, files = self.dirs.pop(known)
+            for name in files:
+                self.classified.pop(_join(known, name), None)
+            dropped += len(files) + 1
+        return dropped
+
+class Inotify:
+    """Directory change notifications through libc's inotify (Linux only)."""
+
+    def __init__(self, exclude: Tuple[str, ...] = ()):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available on this platform')
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.watches: Dict[int, str] = {}
+        self.exclude = exclude
+
+    def watch(self, path: Path, rel_dir: str):
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        self.watches[wd] = rel_dir
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Wait up to timeout seconds and return the directories that changed.
+
+        Events on paths matching an exclude pattern are dropped. Returns None
+        when the kernel queue overflowed and events were lost.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        dirty = set()
+        if not ready:
+            return dirty
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return dirty
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b'\0'))
+            offset += INOTIFY_EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+            elif wd in self.watches:
+                if name and self.exclude and _excluded(_join(self.watches[wd], name), self.exclude):
+                    continue
+                dirty.add(self.watches[wd])
+        return None if overflow else dirty
+
+    def close(self):
+        os.close(self.fd)
+
+def _add_watches(notifier: Inotify, snapshot: ProjectSnapshot) -> bool:
+    """Watch newly discovered directories; False once the watch limit is hit."""
+    for rel_dir in snapshot.take_new_dirs():
+        try:
+            notifier.watch(snapshot.project_root / rel_dir if rel_dir else snapshot.project_root, rel_dir)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"⚠ Cannot watch {rel_dir or '.'} ({e.strerror}); falling back to polling")
+            return False
+    return True
+
+def watch_project(project_root: Path, on_change, use_gitignore: bool = True,
+                  interval: float = 1.0, poll: bool = False, exclude: Tuple[str, ...] = ()):
+    """Keep the analysis current, calling on_change(structure, counts) whenever it changes.
+
+    Uses inotify where available and polls every interval seconds otherwise.
+    Changes that leave the classification unchanged (edits to file contents,
+    unrelated files) do not call on_change. Paths matching exclude, such as
+    the files on_change writes, are neither scanned nor watched.
+    """
+    snapshot = ProjectSnapshot(project_root, use_gitignore, exclude)
+    snapshot.rebuild()
+    last = snapshot.analysis()
+    on_change(*last)
     
-    # Count packages
-    packages_path = project_root / 'packages'
-    if packages_path.exists():
-        counts['total_packages'] = len([d for d in packages_path.iterdir() if d.is_dir()])
+    notifier = None
+    if not poll:
+        try:
+            notifier = Inotify(exclude)
+        except (OSError, AttributeError) as e:
+            print(f"⚠ inotify unavailable ({e}); polling every {interval}s")
+        else:
+            if not _add_watches(notifier, snapshot):
+                notifier.close()
+                notifier = None
     
-    # Count tests
-    counts['total_tests'] = len(list(project_root.rglob('*.test.ts*')))
+    mode = 'inotify' if notifier else f"polling every {interval}s"
+    print(f"\nWatching {project_root} ({len(snapshot.dirs)} directories, {mode}); Ctrl-C to stop")
     
-    return counts
+    try:
+        while True:
+            if notifier:
+                dirty = notifier.read(interval)
+                if dirty is not None and not dirty:
+                    continue
+                deadline = time.monotonic() + WATCH_DEBOUNCE
+                while dirty is not None and time.monotonic() < deadline:
+                    more = notifier.read(max(0.0, deadline - time.monotonic()))
+                    dirty = None if more is None else dirty | more
+                changed = snapshot.rebuild() if dirty is None else snapshot.refresh(dirty)
+                if not _add_watches(notifier, snapshot):
+                    notifier.close()
+                    notifier = None
+            else:
+                time.sleep(interval)
+                changed = snapshot.poll()
+            
+            if not changed:
+                continue
+            current = snapshot.analysis()
+            stamp = time.strftime('%H:%M:%S')
+            if current == last:
+                print(f"[{stamp}] {changed} entries changed, classification unchanged")
+                continue
+            last = current
+            print(f"[{stamp}] {changed} entries changed, analysis updated")
+            on_change(*current)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        if notifier:
+            notifier.close()
 
-def main():
-    """Main analysis function."""
-    print("Analyzing current implementation...")
-    
-    structure = analyze_file_structure()
-    counts = count_features()
-    
-    analysis = {
+def build_analysis(structure: Dict[str, Any], counts: Dict[str, int]) -> Dict[str, Any]:
+    return {
         'structure': structure,
         'counts': counts,
         'summary': {
@@ -196,11 +571,70 @@ def main():
             'ui_components': len(structure['packages']['ui']['files']),
         }
     }
-    
-    # Save to JSON
-    output_path = Path('/home/ubuntu/b2bplus/implementation_analysis.json')
-    with open(output_path, 'w') as f:
+
+def save_analysis(analysis: Dict[str, Any], output_path: Path):
+    """Write the analysis atomically so readers never see a partial file."""
+    tmp_path = output_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
         json.dump(analysis, f, indent=2)
+    os.replace(tmp_path, output_path)
+
+def regenerate_report(project_root: Path):
+    """Rerun generate_report.py on the fresh analysis."""
+    script = Path(__file__).resolve().with_name('generate_report.py')
+    result = subprocess.run([sys.executable, str(script), '--root', str(project_root)], capture_output=True, text=True)
+    if result.returncode == 0:
+        print("  ✓ Progress report regenerated")
+    else:
+        print(f"  ✗ generate_report.py failed:\n{result.stderr.strip()}")
+
+def main():
+    """Main analysis function."""
+    parser = argparse.ArgumentParser(description='Analyze the implementation status of the B2B+ project')
+    parser.add_argument('--no-gitignore', action='store_true', help='descend into paths listed in .gitignore files')
+    parser.add_argument('--watch', action='store_true', help='keep running and update the analysis as files change')
+    parser.add_argument('--interval', type=float, default=1.0, help='polling interval in seconds for --watch (default: 1)')
+    parser.add_argument('--poll', action='store_true', help='poll instead of using inotify in --watch mode')
+    parser.add_argument('--report', action='store_true',
+                        help='in --watch mode, regenerate the progress report whenever the analysis changes')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parent,
+                        help='project to analyze (default: %(default)s)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    
+    print("Analyzing current implementation...")
+    
+    project_root = args.root
+    output_path = project_root / 'implementation_analysis.json'
+    
+    if args.watch:
+        # Our own writes must not look like project changes
+        exclude = (output_path.name, f"{output_path.stem}.*.tmp", '.analysis_cache')
+        if args.report:
+            exclude += ('PROGRESS_REPORT.*',)
+        
+        def on_change(structure, counts):
+            analysis = build_analysis(structure, counts)
+            save_analysis(analysis, output_path)
+            summary = analysis['summary']
+            print(f"  ✓ {output_path.name}: {summary['web_pages']} pages, {summary['web_components']} components, "
+                  f"{summary['mobile_screens']} screens, {summary['api_routes']} API routes")
+            if args.report:
+                regenerate_report(project_root)
+        
+        watch_project(project_root, on_change, use_gitignore=not args.no_gitignore,
+                      interval=args.interval, poll=args.poll, exclude=exclude)
+        return
+    
+    with Metrics.from_args('analyze_implementation', args) as metrics:
+        started = time.perf_counter()
+        structure, counts = analyze_project(project_root, use_gitignore=not args.no_gitignore, metrics=metrics)
+        elapsed = time.perf_counter() - started
+        
+        analysis = build_analysis(structure, counts)
+        with metrics.stage('write_json'):
+            save_analysis(analysis, output_path)
+    metrics.write(metrics_path(output_path))
     
     print("\nImplementation Analysis Complete!")
     print(f"Web Pages: {analysis['summary']['web_pages']}")
@@ -211,6 +645,8 @@ def main():
     print(f"Shared Package Files: {analysis['summary']['shared_files']}")
     print(f"UI Components: {analysis['summary']['ui_components']}")
     print(f"\nResults saved to: {output_path}")
+    print(f"Metrics saved to: {metrics_path(output_path)}")
+    print(f"Scanned {project_root} in {elapsed:.2f}s")
 
 if __name__ == '__main__':
     main()
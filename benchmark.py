@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Benchmark every analyzer on parameterized synthetic corpora.
+
+A corpus is a fake project: migrations with many tables and large function
+bodies, planning guides of a given total size, and a source tree with a deep
+node_modules. Each stage runs in a fresh interpreter so its peak RSS is its
+own, and its best time and peak memory are compared against the stored
+baseline for that scale. Any stage slower or larger than the baseline allows
+fails the run.
+
+Stage times at the medium and full scales are also compared with the next
+smaller scale, and a stage whose time grows much faster than its input
+fails the run even without a baseline.
+
+Usage: python3 benchmark.py [--scale smoke|medium|full] [--repeat N] [--update-baseline]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, NamedTuple, Optional, TextIO
+
+from analysis_cache import AnalysisCache
+from analyze_database import analyze_migrations
+from analyze_implementation import analyze_project, build_analysis
+from extract_specifications import extract_specifications
+from generate_report import REPORT_FORMATS, write_reports
+from instrumentation import Metrics, peak_memory_mb
+from pipeline import Stage, write_json
+
+# Bump whenever the generated corpus changes, so stale corpora are rebuilt
+CORPUS_VERSION = 1
+CORPUS_MANIFEST = 'benchmark_corpus.json'
+RESULTS_DIR = '.benchmark_results'
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Differences below these are noise whatever the relative change
+TIME_NOISE_SECONDS = 0.1
+MEMORY_NOISE_MB = 5.0
+
+# Each scale's stage times are also checked against a smaller scale: a stage
+# whose time grows more than this many times faster than its input fails,
+# baseline or not, so a super-linear stage can never be recorded as normal
+SCALING_REFERENCES = {'medium': 'smoke', 'full': 'medium'}
+SCALING_TOLERANCE = 2.0
+
+class CorpusSpec(NamedTuple):
+    """Size parameters of a synthetic project."""
+    tables: int
+    columns_per_table: int
+    migration_files: int
+    functions: int
+    function_bytes: int
+    guides: int
+    guide_bytes: int
+    source_files: int
+    node_modules_entries: int
+    node_modules_depth: int
+
+SCALES = {
+    'smoke': CorpusSpec(tables=200, columns_per_table=8, migration_files=4, functions=20,
+                        function_bytes=16 * 1024, guides=5, guide_bytes=1024 * 1024,
+                        source_files=2000, node_modules_entries=20000, node_modules_depth=8),
+    'medium': CorpusSpec(tables=2000, columns_per_table=12, migration_files=10, functions=50,
+                         function_bytes=256 * 1024, guides=5, guide_bytes=10 * 1024 * 1024,
+                         source_files=20000, node_modules_entries=200000, node_modules_depth=16),
+    'full': CorpusSpec(tables=10000, columns_per_table=12, migration_files=20, functions=40,
+                       function_bytes=2 * 1024 * 1024, guides=5, guide_bytes=100 * 1024 * 1024,
+                       source_files=100000, node_modules_entries=900000, node_modules_depth=32),
+}
+
+COLUMN_TYPES = ['TEXT', 'TEXT NOT NULL', 'INTEGER', 'DECIMAL(10,2)', 'BOOLEAN NOT NULL DEFAULT false',
+                'JSONB', 'TIMESTAMPTZ']
+
+def _table_name(number: int) -> str:
+    return f"bench_table_{number:05d}"
+
+def _function_body(size: int) -> str:
+    """A PL/pgSQL body of about size bytes, with quoted strings and comments for the lexer."""
+    lines = []
+    total = 0
+    number = 0
+    while total < size:
+        line = f"  v_note := 'padding line {number} with ''escaped'' quotes; not a statement end'; -- step {number}\n"
+        lines.append(line)
+        total += len(line)
+        number += 1
+    return ''.join(lines)
+
+def _write_table(f: TextIO, number: int, columns: int):
+    name = _table_name(number)
+    f.write(f"CREATE TABLE {name} (\n")
+    f.write("  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),\n")
+    if number > 0:
+        f.write(f"  parent_id UUID NOT NULL REFERENCES {_table_name(number - 1)}(id) ON DELETE CASCADE,\n")
+    f.write("  user_id UUID REFERENCES auth.users(id),\n")
+    for column in range(columns):
+        f.write(f"  field_{column} {COLUMN_TYPES[column % len(COLUMN_TYPES)]},\n")
+    f.write("  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()\n);\n\n")
+    # Leave every third foreign key unindexed so the advisor has work to do
+    if number > 0 and number % 3:
+        f.write(f"CREATE INDEX idx_{name}_parent ON {name}(parent_id);\n")
+    f.write(f"ALTER TABLE {name} ENABLE ROW LEVEL SECURITY;\n")
+    f.write(f'CREATE POLICY "Owners read {name}" ON {name}\n'
+            f"  FOR SELECT USING (user_id = auth.uid() OR parent_id IN "
+            f"(SELECT id FROM {_table_name(max(number - 1, 0))} WHERE user_id = auth.uid()));\n\n")
+
+def _write_function(f: TextIO, number: int, body: str, table_number: int):
+    name = f"bench_function_{number:04d}"
+    f.write(f"CREATE OR REPLACE FUNCTION {name}()\nRETURNS trigger AS $$\n"
+            f"DECLARE\n  v_note TEXT;\nBEGIN\n{body}  NEW.created_at = NOW();\n  RETURN NEW;\nEND;\n"
+            f"$$ LANGUAGE plpgsql;\n\n")
+    f.write(f"CREATE TRIGGER bench_trigger_{number:04d} BEFORE UPDATE ON {_table_name(table_number)}\n"
+            f"  FOR EACH ROW EXECUTE FUNCTION {name}();\n\n")
+
+def generate_migrations(root: Path, spec: CorpusSpec):
+    """Spread the tables and functions evenly over the migration files."""
+    migrations = root / 'supabase' / 'migrations'
+    migrations.mkdir(parents=True)
+    body = _function_body(spec.function_bytes)
+    files = max(spec.migration_files, 1)
+    for file_number in range(files):
+        path = migrations / f"{20240101000000 + file_number}_bench_schema.sql"
+        with open(path, 'w') as f:
+            f.write(f"-- Benchmark migration {file_number}\n\n")
+            for number in range(file_number * spec.tables // files, (file_number + 1) * spec.tables // files):
+                _write_table(f, number, spec.columns_per_table)
+            for number in range(file_number * spec.functions // files,
+                                (file_number + 1) * spec.functions // files):
+                _write_function(f, number, body, number % max(spec.tables, 1))
+
+def _guide_section(step: int, table_number: int) -> str:
+    table = _table_name(table_number)
+    return (
+        f"## Step 1.{step}: Build bench module {step}\n\n"
+        f"**Location**: `apps/web/app/bench-{step}/page.tsx`\n\n"
+        f"### Bench feature {step}\n\n"
+        f"Store records in the {table} table and render them with <BenchList{step} items={{rows}} />.\n\n"
+        f"- **Bench capability {step}**: Manage {table} rows from Bench{step}.tsx and\n"
+        f"  import {{ useBench{step} }} from '@/hooks/use-bench-{step}'.\n\n"
+        f"**Feature:** Bench export {step}\n\n"
+        f"```sql\nCREATE TABLE {table} (\n  id UUID PRIMARY KEY,\n  name TEXT NOT NULL\n);\n```\n\n"
+    )
+
+def generate_guides(root: Path, spec: CorpusSpec):
+    """Write the planning guides, each filled with sections up to its share of guide_bytes."""
+    guides = max(spec.guides, 1)
+    names = ['b2b-master-guide.txt'] + [f"b2b-phase{number}-guide.txt" for number in range(1, guides)]
+    step = 0
+    for name in names:
+        size = 0
+        with open(root / name, 'w') as f:
+            header = f"# B2B+ {name} (synthetic)\n\n## Overview\n\nGenerated for benchmarking.\n\n"
+            f.write(header)
+            size += len(header)
+            while size < spec.guide_bytes // guides:
+                section = _guide_section(step, step % max(spec.tables, 1))
+                f.write(section)
+                size += len(section)
+                step += 1
+
+# Source file templates, cycled so every structure list gets entries
+SOURCE_TEMPLATES = [
+    'apps/web/app/bench-{n}/page.tsx',
+    'apps/web/app/api/bench-{n}/route.ts',
+    'apps/web/components/bench/Bench{n}.tsx',
+    'apps/web/components/bench/Bench{n}.test.tsx',
+    'apps/web/hooks/use-bench-{n}.ts',
+    'apps/web/lib/bench/bench-{n}.ts',
+    'apps/mobile/app/bench-{n}.tsx',
+    'packages/shared/src/bench-{n}.ts',
+    'packages/ui/src/Bench{n}.tsx',
+    'apps/web/.bench-build/chunk-{n}.js',
+]
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    open(path, 'w').close()
+
+def generate_tree(root: Path, spec: CorpusSpec):
+    """Create the source files, a gitignored build dir and nested node_modules chains."""
+    (root / '.gitignore').write_text('/apps/web/.bench-build/\n*.log\n')
+    for number in range(spec.source_files):
+        template = SOURCE_TEMPLATES[number % len(SOURCE_TEMPLATES)]
+        _touch(root / template.format(n=number // len(SOURCE_TEMPLATES)))
+
+    # Each package holds a few files and nests the next one, depth levels deep
+    entries = 0
+    package = 0
+    depth = max(spec.node_modules_depth, 1)
+    while entries < spec.node_modules_entries:
+        directory = root / ('node_modules' if package % 2 else 'apps/web/node_modules')
+        for level in range(depth):
+            directory = directory / f"bench-pkg-{package}-{level}"
+            for name in ('package.json', 'index.js', 'index.d.ts', 'README.md'):
+                _touch(directory / name)
+            entries += 5
+            if entries >= spec.node_modules_entries:
+                break
+            directory = directory / 'node_modules'
+        package += 1
+
+def ensure_corpus(corpus: Path, spec: CorpusSpec) -> bool:
+    """Generate the corpus unless one with the same parameters is already there; True if generated."""
+    manifest = {'version': CORPUS_VERSION, 'spec': spec._asdict()}
+    try:
+        with open(corpus / CORPUS_MANIFEST, 'r') as f:
+            if json.load(f) == manifest:
+                return False
+    except (OSError, ValueError):
+        pass
+
+    shutil.rmtree(corpus, ignore_errors=True)
+    corpus.mkdir(parents=True)
+    generate_migrations(corpus, spec)
+    generate_guides(corpus, spec)
+    generate_tree(corpus, spec)
+    # Written last, so an interrupted generation is redone
+    write_json(corpus / CORPUS_MANIFEST, manifest)
+    return True
+
+def _load_result(corpus: Path, stage: str) -> Any:
+    with open(corpus / RESULTS_DIR / f"{stage}.json", 'r') as f:
+        return json.load(f)
+
+# Each stage returns its result, counts to display, and the size of its input
+# (in the stage's own unit) for the scaling check
+
+def bench_database(corpus: Path):
+    metrics = Metrics('benchmark')
+    database = analyze_migrations(corpus, AnalysisCache(corpus, 'migrations', 'benchmark', enabled=False),
+                                  verbose=False, metrics=metrics)
+    return database, {'tables': database['summary']['total_tables'],
+                      'functions': database['summary']['total_functions']}, metrics.counters['migration_bytes_read']
+
+def bench_specifications(corpus: Path):
+    metrics = Metrics('benchmark')
+    specs = extract_specifications(corpus, AnalysisCache(corpus, 'documents', 'benchmark', enabled=False),
+                                   verbose=False, metrics=metrics)
+    return specs, {'features': specs['summary']['total_features'],
+                   'tables': specs['summary']['total_tables']}, metrics.counters['document_bytes_read']
+
+def bench_implementation(corpus: Path):
+    metrics = Metrics('benchmark')
+    implementation = build_analysis(*analyze_project(corpus, metrics=metrics))
+    return implementation, {'pages': implementation['summary']['web_pages'],
+                            'components': implementation['summary']['web_components']}, \
+        metrics.counters['dirs_scanned'] + metrics.counters['files_scanned']
+
+def bench_report(corpus: Path, specifications, implementation, database):
+    metrics = Metrics('benchmark')
+    result = write_reports(specifications, implementation, database, corpus / RESULTS_DIR, REPORT_FORMATS,
+                           metrics=metrics)
+    return None, {'report_bytes': sum(path.stat().st_size for path in result.paths)}, \
+        metrics.counters['report_rows'] + metrics.counters['indexed_files']
+
+# Stages in the order they run; the report reads the analyzers' saved results
+BENCHMARK_STAGES = [
+    Stage('database', bench_database),
+    Stage('specifications', bench_specifications),
+    Stage('implementation', bench_implementation),
+    Stage('report', bench_report, ('specifications', 'implementation', 'database')),
+]
+
+def run_stage(corpus: Path, name: str) -> Dict[str, Any]:
+    """Run one stage in this process and measure it; called in the child interpreter."""
+    stage = next(stage for stage in BENCHMARK_STAGES if stage.name == name)
+    inputs = {dependency: _load_result(corpus, dependency) for dependency in stage.depends_on}
+
+    started = time.perf_counter()
+    result, counts, input_size = stage.run(corpus, **inputs)
+    seconds = time.perf_counter() - started
+    peak = peak_memory_mb()
+
+    if result is not None:
+        (corpus / RESULTS_DIR).mkdir(exist_ok=True)
+        with open(corpus / RESULTS_DIR / f"{name}.json", 'w') as f:
+            json.dump(result, f)
+    return {'seconds': seconds, 'peak_rss_mb': peak, 'counts': counts, 'input_size': input_size}
+
+def measure_stage(corpus: Path, name: str, repeat: int) -> Dict[str, Any]:
+    """Best time and largest peak RSS of the stage over repeat fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, str(Path(__file__).resolve()), '--corpus', str(corpus),
+                                    '--run-stage', name], capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            raise SystemExit(f"Stage '{name}' failed with exit code {completed.returncode}")
+        runs.append(json.loads(completed.stdout.splitlines()[-1]))
+    peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    return {
+        'seconds': min(run['seconds'] for run in runs),
+        'peak_rss_mb': max(peaks) if peaks else None,
+        'counts': runs[-1]['counts'],
+        'input_size': runs[-1]['input_size']
+    }
+
+def measure_stages(corpus: Path, names: Iterable[str], repeat: int, label: str = '') -> Dict[str, Dict[str, Any]]:
+    """Measure the named stages in order; the report needs the analyzer results of an earlier run or this one."""
+    measurements = {}
+    for stage in BENCHMARK_STAGES:
+        if stage.name not in names:
+            continue
+        missing = [dependency for dependency in stage.depends_on
+                   if dependency not in measurements and not (corpus / RESULTS_DIR / f"{dependency}.json").exists()]
+        if missing:
+            raise SystemExit(f"Stage '{stage.name}' needs the results of: {', '.join(missing)}")
+        print(f"Running {label}{stage.name}...")
+        measurements[stage.name] = measure_stage(corpus, stage.name, repeat)
+    return measurements
+
+def load_baseline() -> Dict[str, Any]:
+    try:
+        with open(BASELINE_PATH, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _change(value: Optional[float], base: Optional[float]) -> str:
+    if value is None or not base:
+        return '-'
+    return f"{(value - base) / base:+.1%}"
+
+def _number(value: Optional[float]) -> str:
+    return '-' if value is None else f"{value:.2f}"
+
+def compare(measurements: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]],
+            time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """Print measurements beside the baseline and return a message per regression."""
+    stages = (baseline or {}).get('stages', {})
+    regressions = []
+
+    print(f"\n{'Stage'.ljust(16)}{'seconds':>10}{'baseline':>10}{'change':>9}"
+          f"{'peak MB':>10}{'baseline':>10}{'change':>9}  counts")
+    for name, measured in measurements.items():
+        base = stages.get(name, {})
+        seconds, base_seconds = measured['seconds'], base.get('seconds')
+        peak, base_peak = measured['peak_rss_mb'], base.get('peak_rss_mb')
+        counts = ', '.join(f"{key}={value}" for key, value in measured['counts'].items())
+        print(f"{name.ljust(16)}{_number(seconds):>10}{_number(base_seconds):>10}{_change(seconds, base_seconds):>9}"
+              f"{_number(peak):>10}{_number(base_peak):>10}{_change(peak, base_peak):>9}  {counts}")
+
+        if base_seconds is not None and seconds > base_seconds * (1 + time_tolerance) \
+                and seconds - base_seconds > TIME_NOISE_SECONDS:
+            regressions.append(f"{name}: {seconds:.2f}s vs baseline {base_seconds:.2f}s "
+                               f"({_change(seconds, base_seconds)}, allowed +{time_tolerance:.0%})")
+        if base_peak is not None and peak is not None and peak > base_peak * (1 + memory_tolerance) \
+                and peak - base_peak > MEMORY_NOISE_MB:
+            regressions.append(f"{name}: peak {peak:.1f} MB vs baseline {base_peak:.1f} MB "
+                               f"({_change(peak, base_peak)}, allowed +{memory_tolerance:.0%})")
+    return regressions
+
+def check_scaling(measurements: Dict[str, Dict[str, Any]], reference: Dict[str, Dict[str, Any]],
+                  reference_scale: str, tolerance: float) -> List[str]:
+    """Print how each stage's time grew against its input since the reference scale; a message per offender."""
+    regressions = []
+    print(f"\nScaling against the {reference_scale} corpus:")
+    print(f"{'Stage'.ljust(16)}{'input x':>10}{'time x':>10}{'ratio':>9}")
+    for name, measured in measurements.items():
+        base = reference.get(name)
+        if base is None or not base['input_size'] or base['seconds'] < TIME_NOISE_SECONDS:
+            # Too fast at the reference scale for the ratio to mean anything
+            print(f"{name.ljust(16)}{'-':>10}{'-':>10}{'-':>9}")
+            continue
+        input_growth = measured['input_size'] / base['input_size']
+        time_growth = measured['seconds'] / base['seconds']
+        ratio = time_growth / input_growth
+        print(f"{name.ljust(16)}{input_growth:>10.1f}{time_growth:>10.1f}{ratio:>9.2f}")
+        if ratio > tolerance:
+            regressions.append(f"{name}: {time_growth:.1f}x slower for {input_growth:.1f}x more input than "
+                               f"the {reference_scale} corpus (allowed {tolerance:.1f}x the input growth)")
+    return regressions
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description='Benchmark the analyzers on synthetic corpora')
+    parser.add_argument('--scale', choices=SCALES, default='smoke', help='corpus size preset (default: smoke)')
+    for field in CorpusSpec._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, metavar='N',
+                            help=f"override the preset's {field.replace('_', ' ')}")
+    parser.add_argument('--corpus', type=Path, help='where to generate the corpus (default: a temp dir per scale)')
+    parser.add_argument('--stages', nargs='+', choices=[stage.name for stage in BENCHMARK_STAGES],
+                        help='stages to run (default: all; the report needs the analyzer results)')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh runs per stage, best time kept (default: 3)')
+    parser.add_argument('--time-tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default: 0.25)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.15,
+                        help='allowed peak memory growth against the baseline (default: 0.15)')
+    parser.add_argument('--scaling-tolerance', type=float, default=SCALING_TOLERANCE,
+                        help='allowed time growth per unit of input growth against the smaller reference scale '
+                             f"(default: {SCALING_TOLERANCE})")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help=f"store these results as the baseline for the scale in {BASELINE_PATH.name}")
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    spec = SCALES[args.scale]._replace(**{field: getattr(args, field) for field in CorpusSpec._fields
+                                          if getattr(args, field) is not None})
+    corpus = args.corpus or Path(tempfile.gettempdir()) / 'b2bplus-benchmark' / args.scale
+
+    if args.run_stage:
+        print(json.dumps(run_stage(corpus, args.run_stage)))
+        return
+
+    started = time.perf_counter()
+    if ensure_corpus(corpus, spec):
+        print(f"Generated {args.scale} corpus in {corpus} ({time.perf_counter() - started:.1f}s)")
+    else:
+        print(f"Reusing {args.scale} corpus in {corpus}")
+
+    names = args.stages or [stage.name for stage in BENCHMARK_STAGES]
+    measurements = measure_stages(corpus, names, args.repeat)
+
+    scaling = []
+    reference_scale = SCALING_REFERENCES.get(args.scale)
+    if reference_scale is not None:
+        reference_corpus = corpus.parent / reference_scale
+        if ensure_corpus(reference_corpus, SCALES[reference_scale]):
+            print(f"Generated {reference_scale} reference corpus in {reference_corpus}")
+        # The reference report needs analyzer results even when only the report is benchmarked
+        reference_names = set(names) | {dependency for stage in BENCHMARK_STAGES if stage.name in names
+                                        for dependency in stage.depends_on
+                                        if not (reference_corpus / RESULTS_DIR / f"{dependency}.json").exists()}
+        reference = measure_stages(reference_corpus, reference_names, args.repeat, f"{reference_scale} ")
+        scaling = check_scaling(measurements, reference, reference_scale, args.scaling_tolerance)
+
+    baselines = load_baseline()
+    baseline = baselines.get(args.scale)
+    if baseline is not None and baseline['spec'] != spec._asdict():
+        print(f"\nThe {args.scale} baseline was recorded with other corpus parameters; not comparing.")
+        baseline = None
+    regressions = compare(measurements, baseline, args.time_tolerance, args.memory_tolerance)
+
+    if scaling:
+        print("\nPERFORMANCE REGRESSION: stages scale worse than their input:")
+        for message in scaling:
+            print(f"  - {message}")
+        if args.update_baseline:
+            print(f"Not recording a {args.scale} baseline with a scaling regression.")
+        sys.exit(1)
+
+    if args.update_baseline:
+        stages = dict(baseline['stages']) if baseline else {}
+        stages.update(measurements)
+        baselines[args.scale] = {
+            'spec': spec._asdict(),
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'stages': stages
+        }
+        write_json(BASELINE_PATH, baselines)
+        print(f"\nBaseline for {args.scale} saved to: {BASELINE_PATH}")
+    elif baseline is None:
+        print(f"\nNo {args.scale} baseline to compare against; record one with --update-baseline.")
+    elif regressions:
+        print(f"\nPERFORMANCE REGRESSION against the {args.scale} baseline:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    else:
+        print(f"\nNo regressions against the {args.scale} baseline.")
+
+if __name__ == '__main__':
+    main()
@@ -3,95 +3,195 @@
 Extract all specifications, features, and requirements from planning documents.
 """
 
+import argparse
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from analysis_cache import AnalysisCache
+from instrumentation import Metrics, add_metrics_arguments, metrics_path
+from sql_lexer import LEXER_VERSION, parse_sql
+
+# Bump whenever analyze_document output changes
+PARSER_VERSION = '3'
 
 def extract_database_tables(content: str) -> List[Dict[str, Any]]:
     """Extract database table definitions from content."""
     tables = []
     
-    # Pattern to match CREATE TABLE statements
-    table_pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\);'
-    matches = re.finditer(table_pattern, content, re.DOTALL | re.IGNORECASE)
+    # SQL is embedded in prose, so let the lexer tolerate stray quotes
+    parsed = parse_sql(content, lenient=True, include_source=True)
     
-    for match in matches:
-        table_name = match.group(1)
-        columns_text = match.group(2)
-        
-        # Extract columns
+    for table in parsed['tables']:
         columns = []
-        for line in columns_text.split('\n'):
-            line = line.strip()
-            if line and not line.startswith('--') and not line.startswith('CONSTRAINT'):
-                # Basic column extraction
-                parts = line.split()
-                if len(parts) >= 2:
-                    col_name = parts[0].strip(',')
-                    col_type = parts[1].strip(',')
-                    columns.append({
-                        'name': col_name,
-                        'type': col_type,
-                        'definition': line
-                    })
+        for column in table['columns']:
+            columns.append({
+                'name': column['name'],
+                'type': column['type'],
+                'definition': column['definition']
+            })
         
         tables.append({
-            'name': table_name,
+            'name': table['name'],
             'columns': columns,
-            'full_definition': match.group(0)
+            'full_definition': table['full_definition']
         })
     
     return tables
 
+_HEADING = re.compile(r'(#{1,6})\s+(.+?)(?:\s+#+)?\s*$')
+_FENCE = re.compile(r'\s{0,3}(`{3,}|~{3,})')
+_BOLD_BULLET = re.compile(r'\s*[-*+]\s+\*\*(.+?)\*\*')
+_FEATURE_MARKER = re.compile(r'.*?\*\*Feature:\*\*\s+(.+)')
+_STEP_TITLE = re.compile(r'Step\s+[\d.]+:')
+
+def _new_section(level: int, title: str, start: int) -> Dict[str, Any]:
+    return {'level': level, 'title': title, 'start': start, 'end': start,
+            'code_blocks': 0, 'items': [], 'children': []}
+
+def parse_outline(content: str) -> Dict[str, Any]:
+    """Build the heading tree of a markdown document in one pass over its lines.
+
+    Each section spans from its heading to the next heading and records the
+    fenced code blocks and `- **Name**` / `**Feature:**` items it contains.
+    Lines inside fences are never read as headings or items. Returns the
+    root section (level 0), whose children are the top-level headings.
+    """
+    root = _new_section(0, '', 0)
+    stack = [root]
+    item = None
+    fence = None
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        start = offset
+        offset += len(line)
+        text = line.rstrip('\r\n')
+        
+        if fence is not None:
+            if text.strip().startswith(fence) and not text.strip().strip(fence[0]):
+                fence = None
+            if item is not None:
+                item['end'] = offset
+            continue
+        
+        match = _FENCE.match(text)
+        if match:
+            fence = match.group(1)
+            stack[-1]['code_blocks'] += 1
+            if item is not None:
+                item['code_blocks'] += 1
+                item['end'] = offset
+            continue
+        
+        match = _HEADING.match(text)
+        if match:
+            item = None
+            level = len(match.group(1))
+            while stack[-1]['level'] >= level:
+                stack.pop()
+            section = _new_section(level, match.group(2).strip(), start)
+            stack[-1]['children'].append(section)
+            stack.append(section)
+            continue
+        
+        if not text.strip():
+            item = None
+            continue
+        
+        match = _BOLD_BULLET.match(text) or _FEATURE_MARKER.match(text)
+        if match:
+            item = {'title': match.group(1).strip(), 'start': start, 'end': offset, 'code_blocks': 0}
+            stack[-1]['items'].append(item)
+        elif item is not None:
+            if text.lstrip()[:2] in ('- ', '* ', '+ '):
+                # A plain bullet ends the item it follows
+                item = None
+            else:
+                item['end'] = offset
+    
+    # A section ends where the next heading starts, whatever its level
+    def close(section: Dict[str, Any], end: int) -> int:
+        for child in reversed(section['children']):
+            end = close(child, end)
+        section['end'] = section['children'][0]['start'] if section['children'] else end
+        return section['start']
+    close(root, len(content))
+    return root
+
+def iter_sections(section: Dict[str, Any]):
+    """Yield the sections below section in document order."""
+    for child in section['children']:
+        yield child
+        yield from iter_sections(child)
+
+def _feature(phase: str, title: str, content: str, start: int, end: int, code_blocks: int) -> Dict[str, Any]:
+    return {
+        'phase': phase,
+        'title': title[:200],  # Limit title length
+        'description': content[start:min(end, start + 500)],  # Limit description
+        'has_code': code_blocks > 0,
+        'code_blocks_count': code_blocks
+    }
+
 def extract_features(content: str, phase: str) -> List[Dict[str, Any]]:
-    """Extract features and requirements from content."""
+    """Extract features and requirements from content.
+
+    Every `###`-or-deeper section and every `Step N:` section is a feature, as
+    are `- **Name**: ...` bullets and `**Feature:**` lines, each emitted once.
+    """
     features = []
+    outline = parse_outline(content)
     
-    # Look for numbered steps, features, or requirements
-    patterns = [
-        r'###\s+Step\s+[\d.]+:\s+(.+?)(?=###|\Z)',
-        r'###\s+(.+?)(?=###|\Z)',
-        r'\*\*Feature:\*\*\s+(.+?)(?=\*\*|\Z)',
-        r'-\s+\*\*(.+?)\*\*:?\s+(.+?)(?=\n-|\Z)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, content, re.DOTALL)
-        for match in matches:
-            feature_text = match.group(0)
-            title = match.group(1).strip() if match.lastindex >= 1 else "Unknown"
-            
-            # Extract any code blocks or implementation details
-            code_blocks = re.findall(r'```[\w]*\n(.*?)```', feature_text, re.DOTALL)
-            
-            features.append({
-                'phase': phase,
-                'title': title[:200],  # Limit title length
-                'description': feature_text[:500],  # Limit description
-                'has_code': len(code_blocks) > 0,
-                'code_blocks_count': len(code_blocks)
-            })
+    def add_items(section: Dict[str, Any]):
+        for item in section['items']:
+            features.append(_feature(phase, item['title'], content, item['start'], item['end'], item['code_blocks']))
+    
+    add_items(outline)
+    for section in iter_sections(outline):
+        if section['level'] >= 3 or _STEP_TITLE.match(section['title']):
+            features.append(_feature(phase, section['title'], content, section['start'], section['end'],
+                                     section['code_blocks']))
+        add_items(section)
     
     return features
 
-def extract_components(content: str) -> List[str]:
-    """Extract component names from content."""
-    components = set()
-    
-    # Look for component file references
-    patterns = [
-        r'(\w+\.tsx)',
-        r'(\w+\.ts)',
-        r'<(\w+)\s',  # JSX components
-        r'import\s+\{?\s*(\w+)',
-    ]
+# One alternation for every kind of component reference; the group that
+# matched gives the kind
+_COMPONENT_PATTERN = re.compile(r"""
+    (?P<file>\w+\.tsx?)\b           # component or module files
+  | <(?P<jsx>\w+)\s                 # JSX elements
+  | import\s+\{?\s*(?P<import>\w+)  # first imported binding
+""", re.VERBOSE)
+
+def extract_components(content: str) -> List[Dict[str, Any]]:
+    """Extract component references from content in a single scan.
+
+    Returns one entry per (name, kind) with its hit count and the line and
+    offset where it first appears, sorted by name.
+    """
+    components = {}
+    line = 1
+    scanned = 0
     
-    for pattern in patterns:
-        matches = re.findall(pattern, content)
-        components.update(matches)
+    for match in _COMPONENT_PATTERN.finditer(content):
+        kind = match.lastgroup
+        name = match.group(kind)
+        entry = components.get((name, kind))
+        if entry is None:
+            line += content.count('\n', scanned, match.start())
+            scanned = match.start()
+            components[(name, kind)] = {
+                'name': name,
+                'kind': kind,
+                'count': 1,
+                'first_line': line,
+                'first_offset': match.start(kind)
+            }
+        else:
+            entry['count'] += 1
     
-    return sorted(list(components))
+    return [components[key] for key in sorted(components)]
 
 def analyze_document(file_path: Path) -> Dict[str, Any]:
     """Analyze a single planning document."""
@@ -110,9 +210,10 @@ def analyze_document(file_path: Path) -> Dict[str, Any]:
         'components': extract_components(content)
     }
 
-def main():
-    """Main extraction function."""
-    project_root = Path('/home/ubuntu/b2bplus')
+def extract_specifications(project_root: Path, cache: AnalysisCache, verbose: bool = True,
+                           metrics: Optional[Metrics] = None) -> Dict[str, Any]:
+    """Analyze every planning document under project_root."""
+    metrics = metrics or Metrics('extract_specifications')
     planning_docs = list(project_root.glob('b2b-*.txt'))
     
     all_specs = {
@@ -126,18 +227,46 @@ def main():
     }
     
     for doc_path in sorted(planning_docs):
-        print(f"Analyzing {doc_path.name}...")
-        analysis = analyze_document(doc_path)
+        if verbose:
+            print(f"Analyzing {doc_path.name}...")
+        misses = cache.misses
+        with metrics.stage('analyze_documents'):
+            analysis = cache.get_or_compute(doc_path, analyze_document)
         all_specs['documents'].append(analysis)
+        metrics.count('documents_read')
+        metrics.count('documents_parsed', cache.misses - misses)
+        metrics.count('document_bytes_read', doc_path.stat().st_size)
+        metrics.count('component_matches', sum(component['count'] for component in analysis['components']))
         
         all_specs['summary']['total_tables'] += len(analysis['tables'])
         all_specs['summary']['total_features'] += len(analysis['features'])
-        all_specs['summary']['total_components'] += len(analysis['components'])
+        all_specs['summary']['total_components'] += len({c['name'] for c in analysis['components']})
+    
+    metrics.count('features', all_specs['summary']['total_features'])
+    metrics.count('spec_tables', all_specs['summary']['total_tables'])
+    return all_specs
+
+def main():
+    """Main extraction function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-cache', action='store_true', help='re-parse every document')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parent,
+                        help='project to analyze (default: %(default)s)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
     
-    # Save to JSON
+    project_root = args.root
     output_path = project_root / 'extracted_specifications.json'
-    with open(output_path, 'w') as f:
-        json.dump(all_specs, f, indent=2)
+    cache = AnalysisCache(project_root, 'documents', f"{PARSER_VERSION}-{LEXER_VERSION}", enabled=not args.no_cache)
+    with Metrics.from_args('extract_specifications', args) as metrics:
+        all_specs = extract_specifications(project_root, cache, metrics=metrics)
+        
+        # Save to JSON
+        with metrics.stage('write_json'):
+            with open(output_path, 'w') as f:
+                json.dump(all_specs, f, indent=2)
+        metrics.count('cache_hits', cache.hits)
+    metrics.write(metrics_path(output_path))
     
     print(f"\nExtraction complete!")
     print(f"Total documents: {all_specs['summary']['total_documents']}")
@@ -145,6 +274,9 @@ def main():
     print(f"Total features found: {all_specs['summary']['total_features']}")
     print(f"Total components found: {all_specs['summary']['total_components']}")
     print(f"\nResults saved to: {output_path}")
+    print(f"Metrics saved to: {metrics_path(output_path)}")
+    cache.prune()
+    print(cache.report())
 
 if __name__ == '__main__':
     main()
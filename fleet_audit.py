@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Run the analysis pipeline over many projects in parallel.
+
+Each repository root is analyzed and reported on in its own worker process,
+with at most --jobs running at once, so a nightly audit of many forks scales
+with the number of cores. Per-repository outputs, including the parse cache,
+go to OUTPUT_DIR/<name>/, so the checkouts are only read. FLEET_SUMMARY.md
+and fleet_summary.json in OUTPUT_DIR compare the repositories' completion.
+
+Usage: python3 fleet_audit.py ROOT [ROOT ...] --output-dir DIR [--roots-file FILE] [--jobs N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+
+from analysis_store import DEFAULT_STORE_NAME
+from generate_report import REPORT_FORMATS
+from instrumentation import Metrics
+from pipeline import run_project, write_json
+
+FLEET_SUMMARY_MARKDOWN = 'FLEET_SUMMARY.md'
+FLEET_SUMMARY_JSON = 'fleet_summary.json'
+
+def read_roots(roots: Iterable[Path], roots_file: Optional[Path] = None) -> List[Path]:
+    """The roots given directly and listed one per line in roots_file, without duplicates."""
+    roots = list(roots)
+    if roots_file is not None:
+        for line in roots_file.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                roots.append(Path(line))
+    unique = {}
+    for root in roots:
+        unique.setdefault(root.expanduser().resolve(), None)
+    return list(unique)
+
+def output_names(roots: List[Path]) -> List[str]:
+    """A distinct output directory name per root, from its last path component."""
+    names = []
+    used = set()
+    for root in roots:
+        base = root.name or 'root'
+        name = base
+        suffix = 2
+        while name in used:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+def completion(phase_completion: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    total = sum(data['total'] for data in phase_completion.values())
+    complete = sum(data['complete'] for data in phase_completion.values())
+    return {'total': total, 'complete': complete, 'percentage': (complete / total) * 100 if total else 0.0}
+
+def audit_project(name: str, project_root: Path, output_dir: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the pipeline for one project in a worker process; failures are reported, not raised.
+
+    The projects already run one per process, so the analyzers stay in this one.
+    """
+    audit = {'name': name, 'project_root': str(project_root), 'output_dir': str(output_dir)}
+    started = time.perf_counter()
+    try:
+        if not project_root.is_dir():
+            raise FileNotFoundError(f"not a directory: {project_root}")
+        run = run_project(project_root, output_dir, use_cache=options['use_cache'], formats=options['formats'],
+                          json_artifacts=options['json_artifacts'],
+                          store_path=output_dir / DEFAULT_STORE_NAME if options['store'] else None,
+                          metrics=Metrics('pipeline', trace_memory=options['trace_memory']),
+                          cache_dir=output_dir, processes=False)
+    except Exception as e:
+        audit.update(status='failed', error=f"{type(e).__name__}: {e}",
+                     elapsed_seconds=time.perf_counter() - started)
+        return audit
+    audit.update(status='complete', completion=completion(run['phase_completion']), **run)
+    return audit
+
+def aggregate(audits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fleet-wide totals over the audits that completed."""
+    phases: Dict[str, Dict[str, int]] = {}
+    for audit in audits:
+        for phase, data in audit.get('phase_completion', {}).items():
+            totals = phases.setdefault(phase, {'total': 0, 'complete': 0})
+            totals['total'] += data['total']
+            totals['complete'] += data['complete']
+    return {
+        'repositories': len(audits),
+        'failed': sum(1 for audit in audits if audit['status'] == 'failed'),
+        'phase_completion': phases,
+        'completion': completion(phases)
+    }
+
+def render_summary(audits: List[Dict[str, Any]], totals: Dict[str, Any], generated_at: str) -> str:
+    lines = [
+        "# B2B+ Fleet Audit Summary",
+        "",
+        f"**Generated:** {generated_at}  ",
+        f"**Repositories:** {totals['repositories']} ({totals['failed']} failed)  ",
+        f"**Overall completion:** {totals['completion']['complete']} of {totals['completion']['total']} specs "
+        f"({totals['completion']['percentage']:.1f}%)",
+        "",
+        "## Repositories",
+        "",
+        "| Repository | Status | Total Specs | Complete | Completion % | Tables | Migrations | Seconds |",
+        "|------------|--------|-------------|----------|--------------|--------|------------|---------|",
+    ]
+    for audit in audits:
+        if audit['status'] == 'failed':
+            lines.append(f"| {audit['name']} | ❌ Failed | - | - | - | - | - | {audit['elapsed_seconds']:.2f} |")
+            continue
+        done = audit['completion']
+        database = audit['summary']['database']
+        lines.append(f"| {audit['name']} | ✅ Complete | {done['total']} | {done['complete']} | "
+                     f"{done['percentage']:.1f}% | {database['total_tables']} | {database['total_migrations']} | "
+                     f"{audit['elapsed_seconds']:.2f} |")
+
+    lines += [
+        "",
+        "## Completion by Phase",
+        "",
+        "| Phase   | Total Specs | Complete | Completion % |",
+        "|---------|-------------|----------|--------------|",
+    ]
+    for phase, data in totals['phase_completion'].items():
+        if data['total'] > 0:
+            percentage = (data['complete'] / data['total']) * 100
+            lines.append(f"| {phase} | {data['total']} | {data['complete']} | {percentage:.1f}% |")
+    lines.append(f"| **Total** | **{totals['completion']['total']}** | **{totals['completion']['complete']}** | "
+                 f"**{totals['completion']['percentage']:.1f}%** |")
+
+    failed = [audit for audit in audits if audit['status'] == 'failed']
+    if failed:
+        lines += ["", "## Failures", ""]
+        lines += [f"- **{audit['name']}** (`{audit['project_root']}`): {audit['error']}" for audit in failed]
+    return '\n'.join(lines) + '\n'
+
+def write_summary(output_dir: Path, audits: List[Dict[str, Any]]) -> List[Path]:
+    """Write the cross-repository summary as Markdown and JSON; returns both paths."""
+    totals = aggregate(audits)
+    generated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    json_path = output_dir / FLEET_SUMMARY_JSON
+    write_json(json_path, {'generated_at': generated_at, 'totals': totals, 'repositories': audits})
+
+    markdown_path = output_dir / FLEET_SUMMARY_MARKDOWN
+    tmp_path = markdown_path.with_name(f"{markdown_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render_summary(audits, totals, generated_at))
+    os.replace(tmp_path, markdown_path)
+    return [markdown_path, json_path]
+
+def main():
+    """Main fleet audit function."""
+    parser = argparse.ArgumentParser(description='Run the analysis pipeline over many projects in parallel')
+    parser.add_argument('roots', nargs='*', type=Path, metavar='ROOT', help='project roots to audit')
+    parser.add_argument('--roots-file', type=Path, help='file listing more project roots, one per line')
+    parser.add_argument('--output-dir', type=Path, required=True,
+                        help='where to write the per-repository outputs and the fleet summary')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='projects analyzed at once (default: the number of cores)')
+    parser.add_argument('--format', nargs='+', choices=REPORT_FORMATS, default=list(REPORT_FORMATS),
+                        dest='formats', help='report formats to write per project (default: all)')
+    parser.add_argument('--write-json', action='store_true', help='also write each project\'s analysis JSON files')
+    parser.add_argument('--store', action='store_true',
+                        help=f"record each run in a per-project {DEFAULT_STORE_NAME} in its output directory")
+    parser.add_argument('--no-cache', action='store_true', help='re-parse every document and migration')
+    parser.add_argument('--trace-memory', action='store_true', help='record tracemalloc peaks in each project\'s metrics')
+    args = parser.parse_args()
+
+    roots = read_roots(args.roots, args.roots_file)
+    if not roots:
+        parser.error('no project roots given')
+    options = {
+        'use_cache': not args.no_cache,
+        'formats': args.formats,
+        'json_artifacts': args.write_json,
+        'store': args.store,
+        'trace_memory': args.trace_memory
+    }
+    names = output_names(roots)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = max(1, min(args.jobs, len(roots)))
+    print(f"Auditing {len(roots)} projects with {jobs} workers...")
+    started = time.perf_counter()
+    audits: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(audit_project, name, root, args.output_dir / name, options): (name, root)
+                   for name, root in zip(names, roots)}
+        for future in as_completed(futures):
+            name, root = futures[future]
+            try:
+                audit = future.result()
+            except Exception as e:
+                # The worker itself died, e.g. killed for memory
+                audit = {'name': name, 'project_root': str(root), 'output_dir': str(args.output_dir / name),
+                         'status': 'failed', 'error': f"{type(e).__name__}: {e}", 'elapsed_seconds': 0.0}
+            audits[name] = audit
+            if audit['status'] == 'failed':
+                print(f"  [{len(audits)}/{len(roots)}] ✗ {name}: {audit['error']}")
+            else:
+                done = audit['completion']
+                print(f"  [{len(audits)}/{len(roots)}] ✓ {name}: {done['complete']}/{done['total']} specs complete "
+                      f"({done['percentage']:.1f}%) in {audit['elapsed_seconds']:.2f}s")
+
+    # Summaries list the projects in the order they were given
+    ordered = [audits[name] for name in names]
+    paths = write_summary(args.output_dir, ordered)
+    failed = sum(1 for audit in ordered if audit['status'] == 'failed')
+    print(f"\nAudited {len(roots)} projects in {time.perf_counter() - started:.2f}s ({failed} failed)")
+    for path in paths:
+        print(f"Summary saved to: {path}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
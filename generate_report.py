@@ -3,11 +3,23 @@
 Generate a comprehensive progress report by comparing specifications against implementation.
 """
 
+import abc
+import argparse
+import csv
+import heapq
 import json
+import os
+import shutil
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, FrozenSet, IO, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
 import re
 
+from analysis_store import DEFAULT_STORE_NAME, AnalysisStore
+from instrumentation import Metrics, add_metrics_arguments, metrics_path
+from name_matcher import NameMatcher
+
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """Load a JSON file."""
     if not file_path.exists():
@@ -15,60 +27,192 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def get_implementation_status(spec_title: str, spec_desc: str, implementation_analysis: Dict[str, Any], db_analysis: Dict[str, Any]) -> Dict[str, str]:
+# Files are indexed by character trigrams; a term's candidates are the files
+# holding all of its trigrams, so only those get the substring test
+NGRAM_SIZE = 3
+
+_FILE_REFERENCE = re.compile(r'\b\w+\.tsx|\w+\.ts|\w+\.sql\b')
+
+# Path substrings get_implementation_status asks about across all of a spec's matches
+FILE_MARKERS = ('.tsx', '.sql')
+
+# Component reference kinds that name something the codebase should define;
+# imports mostly name library bindings, and lowercase JSX elements are HTML
+COMPONENT_KINDS = ('file', 'jsx')
+# Missing components listed per phase in the Markdown report
+MAX_LISTED_COMPONENTS = 20
+
+class TermMatches(NamedTuple):
+    """The files whose lowercase path contains a term."""
+    file_ids: List[int]  # ascending
+    markers: FrozenSet[str]  # FILE_MARKERS found in any of those paths
+
+class FileMatches(NamedTuple):
+    """The first files matching any of a spec's terms, and the markers of all of them."""
+    files: List[str]
+    markers: Set[str]
+
+# Implementation files matched against specs, in matching order
+FILE_CATEGORIES = ([(f"apps/{app_type}", category) for app_type in ['web', 'mobile']
+                    for category in ['pages', 'components', 'api_routes', 'hooks', 'lib', 'screens', 'contexts']] +
+                   [(f"packages/{pkg}", 'files') for pkg in ['shared', 'ui', 'supabase']])
+
+class ImplementationIndex:
+    """Lookups over the implementation and database analyses, built once per report.
+
+    File paths go into a character n-gram inverted index so that finding the
+    files containing a search term costs a few set intersections instead of
+    a scan over every file.
+    """
+
+    def __init__(self, tables: Iterable[Dict[str, Any]], files: List[str]):
+        # Database tables, first one wins when several names share a spelling
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        for table in tables:
+            self.tables.setdefault(table['name'].lower(), table)
+        self.table_matcher = NameMatcher(table['name'] for table in self.tables.values())
+        self._table_order = {name: position for position, name in enumerate(self.tables)}
+        
+        # Codebase files (components, pages, etc.)
+        self.files = files
+        self._stems = {Path(file).name.split('.', 1)[0].lower() for file in files}
+        
+        self._lower = [file.lower() for file in self.files]
+        self.postings: Dict[str, Set[int]] = {}
+        for file_id, file_lower in enumerate(self._lower):
+            for i in range(len(file_lower) - NGRAM_SIZE + 1):
+                self.postings.setdefault(file_lower[i:i + NGRAM_SIZE], set()).add(file_id)
+        self._marker_files = {marker: {file_id for file_id, file in enumerate(self.files) if marker in file}
+                              for marker in FILE_MARKERS}
+        # Specs share most of their search terms
+        self._term_matches: Dict[str, TermMatches] = {}
+        self.term_lookups = 0
+
+    @classmethod
+    def from_analyses(cls, implementation_analysis: Dict[str, Any], db_analysis: Dict[str, Any]) -> 'ImplementationIndex':
+        structure = implementation_analysis.get('structure', {})
+        files = []
+        for section, category in FILE_CATEGORIES:
+            group, name = section.split('/')
+            files.extend(structure.get(group, {}).get(name, {}).get(category, []))
+        return cls(db_analysis.get('tables', []), files)
+
+    @classmethod
+    def from_store(cls, store: AnalysisStore, run_id: int) -> 'ImplementationIndex':
+        """Load only the table names, column lists and matched file lists of a stored run."""
+        files = []
+        for section, category in FILE_CATEGORIES:
+            files.extend(store.files(run_id, section, category))
+        return cls(store.tables(run_id), files)
+
+    def find_tables(self, **texts: str) -> List[Dict[str, Any]]:
+        """Every whole-word table name hit in the given fields, e.g. title=..., description=..."""
+        hits = []
+        for field, text in texts.items():
+            for match in self.table_matcher.finditer(text):
+                hits.append({'table': match.name, 'field': field, 'start': match.start, 'end': match.end})
+        return hits
+
+    def primary_table(self, hits: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """The hit table that comes first in the database analysis."""
+        return min((self.tables[hit['table'].lower()] for hit in hits),
+                   key=lambda table: self._table_order[table['name'].lower()])
+
+    def files_containing(self, term: str) -> Set[int]:
+        """Ids of the files whose lowercase path contains term."""
+        if len(term) < NGRAM_SIZE:
+            # Too short to have a trigram; rare enough that a scan is fine
+            return {file_id for file_id, file_lower in enumerate(self._lower) if term in file_lower}
+        grams = sorted((self.postings.get(term[i:i + NGRAM_SIZE], set())
+                        for i in range(len(term) - NGRAM_SIZE + 1)), key=len)
+        if len(term) == NGRAM_SIZE:
+            return grams[0]
+        candidates = grams[0].intersection(*grams[1:])
+        return {file_id for file_id in candidates if term in self._lower[file_id]}
+
+    def term_matches(self, term: str) -> TermMatches:
+        """The sorted matches of term and their markers, computed once per distinct term."""
+        self.term_lookups += 1
+        matches = self._term_matches.get(term)
+        if matches is None:
+            file_ids = self.files_containing(term)
+            markers = frozenset(marker for marker, marked in self._marker_files.items()
+                                if not marked.isdisjoint(file_ids))
+            matches = self._term_matches[term] = TermMatches(sorted(file_ids), markers)
+        return matches
+
+    def find_files(self, terms: List[str], limit: int) -> FileMatches:
+        """The first limit files matching any of the terms, in analysis order.
+
+        Only the heads of the terms' sorted match lists are merged, so a term
+        matching nearly every file costs no more than a rare one.
+        """
+        matches = [self.term_matches(term) for term in terms]
+        file_ids: List[int] = []
+        for file_id in heapq.merge(*(match.file_ids for match in matches)):
+            if not file_ids or file_ids[-1] != file_id:
+                file_ids.append(file_id)
+                if len(file_ids) == limit:
+                    break
+        return FileMatches([self.files[file_id] for file_id in file_ids],
+                           set().union(*(match.markers for match in matches)))
+
+    def has_component(self, name: str) -> bool:
+        """Whether a file is named after the component, e.g. AuthContext.tsx for <AuthContext> or AuthContext.ts."""
+        return name.split('.', 1)[0].lower() in self._stems
+
+    def stats(self) -> Dict[str, int]:
+        """Index sizes and lookup counts, for the run metrics."""
+        return {
+            'indexed_files': len(self.files),
+            'indexed_tables': len(self.tables),
+            'trigrams': len(self.postings),
+            'term_lookups': self.term_lookups,
+            'distinct_terms': len(self._term_matches)
+        }
+
+def get_implementation_status(spec_title: str, spec_desc: str, index: ImplementationIndex) -> Dict[str, str]:
     """Determine the implementation status of a specification."""
     status = {
         'status': '❌ Not Started',
         'gap': 'Feature not found in codebase or database.',
-        'implementation_details': ''
+        'implementation_details': '',
+        'table_hits': []
     }
     
     spec_title_lower = spec_title.lower()
-    spec_desc_lower = spec_desc.lower()
     
     # Check database tables
-    for table in db_analysis.get('tables', []):
-        if table['name'].lower() in spec_title_lower or table['name'].lower() in spec_desc_lower:
-            status['status'] = '✅ Complete'
-            status['gap'] = 'Database table exists.'
-            status['implementation_details'] = f"Table: {table['name']}"
-            # Check for partial implementation
-            if 'columns' in table and len(table['columns']) == 0:
-                status['status'] = '🔄 Partially Complete'
-                status['gap'] = 'Table exists but has no columns defined in migrations.'
-            return status
-
-    # Check codebase (components, pages, etc.)
-    all_files = []
-    for app_type in ['web', 'mobile']:
-        for category in ['pages', 'components', 'api_routes', 'hooks', 'lib', 'screens', 'contexts']:
-            all_files.extend(implementation_analysis.get('structure', {}).get('apps', {}).get(app_type, {}).get(category, []))
-    
-    for pkg in ['shared', 'ui', 'supabase']:
-        all_files.extend(implementation_analysis.get('structure', {}).get('packages', {}).get(pkg, {}).get('files', []))
+    hits = index.find_tables(title=spec_title, description=spec_desc)
+    if hits:
+        table = index.primary_table(hits)
+        names = list(dict.fromkeys(hit['table'] for hit in hits))
+        status['status'] = '✅ Complete'
+        status['gap'] = 'Database table exists.'
+        status['implementation_details'] = f"Table{'s' if len(names) > 1 else ''}: {', '.join(names)}"
+        status['table_hits'] = hits
+        # Check for partial implementation
+        if 'columns' in table and len(table['columns']) == 0:
+            status['status'] = '🔄 Partially Complete'
+            status['gap'] = 'Table exists but has no columns defined in migrations.'
+        return status
 
     # Simple keyword matching
-    search_terms = re.findall(r'\b\w+\.tsx|\w+\.ts|\w+\.sql\b', spec_desc) + spec_title.split()
+    search_terms = _FILE_REFERENCE.findall(spec_desc) + spec_title.split()
     search_terms = [s.lower().replace('.tsx', '').replace('.ts','').replace('.sql','') for s in search_terms if len(s) > 3]
     
-    found_files = []
-    for file in all_files:
-        file_lower = file.lower()
-        for term in search_terms:
-            if term in file_lower:
-                found_files.append(file)
-                break
+    found = index.find_files(search_terms, limit=3)
     
-    if found_files:
+    if found.files:
         status['status'] = '✅ Complete'
         status['gap'] = 'Related files found in codebase.'
-        status['implementation_details'] = f"Files: {', '.join(found_files[:3])}"
+        status['implementation_details'] = f"Files: {', '.join(found.files)}"
         
         # Check for partial implementation
-        if 'create' in spec_title_lower and 'component' in spec_title_lower and not any('.tsx' in f for f in found_files):
+        if 'create' in spec_title_lower and 'component' in spec_title_lower and '.tsx' not in found.markers:
              status['status'] = '🔄 Partially Complete'
              status['gap'] = 'Logic exists, but no UI component found.'
-        elif 'database' in spec_title_lower and not any('.sql' in f for f in found_files):
+        elif 'database' in spec_title_lower and '.sql' not in found.markers:
              status['status'] = '🔄 Partially Complete'
              status['gap'] = 'Logic exists, but no database migration found.'
 
@@ -79,20 +223,334 @@ def get_implementation_status(spec_title: str, spec_desc: str, implementation_an
         
     return status
 
-def main():
-    """Main report generation function."""
-    project_root = Path("/home/ubuntu/b2bplus")
-    
-    # Load analysis files
-    specs = load_json_file(project_root / "extracted_specifications.json")
-    implementation = load_json_file(project_root / "implementation_analysis.json")
-    database = load_json_file(project_root / "database_analysis.json")
-    
-    if not all([specs, implementation, database]):
-        print("Error: Missing analysis files. Please run extraction scripts first.")
-        return
+REPORT_FORMATS = ('markdown', 'csv', 'jsonl')
+REPORT_SUFFIXES = {'markdown': '.md', 'csv': '.csv', 'jsonl': '.jsonl'}
+ROW_FIELDS = ['phase', 'specification', 'status', 'gap', 'details']
+
+# Detail rows the Markdown writer sorts in memory before spilling a run to disk
+SORT_RUN_SIZE = 10000
+
+def is_complete(status: str) -> bool:
+    return '✅' in status or '🔀' in status
+
+def is_incomplete(status: str) -> bool:
+    return '❌' in status or '🔄' in status
+
+class ReportWriter(abc.ABC):
+    """Receives report rows one at a time and streams them to path.
+
+    Output goes to a temporary file that replaces path on finish(), so a
+    reader never sees a half-written report.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        self.file = open(self._tmp_path, 'w', encoding='utf-8', newline='')
+
+    @abc.abstractmethod
+    def write_row(self, row: Dict[str, Any]):
+        """Write one report row."""
+
+    def add_components(self, breakdown: Dict[str, Dict[str, Any]]):
+        """Receive the per-phase component breakdown before finish(); row formats ignore it."""
+
+    def finish(self, phase_completion: Dict[str, Dict[str, int]]):
+        self.file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+class CsvReportWriter(ReportWriter):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.writer = csv.DictWriter(self.file, fieldnames=ROW_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write_row(self, row: Dict[str, Any]):
+        self.writer.writerow(row)
+
+class JsonLinesReportWriter(ReportWriter):
+    def write_row(self, row: Dict[str, Any]):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+class MarkdownReportWriter(ReportWriter):
+    """The human-readable PROGRESS_REPORT.md.
+
+    Its summary needs the final totals and its detail table is sorted, so
+    rows are spooled to temporary files (sorted runs merged at the end for
+    the detail table, one spool per phase for the remaining work) and the
+    document is assembled in finish().
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._run: List[Tuple[str, str, str]] = []
+        self._runs: List[IO[str]] = []
+        self._remaining: Dict[str, IO[str]] = {}
+        self._components: Dict[str, Dict[str, Any]] = {}
+
+    def add_components(self, breakdown: Dict[str, Dict[str, Any]]):
+        self._components = breakdown
+
+    def write_row(self, row: Dict[str, Any]):
+        spec = row['specification'].replace("\n", " ")
+        gap = f"{row['gap']} {row['details']}".replace("\n", " ")
+        self._run.append((row['phase'], row['specification'],
+                          f"| {row['phase']} | {spec} | {row['status']} | {gap} |\n"))
+        if len(self._run) >= SORT_RUN_SIZE:
+            self._spill()
+        
+        if is_incomplete(row['status']):
+            spool = self._remaining.get(row['phase'])
+            if spool is None:
+                spool = self._remaining[row['phase']] = tempfile.TemporaryFile('w+', encoding='utf-8')
+            spool.write(f"- **[{row['phase']}]** {spec} - *Status: {row['status']}*\n")
+
+    def _spill(self):
+        self._run.sort(key=lambda entry: entry[:2])
+        spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+        for entry in self._run:
+            spool.write(json.dumps(entry) + '\n')
+        spool.seek(0)
+        self._runs.append(spool)
+        self._run = []
 
-    report_data = []
+    def _detail_lines(self) -> Iterator[str]:
+        """Detail rows ordered by phase then specification, ties in input order."""
+        if not self._runs:
+            self._run.sort(key=lambda entry: entry[:2])
+            for entry in self._run:
+                yield entry[2]
+            return
+        if self._run:
+            self._spill()
+        runs = [(json.loads(line) for line in spool) for spool in self._runs]
+        for entry in heapq.merge(*runs, key=lambda entry: (entry[0], entry[1])):
+            yield entry[2]
+
+    def finish(self, phase_completion: Dict[str, Dict[str, int]]):
+        write = self.file.write
+        write("# B2B+ Project: Comprehensive Progress Report\n\n")
+        write("**Author:** Manus AI  \n**Date:** October 31, 2025\n\n---\n")
+        
+        # Executive Summary
+        write("## 1. Executive Summary\n\n")
+        write("This report provides a detailed analysis of the B2B+ project, comparing the original specifications against the current implementation. The following table summarizes the completion status by phase:\n\n")
+        write("| Phase   | Total Specs | Complete | Completion % |\n")
+        write("|---------|-------------|----------|--------------|\n")
+        total_specs = 0
+        total_complete = 0
+        for phase, data in phase_completion.items():
+            if data['total'] > 0:
+                percentage = (data['complete'] / data['total']) * 100
+                write(f"| {phase} | {data['total']} | {data['complete']} | {percentage:.1f}% |\n")
+                total_specs += data['total']
+                total_complete += data['complete']
+        
+        overall_percentage = (total_complete / total_specs) * 100 if total_specs > 0 else 0
+        write(f"| **Total** | **{total_specs}** | **{total_complete}** | **{overall_percentage:.1f}%** |\n\n")
+        
+        # Detailed Status Table
+        write("## 2. Detailed Implementation Status\n\n")
+        write("| Phase   | Specification | Status | Gap / Implementation Details |\n")
+        write("|---------|---------------|--------|------------------------------|\n")
+        for line in self._detail_lines():
+            write(line)
+        
+        # Remaining Work
+        write("\n## 3. Remaining Work Breakdown\n\n")
+        if not self._remaining:
+            write("✅ **All planned work has been completed or modified!**\n")
+        else:
+            for phase in sorted(self._remaining):
+                spool = self._remaining[phase]
+                spool.seek(0)
+                shutil.copyfileobj(spool, self.file)
+        
+        # Components
+        if self._components:
+            self._write_components()
+        
+        # Recommendations
+        write(f"\n## {5 if self._components else 4}. Next Steps & Recommendations\n\n")
+        write("Based on the analysis, the following steps are recommended to complete the project:\n\n")
+        write("1.  **Address `❌ Not Started` items first**, prioritizing foundational features like the mobile app setup and core authentication flows.\n")
+        write("2.  **Complete `🔄 Partially Complete` items**, such as finishing UI components and ensuring all database tables are fully migrated.\n")
+        write("3.  **Review `🔀 Modified` items** to ensure the implemented changes align with the overall project goals.\n")
+        write("4.  **Conduct a full end-to-end testing cycle** across both web and mobile platforms to validate all features.\n")
+        write("5.  **Prepare for deployment** by setting up production environments and CI/CD pipelines.\n")
+        
+        self._close_spools()
+        super().finish(phase_completion)
+
+    def _write_components(self):
+        write = self.file.write
+        write("\n## 4. Specified Components\n\n")
+        write("Components the specifications name as files or JSX elements, and whether a file of that name exists in the codebase:\n\n")
+        write("| Phase   | Referenced | Found | Missing |\n")
+        write("|---------|------------|-------|---------|\n")
+        for phase, data in self._components.items():
+            write(f"| {phase} | {data['referenced']} | {data['found']} | {len(data['missing'])} |\n")
+        for phase, data in self._components.items():
+            if not data['missing']:
+                continue
+            write(f"\n**{phase}: missing components, most referenced first**\n\n")
+            write("| Component | Kind | References | First Mention |\n")
+            write("|-----------|------|------------|---------------|\n")
+            for component in data['missing'][:MAX_LISTED_COMPONENTS]:
+                write(f"| `{component['name']}` | {component['kind']} | {component['count']} | "
+                      f"{component['document']}:{component['first_line']} |\n")
+            if len(data['missing']) > MAX_LISTED_COMPONENTS:
+                write(f"\n*... and {len(data['missing']) - MAX_LISTED_COMPONENTS} more*\n")
+
+    def abort(self):
+        self._close_spools()
+        super().abort()
+
+    def _close_spools(self):
+        for spool in self._runs + list(self._remaining.values()):
+            spool.close()
+        self._runs, self._remaining = [], {}
+
+class StoreReportWriter:
+    """Records the report rows of a run in an AnalysisStore, for trend queries."""
+
+    # Rows per insert batch
+    BATCH_SIZE = 1000
+
+    def __init__(self, store: AnalysisStore, run_id: int):
+        self.store = store
+        self.run_id = run_id
+        self._batch: List[Tuple[int, Dict[str, Any]]] = []
+        self._position = 0
+        store.clear_report_rows(run_id)
+
+    def write_row(self, row: Dict[str, Any]):
+        self._batch.append((self._position, row))
+        self._position += 1
+        if len(self._batch) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        self.store.insert_report_rows(self.run_id, self._batch, is_complete)
+        self._batch = []
+
+    def add_components(self, breakdown: Dict[str, Dict[str, Any]]):
+        pass
+
+    def finish(self, phase_completion: Dict[str, Dict[str, int]]):
+        self._flush()
+
+    def abort(self):
+        self.store.clear_report_rows(self.run_id)
+
+REPORT_WRITERS = {
+    'markdown': MarkdownReportWriter,
+    'csv': CsvReportWriter,
+    'jsonl': JsonLinesReportWriter
+}
+
+def iter_spec_features(specs: Dict[str, Any]) -> Iterator[Tuple[str, str, str]]:
+    """(phase, title, description) of every feature in a specification analysis."""
+    for doc in specs.get('documents', []):
+        phase = doc.get('phase', 'Master')
+        for feature in doc.get('features', []):
+            yield phase, feature['title'], feature['description']
+
+def iter_spec_components(specs: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """(phase, document, component) of every component reference in a specification analysis."""
+    for doc in specs.get('documents', []):
+        phase = doc.get('phase', 'Master')
+        for component in doc.get('components', []):
+            # Older analyses list bare names, without kind or counts
+            if isinstance(component, dict):
+                yield phase, doc['file'], component
+
+def component_breakdown(components: Iterable[Tuple[str, str, Dict[str, Any]]],
+                        index: ImplementationIndex) -> Dict[str, Dict[str, Any]]:
+    """Per phase, how many referenced components have a file, and the missing ones by references."""
+    breakdown: Dict[str, Dict[str, Any]] = {}
+    for phase, document, component in components:
+        if component['kind'] not in COMPONENT_KINDS or component['kind'] == 'jsx' and not component['name'][0].isupper():
+            continue
+        data = breakdown.setdefault(phase, {'referenced': 0, 'found': 0, 'missing': []})
+        data['referenced'] += 1
+        if index.has_component(component['name']):
+            data['found'] += 1
+        else:
+            data['missing'].append({'name': component['name'], 'kind': component['kind'],
+                                    'count': component['count'], 'document': document,
+                                    'first_line': component['first_line']})
+    for data in breakdown.values():
+        data['missing'].sort(key=lambda component: (-component['count'], component['name']))
+    return dict(sorted(breakdown.items()))
+
+def iter_report_rows(features: Iterable[Tuple[str, str, str]], index: ImplementationIndex,
+                     metrics: Optional[Metrics] = None) -> Iterator[Dict[str, Any]]:
+    """One row per specified feature, with its implementation status."""
+    metrics = metrics or Metrics('generate_report')
+    wall = cpu = 0.0
+    rows = table_hits = 0
+    try:
+        for phase, title, description in features:
+            started, started_cpu = time.perf_counter(), time.thread_time()
+            status_info = get_implementation_status(title, description, index)
+            wall += time.perf_counter() - started
+            cpu += time.thread_time() - started_cpu
+            rows += 1
+            table_hits += len(status_info['table_hits'])
+            yield {
+                'phase': phase,
+                'specification': title,
+                'status': status_info['status'],
+                'gap': status_info['gap'],
+                'details': status_info['implementation_details']
+            }
+    finally:
+        # Summed per row, the stage timer itself would cost more than most lookups
+        metrics.record('resolve_status', wall, cpu, calls=rows)
+        metrics.count('report_rows', rows)
+        metrics.count('table_name_matches', table_hits)
+
+class ReportResult(NamedTuple):
+    """The files written and the per-phase totals behind their summary."""
+    paths: List[Path]
+    phase_completion: Dict[str, Dict[str, int]]
+
+def report_writers(output_dir: Path, formats: Iterable[str] = REPORT_FORMATS) -> List[Any]:
+    return [REPORT_WRITERS[fmt](output_dir / f"PROGRESS_REPORT{REPORT_SUFFIXES[fmt]}")
+            for fmt in dict.fromkeys(formats)]
+
+def write_reports(specs: Dict[str, Any], implementation: Dict[str, Any], database: Dict[str, Any],
+                  output_dir: Path, formats: Iterable[str] = REPORT_FORMATS,
+                  store: Optional[AnalysisStore] = None, run_id: Optional[int] = None,
+                  metrics: Optional[Metrics] = None) -> ReportResult:
+    """Compare the analyses and stream the report in every requested format.
+
+    With a store, the rows are also recorded under run_id.
+    """
+    metrics = metrics or Metrics('generate_report')
+    file_writers = report_writers(output_dir, formats)
+    writers = list(file_writers)
+    if store is not None:
+        writers.append(StoreReportWriter(store, run_id))
+    with metrics.stage('build_index'):
+        index = ImplementationIndex.from_analyses(implementation, database)
+    phase_completion = stream_report(iter_spec_features(specs), index, writers, metrics,
+                                     components=iter_spec_components(specs))
+    return ReportResult([writer.path for writer in file_writers], phase_completion)
+
+def stream_report(features: Iterable[Tuple[str, str, str]], index: ImplementationIndex, writers: List[Any],
+                  metrics: Optional[Metrics] = None,
+                  components: Optional[Iterable[Tuple[str, str, Dict[str, Any]]]] = None) -> Dict[str, Dict[str, int]]:
+    """Resolve every feature's status and hand the rows to all writers in one pass; returns the phase totals.
+
+    With components, their per-phase breakdown is handed to the writers too.
+    """
+    metrics = metrics or Metrics('generate_report')
     phase_completion = {
         'Phase 0': {'total': 0, 'complete': 0},
         'Phase 1': {'total': 0, 'complete': 0},
@@ -102,80 +560,124 @@ def main():
         'Master': {'total': 0, 'complete': 0},
     }
 
-    # Process all features from specs
-    for doc in specs.get('documents', []):
-        phase = doc.get('phase', 'Master')
-        for feature in doc.get('features', []):
-            status_info = get_implementation_status(feature['title'], feature['description'], implementation, database)
-            
-            report_data.append({
-                'Phase': phase,
-                'Specification': feature['title'],
-                'Status': status_info['status'],
-                'Gap/Details': f"{status_info['gap']} {status_info['implementation_details']}"
-            })
+    write_wall = write_cpu = 0.0
+    rows = 0
+    try:
+        # Stream every feature from the specs to all writers at once
+        for row in iter_report_rows(features, index, metrics):
+            started, started_cpu = time.perf_counter(), time.thread_time()
+            for writer in writers:
+                writer.write_row(row)
+            write_wall += time.perf_counter() - started
+            write_cpu += time.thread_time() - started_cpu
+            rows += 1
             
             # Update phase completion stats
-            if phase in phase_completion:
-                phase_completion[phase]['total'] += 1
-                if '✅' in status_info['status'] or '🔀' in status_info['status']:
-                    phase_completion[phase]['complete'] += 1
+            if row['phase'] in phase_completion:
+                phase_completion[row['phase']]['total'] += 1
+                if is_complete(row['status']):
+                    phase_completion[row['phase']]['complete'] += 1
+        metrics.record('write_rows', write_wall, write_cpu, calls=rows)
+        
+        if components is not None:
+            with metrics.stage('component_breakdown'):
+                breakdown = component_breakdown(components, index)
+            for writer in writers:
+                writer.add_components(breakdown)
+        
+        with metrics.stage('finish_writers'):
+            for writer in writers:
+                writer.finish(phase_completion)
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
     
-    # --- Generate Markdown Report ---
-    report_md = "# B2B+ Project: Comprehensive Progress Report\n\n"
-    report_md += "**Author:** Manus AI  \n**Date:** October 31, 2025\n\n---\n"
+    for name, value in index.stats().items():
+        metrics.count(name, value)
+    metrics.count('report_bytes_written', sum(writer.path.stat().st_size for writer in writers
+                                              if isinstance(writer, ReportWriter)))
+    return phase_completion
+
+def print_trend(store: AnalysisStore, project_root: Path, limit: int):
+    """Overall completion of the last limit stored runs."""
+    runs: Dict[int, Dict[str, Any]] = {}
+    for row in store.completion_history(project_root, limit):
+        run = runs.setdefault(row['run_id'], {'started_at': row['started_at'], 'total': 0, 'complete': 0})
+        run['total'] += row['total']
+        run['complete'] += row['complete']
     
-    # Executive Summary
-    report_md += "## 1. Executive Summary\n\n"
-    report_md += "This report provides a detailed analysis of the B2B+ project, comparing the original specifications against the current implementation. The following table summarizes the completion status by phase:\n\n"
-    report_md += "| Phase   | Total Specs | Complete | Completion % |\n"
-    report_md += "|---------|-------------|----------|--------------|\n"
-    total_specs = 0
-    total_complete = 0
-    for phase, data in phase_completion.items():
-        if data['total'] > 0:
-            percentage = (data['complete'] / data['total']) * 100
-            report_md += f"| {phase} | {data['total']} | {data['complete']} | {percentage:.1f}% |\n"
-            total_specs += data['total']
-            total_complete += data['complete']
+    if not runs:
+        print("No completed runs with report rows in the store.")
+        return
+    print(f"Completion over the last {len(runs)} runs:\n")
+    print("| Run | Started | Total Specs | Complete | Completion % |")
+    print("|-----|---------|-------------|----------|--------------|")
+    for run_id, run in runs.items():
+        percentage = (run['complete'] / run['total']) * 100 if run['total'] else 0
+        print(f"| {run_id} | {run['started_at']} | {run['total']} | {run['complete']} | {percentage:.1f}% |")
+
+def main():
+    """Main report generation function."""
+    parser = argparse.ArgumentParser(description='Generate the B2B+ progress report')
+    parser.add_argument('--format', nargs='+', choices=REPORT_FORMATS, default=list(REPORT_FORMATS),
+                        dest='formats', help='report formats to write in one pass (default: all)')
+    parser.add_argument('--store', nargs='?', const='', metavar='PATH',
+                        help=f"read the analyses from a run in the SQLite store (default path: {DEFAULT_STORE_NAME})")
+    parser.add_argument('--run', type=int, help='stored run to report on (default: the latest complete run)')
+    parser.add_argument('--trend', type=int, metavar='N', help='print completion over the last N stored runs and exit')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parent,
+                        help='project whose analyses to report on (default: %(default)s)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
     
-    overall_percentage = (total_complete / total_specs) * 100 if total_specs > 0 else 0
-    report_md += f"| **Total** | **{total_specs}** | **{total_complete}** | **{overall_percentage:.1f}%** |\n\n"
+    project_root = args.root
+    output_path = metrics_path(project_root / 'PROGRESS_REPORT.md')
     
-    # Detailed Status Table
-    report_md += "## 2. Detailed Implementation Status\n\n"
-    report_md += "| Phase   | Specification | Status | Gap / Implementation Details |\n"
-    report_md += "|---------|---------------|--------|------------------------------|\n"
-    for item in sorted(report_data, key=lambda x: (x['Phase'], x['Specification'])):
-        spec = item["Specification"].replace("\n", " ")
-        gap = item["Gap/Details"].replace("\n", " ")
-        report_md += f"| {item['Phase']} | {spec} | {item['Status']} | {gap} |\n"
-        
-    # Remaining Work
-    report_md += "\n## 3. Remaining Work Breakdown\n\n"
-    incomplete_items = [item for item in report_data if '❌' in item['Status'] or '🔄' in item['Status']]
-    if not incomplete_items:
-        report_md += "✅ **All planned work has been completed or modified!**\n"
-    else:
-        for item in sorted(incomplete_items, key=lambda x: x['Phase']):
-            spec = item["Specification"].replace("\n", " ")
-            report_md += f"- **[{item['Phase']}]** {spec} - *Status: {item['Status']}*\n"
+    if args.store is not None or args.trend is not None:
+        store_path = Path(args.store) if args.store else project_root / DEFAULT_STORE_NAME
+        with AnalysisStore(store_path) as store:
+            if args.trend is not None:
+                print_trend(store, project_root, args.trend)
+                return
+            run_id = args.run if args.run is not None else store.latest_run(project_root)
+            if run_id is None:
+                print(f"Error: No completed runs in {store_path}. Run pipeline.py --store first.")
+                return
             
-    # Recommendations
-    report_md += "\n## 4. Next Steps & Recommendations\n\n"
-    report_md += "Based on the analysis, the following steps are recommended to complete the project:\n\n"
-    report_md += "1.  **Address `❌ Not Started` items first**, prioritizing foundational features like the mobile app setup and core authentication flows.\n"
-    report_md += "2.  **Complete `🔄 Partially Complete` items**, such as finishing UI components and ensuring all database tables are fully migrated.\n"
-    report_md += "3.  **Review `🔀 Modified` items** to ensure the implemented changes align with the overall project goals.\n"
-    report_md += "4.  **Conduct a full end-to-end testing cycle** across both web and mobile platforms to validate all features.\n"
-    report_md += "5.  **Prepare for deployment** by setting up production environments and CI/CD pipelines.\n"
+            with Metrics.from_args('generate_report', args) as metrics:
+                writers = report_writers(project_root, args.formats)
+                with metrics.stage('build_index'):
+                    index = ImplementationIndex.from_store(store, run_id)
+                stream_report(store.iter_features(run_id), index, writers + [StoreReportWriter(store, run_id)],
+                              metrics, components=store.iter_components(run_id))
+        metrics.write(output_path)
+        
+        print(f"\nReport for stored run {run_id}:")
+        for writer in writers:
+            print(f"Report generated successfully: {writer.path}")
+        print(f"Report rows recorded in run {run_id} of {store_path}")
+        print(f"Metrics saved to: {output_path}")
+        return
     
-    # Save the report
-    report_path = project_root / "PROGRESS_REPORT.md"
-    with open(report_path, 'w') as f:
-        f.write(report_md)
+    with Metrics.from_args('generate_report', args) as metrics:
+        # Load analysis files
+        with metrics.stage('load_json'):
+            specs = load_json_file(project_root / "extracted_specifications.json")
+            implementation = load_json_file(project_root / "implementation_analysis.json")
+            database = load_json_file(project_root / "database_analysis.json")
+        
+        if not all([specs, implementation, database]):
+            print("Error: Missing analysis files. Please run extraction scripts first.")
+            return
         
-    print(f"\nReport generated successfully: {report_path}")
+        result = write_reports(specs, implementation, database, project_root, args.formats, metrics=metrics)
+    metrics.write(output_path)
+    
+    print()
+    for path in result.paths:
+        print(f"Report generated successfully: {path}")
+    print(f"Metrics saved to: {output_path}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Instrumentation shared by the analysis scripts.
+
+A Metrics object collects, for one script run, the wall and CPU time of each
+named stage, counters such as files scanned or bytes read, the peak RSS and,
+optionally, tracemalloc peaks and a cProfile dump. It is written as JSON next
+to the script's artifact (`database_analysis.json` ->
+`database_analysis.metrics.json`) for the monitoring dashboards.
+
+Stages may run on several threads at once. Their CPU time is per thread, but
+tracemalloc peaks are process-wide, so a stage's memory peak is only its own
+when no other stage overlaps it.
+
+Supports Python 3.9 and later. From 3.12 cProfile is built on sys.monitoring,
+which allows one active profiler per process but sees every thread, so the
+whole run is profiled once; before 3.12 a profiler only sees the thread that
+enabled it, so each thread running a stage gets its own and they are merged.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional
+
+# Bump when the metrics JSON layout changes
+METRICS_VERSION = 1
+
+# Whether one cProfile.Profile covers every thread (and a second cannot be enabled)
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+def peak_memory_mb() -> Optional[float]:
+    """Return the peak resident set size of this process in MB, if available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def metrics_path(artifact: Path) -> Path:
+    """Where the metrics of the run that produced artifact are written."""
+    return artifact.with_name(f"{artifact.stem}.metrics.json")
+
+def add_metrics_arguments(parser: argparse.ArgumentParser):
+    """The instrumentation flags every script accepts."""
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='record tracemalloc peaks per stage (slows the run down)')
+    parser.add_argument('--profile', type=Path, metavar='PATH',
+                        help='write cProfile statistics of the run to PATH')
+
+class Metrics:
+    """Stage timings, counters and memory peaks of one script run."""
+
+    def __init__(self, script: str, trace_memory: bool = False, profile_path: Optional[Path] = None):
+        self.script = script
+        self.trace_memory = trace_memory
+        self.profile_path = profile_path
+        # Stage name -> calls, wall and CPU seconds (and tracemalloc peak), in first-seen order
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[cProfile.Profile] = []
+        self._started_at: Optional[str] = None
+        self._wall = self._cpu = 0.0
+        self._traced_peak = 0
+
+    @classmethod
+    def from_args(cls, script: str, args: argparse.Namespace) -> 'Metrics':
+        return cls(script, trace_memory=args.trace_memory, profile_path=args.profile)
+
+    def start(self):
+        self._started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._start_profile(whole_run=True)
+
+    def stop(self):
+        self._stop_profile()
+        self._wall = time.perf_counter() - self._wall
+        self._cpu = time.process_time() - self._cpu
+        if tracemalloc.is_tracing() and self.trace_memory:
+            self._traced_peak = max(self._traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        if self.profile_path is not None and self._profiles:
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(str(self.profile_path))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _start_profile(self, whole_run: bool = False) -> bool:
+        """Profile the calling thread unless it already is; True if a profiler was started.
+
+        With a process-wide profiler only the one started for the whole run exists.
+        """
+        if self.profile_path is None or getattr(self._local, 'profile', None) is not None:
+            return False
+        if PROCESS_WIDE_PROFILER and not whole_run:
+            return False
+        profile = cProfile.Profile()
+        self._local.profile = profile
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+        return True
+
+    def _stop_profile(self):
+        profile = getattr(self._local, 'profile', None)
+        if profile is not None:
+            profile.disable()
+            self._local.profile = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body as stage name; repeated stages accumulate."""
+        profiling = self._start_profile()
+        peaks = self._local.__dict__.setdefault('peaks', [])
+        if self.trace_memory and tracemalloc.is_tracing():
+            # The enclosing stage keeps the peak it reached so far
+            if peaks:
+                peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        peaks.append(0)
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            peak = peaks.pop()
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                if peaks:
+                    peaks[-1] = max(peaks[-1], peak)
+            else:
+                peak = None
+            self.record(name, wall, cpu, peak=peak)
+            if profiling:
+                self._stop_profile()
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float, calls: int = 1,
+               peak: Optional[int] = None):
+        """Add time measured elsewhere to stage name, e.g. summed over a hot loop."""
+        with self._lock:
+            stage = self.stages.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            stage['calls'] += calls
+            stage['wall_seconds'] += wall_seconds
+            stage['cpu_seconds'] += cpu_seconds
+            if peak is not None:
+                stage['tracemalloc_peak_mb'] = max(stage.get('tracemalloc_peak_mb', 0.0), peak / (1024 * 1024))
+                self._traced_peak = max(self._traced_peak, peak)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, data: Dict[str, Any]):
+        """Add the stages and counters of another run's to_dict(), e.g. from a worker process."""
+        for name, stage in data['stages'].items():
+            peak = stage.get('tracemalloc_peak_mb')
+            self.record(name, stage['wall_seconds'], stage['cpu_seconds'], calls=stage['calls'],
+                        peak=int(peak * 1024 * 1024) if peak is not None else None)
+        for name, amount in data['counters'].items():
+            self.count(name, amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'version': METRICS_VERSION,
+            'script': self.script,
+            'started_at': self._started_at,
+            'pid': os.getpid(),
+            'wall_seconds': round(self._wall, 6),
+            'cpu_seconds': round(self._cpu, 6),
+            'peak_rss_mb': peak_memory_mb(),
+            'stages': {name: {key: round(value, 6) if isinstance(value, float) else value
+                              for key, value in stage.items()}
+                       for name, stage in self.stages.items()},
+            'counters': dict(self.counters)
+        }
+        if self.trace_memory:
+            data['tracemalloc_peak_mb'] = round(self._traced_peak / (1024 * 1024), 3)
+        if self.profile_path is not None:
+            data['profile'] = str(self.profile_path)
+        return data
+
+    def write(self, path: Path) -> Path:
+        """Write the metrics atomically to path."""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
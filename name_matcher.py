@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick matcher for finding many names in free text in one pass.
+
+The automaton is built once over all names, so scanning a text costs time
+linear in its length however many names there are. Hits only count where
+the name stands as a whole identifier: `orders` is found in "the orders
+table" but not inside `reorders` or `orders_archive`.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+class NameMatch(NamedTuple):
+    """A name found in a text, with its offsets in that text."""
+    name: str
+    start: int
+    end: int
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+class NameMatcher:
+    """Finds every whole-word occurrence of a fixed set of names."""
+
+    def __init__(self, names: Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.names: List[str] = []
+        self._lengths: List[int] = []
+        # Trie transitions, failure links and the names ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        seen = set()
+        for name in names:
+            key = name.lower() if ignore_case else name
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            state = 0
+            for ch in key:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(len(self.names))
+            self.names.append(name)
+            self._lengths.append(len(key))
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """Compute the failure link of every state, breadth first.
+
+        Transitions stay sparse (only the trie edges), so memory grows with the
+        total length of the names rather than states times alphabet; scanning
+        follows failure links instead, which is still amortized linear.
+        """
+        goto, fail = self._goto, self._fail
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                # Failure targets are shallower, so their links are already set
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                # Names ending at the fallback state also end here
+                self._output[next_state] = self._output[next_state] + self._output[fail[next_state]]
+
+    def _fold(self, text: str) -> str:
+        if not self.ignore_case:
+            return text
+        folded = text.lower()
+        if len(folded) != len(text):
+            # A few characters lowercase to several; keep offsets aligned
+            folded = ''.join(ch.lower()[0] for ch in text)
+        return folded
+
+    def finditer(self, text: str) -> Iterator[NameMatch]:
+        """Yield every whole-word hit in text, ordered by end offset."""
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        folded = self._fold(text)
+        size = len(text)
+        state = 0
+        for end, ch in enumerate(folded, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            if end < size and _is_word_char(text[end]):
+                continue
+            for name_id in output[state]:
+                start = end - lengths[name_id]
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                yield NameMatch(self.names[name_id], start, end)
+
+    def findall(self, text: str) -> List[NameMatch]:
+        return list(self.finditer(text))
+
+    def names_in(self, text: str) -> List[str]:
+        """Distinct names found in text, in order of first appearance."""
+        return list(dict.fromkeys(match.name for match in self.finditer(text)))
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Run the progress-report pipeline as one dependency graph.
+
+The specification, implementation and database analyzers are independent
+and CPU-bound, so each runs in its own worker process; the report stage
+receives their results as soon as all three are done. The intermediate
+JSON files are only written with --write-json, each as soon as its
+analyzer finishes. The report, JSON and store stages run on threads of the
+main process. With --profile the analyzers stay in the main process too,
+so the profile covers them.
+
+With --store, the analyses and report rows are also recorded as a new run
+in the SQLite analysis store, which keeps the history for trend reports.
+
+Stage timings and counters of the whole run are written to
+pipeline.metrics.json next to the reports. fleet_audit.py runs this
+pipeline over many projects at once.
+
+Usage: python3 pipeline.py [--root PATH] [--output-dir DIR] [--write-json] [--store [PATH]]
+                           [--format markdown csv] [--no-cache] [--cache-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterable, NamedTuple, Optional, Tuple
+
+from analysis_cache import AnalysisCache
+from analysis_store import DEFAULT_STORE_NAME, AnalysisStore
+from analyze_database import PARSER_VERSION as DATABASE_PARSER_VERSION, analyze_migrations
+from analyze_implementation import analyze_project, build_analysis
+from extract_specifications import PARSER_VERSION as SPECIFICATION_PARSER_VERSION, extract_specifications
+from generate_report import REPORT_FORMATS, write_reports
+from instrumentation import Metrics, add_metrics_arguments
+from sql_lexer import LEXER_VERSION
+
+# Analyzer stage -> JSON artifact written by --write-json, as the standalone scripts name them
+JSON_ARTIFACTS = {
+    'specifications': 'extracted_specifications.json',
+    'implementation': 'implementation_analysis.json',
+    'database': 'database_analysis.json'
+}
+PIPELINE_METRICS = 'pipeline.metrics.json'
+
+class Stage(NamedTuple):
+    """A unit of work; run is called with the results of depends_on as keyword arguments.
+
+    An isolated stage runs in a worker process: run, its inputs and its
+    result must be picklable, and run also gets a metrics keyword argument.
+    """
+    name: str
+    run: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+    isolated: bool = False
+
+class PipelineError(Exception):
+    """A stage raised; the original exception is chained."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+def _run_isolated(run: Callable[..., Any], inputs: Dict[str, Any], trace_memory: bool) -> Tuple[Any, Dict[str, Any]]:
+    """Run an isolated stage in a worker process; returns its result and metrics."""
+    with Metrics('pipeline', trace_memory=trace_memory) as metrics:
+        result = run(metrics=metrics, **inputs)
+    return result, metrics.to_dict()
+
+class Pipeline:
+    """Runs stages on a thread pool as soon as their dependencies are done.
+
+    Isolated stages are handed on to a process pool unless processes is
+    False, so CPU-bound stages are not serialized by the GIL.
+    """
+
+    def __init__(self, stages: Iterable[Stage], max_workers: Optional[int] = None,
+                 metrics: Optional[Metrics] = None, processes: bool = True):
+        self.metrics = metrics or Metrics('pipeline')
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"stage '{stage.name}' depends on unknown stage '{dependency}'")
+        self._check_acyclic()
+        self.max_workers = max_workers or len(self.stages)
+        # Stage name -> (start, end) in seconds since run() began
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def _check_acyclic(self):
+        remaining = {name: len(stage.depends_on) for name, stage in self.stages.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        ordered = 0
+        while ready:
+            name = ready.pop()
+            ordered += 1
+            for other in self.stages.values():
+                if name in other.depends_on:
+                    remaining[other.name] -= 1
+                    if remaining[other.name] == 0:
+                        ready.append(other.name)
+        if ordered < len(self.stages):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"dependency cycle between stages: {', '.join(cycle)}")
+
+    def _run_stage(self, stage: Stage, inputs: Dict[str, Any], origin: float) -> Any:
+        started = time.perf_counter()
+        try:
+            if stage.isolated and self._process_pool is not None:
+                result, worker = self._process_pool.submit(_run_isolated, stage.run, inputs,
+                                                           self.metrics.trace_memory).result()
+                self.metrics.merge(worker)
+                peak = worker.get('tracemalloc_peak_mb')
+                self.metrics.record(stage.name, time.perf_counter() - started, worker['cpu_seconds'],
+                                    peak=int(peak * 1024 * 1024) if peak is not None else None)
+                return result
+            with self.metrics.stage(stage.name):
+                if stage.isolated:
+                    return stage.run(metrics=self.metrics, **inputs)
+                return stage.run(**inputs)
+        finally:
+            self.timings[stage.name] = (started - origin, time.perf_counter() - origin)
+
+    def run(self) -> Dict[str, Any]:
+        """Run every stage and return their results by name."""
+        results: Dict[str, Any] = {}
+        waiting = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        dependents = defaultdict(list)
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                dependents[dependency].append(stage.name)
+
+        isolated = sum(1 for stage in self.stages.values() if stage.isolated)
+        if self.processes and isolated:
+            self._process_pool = ProcessPoolExecutor(max_workers=isolated)
+        origin = time.perf_counter()
+        self.timings.clear()
+        try:
+            self._run_graph(results, waiting, dependents, origin)
+        finally:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        return results
+
+    def _run_graph(self, results: Dict[str, Any], waiting: Dict[str, set], dependents: Dict[str, List[str]],
+                   origin: float):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    stage = self.stages[name]
+                    inputs = {dependency: results[dependency] for dependency in stage.depends_on}
+                    running[executor.submit(self._run_stage, stage, inputs, origin)] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        # Running stages cannot be interrupted; nothing new is scheduled and
+                        # leaving the executor waits for them before the error is raised
+                        raise PipelineError(name, e) from e
+                    for dependent in dependents[name]:
+                        waiting[dependent].discard(name)
+                submit_ready()
+
+def write_json(path: Path, data: Any):
+    """Write data atomically, indented like the standalone scripts."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+# The analyzer stages; module-level so worker processes can unpickle them
+
+def run_specifications(project_root: Path, cache_dir: Path, use_cache: bool, metrics: Metrics) -> Dict[str, Any]:
+    cache = AnalysisCache(cache_dir, 'documents', f"{SPECIFICATION_PARSER_VERSION}-{LEXER_VERSION}",
+                          enabled=use_cache)
+    result = extract_specifications(project_root, cache, verbose=False, metrics=metrics)
+    cache.prune()
+    return result
+
+def run_implementation(project_root: Path, metrics: Metrics) -> Dict[str, Any]:
+    return build_analysis(*analyze_project(project_root, metrics=metrics))
+
+def run_database(project_root: Path, cache_dir: Path, use_cache: bool, metrics: Metrics) -> Dict[str, Any]:
+    cache = AnalysisCache(cache_dir, 'migrations', f"{DATABASE_PARSER_VERSION}-{LEXER_VERSION}",
+                          enabled=use_cache)
+    result = analyze_migrations(project_root, cache, verbose=False, metrics=metrics)
+    if result is None:
+        raise FileNotFoundError(f"migrations directory not found: {project_root / 'supabase' / 'migrations'}")
+    cache.prune()
+    return result
+
+def build_stages(project_root: Path, use_cache: bool = True, formats: Iterable[str] = REPORT_FORMATS,
+                 json_artifacts: bool = False, store: Optional[AnalysisStore] = None,
+                 run_id: Optional[int] = None, metrics: Optional[Metrics] = None,
+                 output_dir: Optional[Path] = None, cache_dir: Optional[Path] = None) -> List[Stage]:
+    """The analyzer, report and optional artifact and store stages for one project."""
+    formats = list(formats)
+    output_dir = output_dir or project_root
+    cache_dir = cache_dir or output_dir
+    metrics = metrics or Metrics('pipeline')
+
+    def report(specifications, implementation, database):
+        return write_reports(specifications, implementation, database, output_dir, formats,
+                             store=store, run_id=run_id, metrics=metrics)
+
+    stages = [
+        Stage('specifications', partial(run_specifications, project_root, cache_dir, use_cache), isolated=True),
+        Stage('implementation', partial(run_implementation, project_root), isolated=True),
+        Stage('database', partial(run_database, project_root, cache_dir, use_cache), isolated=True),
+        Stage('report', report, ('specifications', 'implementation', 'database'))
+    ]
+
+    if json_artifacts:
+        for name, filename in JSON_ARTIFACTS.items():
+            def write_artifact(path=output_dir / filename, **results):
+                (data,) = results.values()
+                write_json(path, data)
+                return path
+            stages.append(Stage(f"{name}_json", write_artifact, (name,)))
+
+    if store is not None:
+        savers = {
+            'specifications': store.save_specifications,
+            'implementation': store.save_implementation,
+            'database': store.save_database
+        }
+        for name, save in savers.items():
+            def save_analysis(save=save, **results):
+                (data,) = results.values()
+                save(run_id, data)
+            stages.append(Stage(f"{name}_store", save_analysis, (name,)))
+
+    return stages
+
+def run_project(project_root: Path, output_dir: Optional[Path] = None, use_cache: bool = True,
+                formats: Iterable[str] = REPORT_FORMATS, json_artifacts: bool = False,
+                store_path: Optional[Path] = None, metrics: Optional[Metrics] = None,
+                cache_dir: Optional[Path] = None, processes: bool = True) -> Dict[str, Any]:
+    """Run the pipeline for one project and summarize the run; raises PipelineError if a stage fails.
+
+    Reports, JSON artifacts and metrics go to output_dir, the project root by
+    default, and the parse cache to cache_dir/.analysis_cache, by default
+    under output_dir, so the project itself is left untouched. The analyzers
+    run in worker processes unless processes is False or the run is profiled.
+    """
+    output_dir = output_dir or project_root
+    output_dir.mkdir(parents=True, exist_ok=True)
+    metrics = metrics or Metrics('pipeline')
+    store = run_id = None
+    if store_path is not None:
+        store = AnalysisStore(store_path)
+        run_id = store.begin_run(project_root)
+
+    started = time.perf_counter()
+    try:
+        pipeline = Pipeline(build_stages(project_root, use_cache=use_cache, formats=formats,
+                                         json_artifacts=json_artifacts, store=store, run_id=run_id,
+                                         metrics=metrics, output_dir=output_dir, cache_dir=cache_dir),
+                            metrics=metrics, processes=processes and metrics.profile_path is None)
+        with metrics:
+            results = pipeline.run()
+        if store is not None:
+            store.finish_run(run_id)
+    except BaseException:
+        # Whatever went wrong, the run must not stay 'running' in the history
+        if store is not None:
+            store.finish_run(run_id, 'failed')
+        raise
+    finally:
+        if store is not None:
+            store.close()
+    elapsed = time.perf_counter() - started
+    metrics.write(output_dir / PIPELINE_METRICS)
+
+    return {
+        'project_root': str(project_root),
+        'output_dir': str(output_dir),
+        'elapsed_seconds': elapsed,
+        'timings': dict(pipeline.timings),
+        'reports': [str(path) for path in results['report'].paths],
+        'phase_completion': results['report'].phase_completion,
+        'json_artifacts': {name: str(results[f"{name}_json"]) for name in JSON_ARTIFACTS
+                           if f"{name}_json" in results},
+        'metrics': str(output_dir / PIPELINE_METRICS),
+        'store': str(store_path) if store_path is not None else None,
+        'run_id': run_id,
+        'summary': {name: results[name]['summary'] for name in JSON_ARTIFACTS}
+    }
+
+def main():
+    """Main pipeline function."""
+    parser = argparse.ArgumentParser(description='Run the B2B+ analysis and report pipeline')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parent,
+                        help='project to analyze (default: %(default)s)')
+    parser.add_argument('--output-dir', type=Path, help='where to write reports and artifacts (default: the project root)')
+    parser.add_argument('--write-json', action='store_true',
+                        help='also write the intermediate analysis JSON files')
+    parser.add_argument('--format', nargs='+', choices=REPORT_FORMATS, default=list(REPORT_FORMATS),
+                        dest='formats', help='report formats to write (default: all)')
+    parser.add_argument('--store', nargs='?', const='', metavar='PATH',
+                        help=f"record this run in the SQLite analysis store (default path: {DEFAULT_STORE_NAME})")
+    parser.add_argument('--no-cache', action='store_true', help='re-parse every document and migration')
+    parser.add_argument('--cache-dir', type=Path,
+                        help='where to keep the .analysis_cache directory (default: the output directory)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or args.root
+    store_path = None
+    if args.store is not None:
+        store_path = Path(args.store) if args.store else output_dir / DEFAULT_STORE_NAME
+
+    print("Running analysis pipeline...")
+    try:
+        run = run_project(args.root, output_dir, use_cache=not args.no_cache, formats=args.formats,
+                          json_artifacts=args.write_json, store_path=store_path,
+                          metrics=Metrics.from_args('pipeline', args), cache_dir=args.cache_dir)
+    except PipelineError as e:
+        print(f"\nPipeline failed: {e}")
+        raise SystemExit(1)
+    timings = run['timings']
+
+    print(f"\n{'Stage'.ljust(24)}{'start':>8}{'end':>8}{'seconds':>9}")
+    for name, (start, end) in sorted(timings.items(), key=lambda item: item[1]):
+        print(f"{name.ljust(24)}{start:>8.2f}{end:>8.2f}{end - start:>9.2f}")
+
+    analyzers = [timings[name][1] - timings[name][0] for name in JSON_ARTIFACTS]
+    print(f"\nEnd to end: {run['elapsed_seconds']:.2f}s (slowest analyzer {max(analyzers):.2f}s, "
+          f"analyzers combined {sum(analyzers):.2f}s)")
+
+    print()
+    for path in run['reports']:
+        print(f"Report generated successfully: {path}")
+    for path in run['json_artifacts'].values():
+        print(f"Results saved to: {path}")
+    print(f"Metrics saved to: {run['metrics']}")
+    if run['store'] is not None:
+        print(f"Recorded as run {run['run_id']} in {run['store']}")
+
+if __name__ == '__main__':
+    main()
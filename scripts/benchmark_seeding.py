@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+B2B+ Seeding Benchmark
+
+Runs the seeder's strategies against the local PostgREST stand-in and reports
+rows/s, p50/p99 request latency and retry counts for each. The dataset is a
+small synthetic one from generate_dataset.py unless --data-dir is given.
+
+Usage: python3 scripts/benchmark_seeding.py --latency-ms 20 --error-rate 0.02 --rate-limit 200
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import seed_data
+from mock_postgrest import MockPostgrest
+
+STRATEGIES = ("row-at-a-time", "sequential", "concurrent")
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def prepare_run(server, batch_size, workers):
+    """Point the seeder at a fresh server and clear its per-run state"""
+    server.reset()
+    seed_data.SUPABASE_URL = server.url
+    seed_data.session = seed_data.create_session(max(seed_data.POOL_SIZE, workers))
+    seed_data.batch_size = batch_size
+    seed_data.journal = None
+    seed_data.invalid_rows = {}
+    seed_data.seed_stats.clear()
+    seed_data.request_latencies.clear()
+
+def run_row_at_a_time(datasets, graph, limit):
+    """One POST per row, as the original seeder did; capped at limit rows"""
+    sent = 0
+    for table in seed_data.fk_order(list(datasets), graph):
+        for row in datasets[table]():
+            if sent >= limit:
+                return sent, sent
+            seed_data.insert_data(table, row)
+            sent += 1
+    return sent, sent
+
+def run_sequential(datasets, graph):
+    seed_data.seed_sequentially(datasets, graph)
+    return bulk_totals()
+
+def run_concurrent(datasets, graph, workers, per_table_concurrency):
+    seed_data.seed_concurrently(datasets, graph, workers=workers, per_table_concurrency=per_table_concurrency)
+    return bulk_totals()
+
+def bulk_totals():
+    """Rows inserted and logical requests (batches) of the last bulk run"""
+    stats = seed_data.seed_stats.values()
+    return sum(s["rows"] for s in stats), sum(s["batches"] for s in stats)
+
+def benchmark(strategy, server, datasets, graph, args):
+    prepare_run(server, args.batch_size, args.workers)
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        if strategy == "row-at-a-time":
+            rows, logical = run_row_at_a_time(datasets, graph, args.row_limit)
+        elif strategy == "sequential":
+            rows, logical = run_sequential(datasets, graph)
+        else:
+            rows, logical = run_concurrent(datasets, graph, args.workers, args.per_table_concurrency)
+    seconds = time.perf_counter() - started
+    latencies = list(seed_data.request_latencies)
+    stored = sum(len(table) for table in server.tables.values())
+    return {
+        "strategy": strategy,
+        "rows": rows,
+        "stored_rows": stored,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else 0,
+        "requests": len(latencies),
+        "retries": len(latencies) - logical,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "rate_limited": server.rejected["rate_limited"],
+        "injected_errors": server.rejected["errors"]
+    }
+
+def generate_data(out_dir, orders, seed):
+    command = [sys.executable, str(Path(__file__).parent / "generate_dataset.py"), "--out", str(out_dir),
+               "--orders", str(orders), "--organizations", "50", "--products", "2000",
+               "--users", "20", "--seed", str(seed)]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seeding strategies against a local PostgREST stand-in")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--data-dir", type=Path, help="NDJSON dataset (default: generate a small one)")
+    parser.add_argument("--orders", type=int, default=2000, help="orders in the generated dataset")
+    parser.add_argument("--batch-size", type=int, default=seed_data.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--per-table-concurrency", type=int, default=2)
+    parser.add_argument("--row-limit", type=int, default=1000,
+                        help="rows sent by the row-at-a-time strategy (default: 1000)")
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--per-row-us", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    server = MockPostgrest(("127.0.0.1", 0), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           per_row_us=args.per_row_us, error_rate=args.error_rate,
+                           rate_limit=args.rate_limit, seed=args.seed).start()
+    graph = seed_data.load_fk_graph()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = Path(tmp)
+            generate_data(data_dir, args.orders, args.seed)
+        datasets = seed_data.load_data_dir(data_dir)
+        for strategy in args.strategies:
+            results.append(benchmark(strategy, server, datasets, graph, args))
+    server.shutdown()
+
+    print("="*92)
+    print(f"SEEDING BENCHMARK (latency {args.latency_ms}ms ±{args.jitter_ms}ms, "
+          f"error rate {args.error_rate}, rate limit {args.rate_limit or 'none'})")
+    print("="*92)
+    print(f"{'strategy'.ljust(15)}{'rows':>9}{'seconds':>9}{'rows/s':>10}{'requests':>10}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'retries':>9}{'429s':>7}{'5xx':>5}")
+    for r in results:
+        print(f"{r['strategy'].ljust(15)}{r['rows']:>9}{r['seconds']:>9.2f}{r['rows_per_second']:>10.0f}"
+              f"{r['requests']:>10}{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['retries']:>9}"
+              f"{r['rate_limited']:>7}{r['injected_errors']:>5}")
+    print("="*92)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"parameters": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+                       "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
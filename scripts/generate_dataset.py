@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+B2B+ Synthetic Dataset Generator
+
+Generates large, schema-valid datasets for load testing: organizations, products,
+pricing_tiers, orders, order_items and cart_items. Product popularity follows a
+Zipf distribution and order sizes are heavy-tailed. Columns are generated with
+NumPy in fixed-size blocks and streamed to one NDJSON or CSV file per table, so
+memory stays flat regardless of the number of rows.
+
+Output is fully determined by --seed: every block draws from its own generator
+seeded with (seed, table, block), and ids are derived from row positions.
+
+Usage: python3 scripts/generate_dataset.py --orders 1000000 --out /tmp/dataset
+       SUPABASE_KEY=... python3 scripts/seed_data.py --data-dir /tmp/dataset
+"""
+
+import csv
+import json
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from seed_data import load_schema_tables
+
+# Rows generated per block; fixed so output does not depend on tuning
+BLOCK_SIZE = 65536
+
+# Table codes embedded in generated UUIDs
+TABLE_CODES = {
+    "organizations": 1,
+    "products": 2,
+    "pricing_tiers": 3,
+    "orders": 4,
+    "order_items": 5,
+    "cart_items": 6,
+    "users": 7
+}
+
+CUSTOMER_TYPES = np.array(["restaurant", "hotel", "hospital", "school"])
+CATEGORIES = np.array(["Cups", "Plates", "Napkins", "Containers", "Cutlery", "Bags", "Cleaning", "Gloves"])
+ORDER_STATUSES = np.array(["draft", "submitted", "processing", "shipped", "delivered", "cancelled"])
+ORDER_STATUS_WEIGHTS = np.array([0.03, 0.07, 0.10, 0.15, 0.60, 0.05])
+
+# Pricing ladder, matching seed_pricing.sql
+TIER_NAMES = ["Standard", "Bronze", "Silver", "Gold", "Platinum"]
+TIER_MIN_QUANTITY = [1, 10, 25, 50, 100]
+TIER_MAX_QUANTITY = [9, 24, 49, 99, None]
+TIER_DISCOUNT = [1.00, 0.95, 0.90, 0.85, 0.80]
+
+# Column order of every generated table
+TABLE_COLUMNS = {
+    "organizations": ["id", "name", "slug", "type", "tax_id", "phone", "website", "created_at"],
+    "products": ["id", "organization_id", "sku", "name", "description", "category", "brand",
+                 "base_price", "unit_of_measure", "units_per_case", "in_stock", "created_at"],
+    "pricing_tiers": ["id", "organization_id", "product_id", "tier_name", "min_quantity",
+                      "max_quantity", "unit_price", "priority", "is_active", "created_at"],
+    "orders": ["id", "organization_id", "user_id", "order_number", "status", "subtotal",
+               "tax", "shipping_cost", "total", "created_at"],
+    "order_items": ["id", "order_id", "product_id", "sku", "name", "quantity", "unit_price",
+                    "line_total", "created_at"],
+    "cart_items": ["id", "organization_id", "user_id", "product_id", "quantity", "created_at"]
+}
+
+EPOCH = np.datetime64("2025-10-31T00:00:00", "s")
+ONE_YEAR_SECONDS = 365 * 24 * 3600
+
+def make_uuids(table, indexes):
+    """Deterministic UUIDs encoding the table and row position"""
+    code = TABLE_CODES[table]
+    return [f"{code:08x}-0000-4000-8000-{i:012x}" for i in indexes.tolist()]
+
+def block_rng(seed, table, block):
+    """Independent generator for one block of one table"""
+    return np.random.default_rng([seed, TABLE_CODES[table], block])
+
+def timestamps(rng, count):
+    """ISO-8601 timestamps spread over the year before EPOCH"""
+    offsets = rng.integers(0, ONE_YEAR_SECONDS, count).astype("timedelta64[s]")
+    return [f"{t}Z" for t in (EPOCH - offsets).astype(str).tolist()]
+
+def heavy_tail(rng, count, sigma, cap):
+    """Log-normal integers >= 1: most values small, a long tail of large ones"""
+    values = np.rint(rng.lognormal(mean=0.5, sigma=sigma, size=count)).astype(np.int64)
+    return np.clip(values, 1, cap)
+
+class TableWriter:
+    """Stream rows of one table to NDJSON or CSV"""
+
+    def __init__(self, out_dir, table, fmt):
+        self.columns = TABLE_COLUMNS[table]
+        self.path = Path(out_dir) / f"{table}.{fmt}"
+        self.fmt = fmt
+        self.rows = 0
+        self.file = open(self.path, "w", newline="")
+        if fmt == "csv":
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.columns)
+
+    def write(self, columns):
+        """Write a block given as one list per column, in TABLE_COLUMNS order"""
+        rows = list(zip(*columns))
+        if self.fmt == "csv":
+            # COPY ... CSV reads an unquoted empty field as NULL
+            self.writer.writerows([["" if value is None else value for value in row] for row in rows])
+        else:
+            names = self.columns
+            self.file.write("".join(json.dumps(dict(zip(names, row))) + "\n" for row in rows))
+        self.rows += len(rows)
+
+    def close(self):
+        self.file.close()
+
+class Catalog:
+    """Per-product attributes needed by downstream tables, plus the popularity CDF"""
+
+    def __init__(self, seed, products, organizations, distributors, zipf_exponent):
+        rng = np.random.default_rng([seed, 0])
+        self.count = products
+        self.organization = rng.integers(0, distributors, products)
+        self.category = rng.integers(0, len(CATEGORIES), products).astype(np.int8)
+        self.base_price = np.round(rng.lognormal(mean=3.6, sigma=0.5, size=products), 2)
+        # Zipf weights assigned to a random permutation of products
+        ranks = rng.permutation(products) + 1
+        weights = 1.0 / np.power(ranks, zipf_exponent)
+        self.cdf = np.cumsum(weights / weights.sum())
+        self.cdf[-1] = 1.0
+
+    def sample(self, rng, count):
+        """Draw product indexes by popularity"""
+        return np.searchsorted(self.cdf, rng.random(count), side="right")
+
+    def sku(self, indexes):
+        return [f"SKU-{i:08d}" for i in indexes.tolist()]
+
+    def name(self, indexes):
+        return [f"{CATEGORIES[c]} Item {i}" for c, i in zip(self.category[indexes].tolist(), indexes.tolist())]
+
+def generate_organizations(writer, seed, organizations, distributors):
+    for block, start in enumerate(range(0, organizations, BLOCK_SIZE)):
+        rng = block_rng(seed, "organizations", block)
+        idx = np.arange(start, min(start + BLOCK_SIZE, organizations))
+        types = np.where(idx < distributors, "distributor", CUSTOMER_TYPES[rng.integers(0, len(CUSTOMER_TYPES), len(idx))])
+        writer.write([
+            make_uuids("organizations", idx),
+            [f"Synthetic Organization {i}" for i in idx.tolist()],
+            [f"synthetic-org-{i:08d}" for i in idx.tolist()],
+            types.tolist(),
+            [f"{i % 100:02d}-{i % 10000000:07d}" for i in idx.tolist()],
+            [f"+1-555-{i % 10000:04d}" for i in idx.tolist()],
+            [f"https://org-{i}.example.com" for i in idx.tolist()],
+            timestamps(rng, len(idx))
+        ])
+
+def generate_products(writer, seed, catalog):
+    for block, start in enumerate(range(0, catalog.count, BLOCK_SIZE)):
+        rng = block_rng(seed, "products", block)
+        idx = np.arange(start, min(start + BLOCK_SIZE, catalog.count))
+        categories = CATEGORIES[catalog.category[idx]]
+        writer.write([
+            make_uuids("products", idx),
+            make_uuids("organizations", catalog.organization[idx]),
+            catalog.sku(idx),
+            catalog.name(idx),
+            [f"Synthetic {c.lower()} product" for c in categories.tolist()],
+            categories.tolist(),
+            [f"Brand {b}" for b in rng.integers(0, 50, len(idx)).tolist()],
+            catalog.base_price[idx].tolist(),
+            ["case"] * len(idx),
+            (rng.integers(1, 21, len(idx)) * 50).tolist(),
+            (rng.random(len(idx)) > 0.05).tolist(),
+            timestamps(rng, len(idx))
+        ])
+
+def generate_pricing_tiers(writer, seed, catalog):
+    tiers = len(TIER_NAMES)
+    for block, start in enumerate(range(0, catalog.count, BLOCK_SIZE)):
+        rng = block_rng(seed, "pricing_tiers", block)
+        products = np.repeat(np.arange(start, min(start + BLOCK_SIZE, catalog.count)), tiers)
+        tier = np.tile(np.arange(tiers), len(products) // tiers)
+        idx = products * tiers + tier
+        writer.write([
+            make_uuids("pricing_tiers", idx),
+            make_uuids("organizations", catalog.organization[products]),
+            make_uuids("products", products),
+            [TIER_NAMES[t] for t in tier.tolist()],
+            [TIER_MIN_QUANTITY[t] for t in tier.tolist()],
+            [TIER_MAX_QUANTITY[t] for t in tier.tolist()],
+            np.round(catalog.base_price[products] * np.array(TIER_DISCOUNT)[tier], 2).tolist(),
+            (tier + 1).tolist(),
+            [True] * len(idx),
+            timestamps(rng, len(idx))
+        ])
+
+def generate_orders(order_writer, item_writer, seed, catalog, orders, customers, users, order_size_sigma):
+    """Orders and their line items are generated together so totals add up"""
+    first_customer, customer_count = customers
+    item_offset = 0
+    for block, start in enumerate(range(0, orders, BLOCK_SIZE)):
+        rng = block_rng(seed, "orders", block)
+        idx = np.arange(start, min(start + BLOCK_SIZE, orders))
+        count = len(idx)
+
+        lines = heavy_tail(rng, count, order_size_sigma, cap=200)
+        order_of_item = np.repeat(np.arange(count), lines)
+        products = catalog.sample(rng, len(order_of_item))
+        quantity = np.minimum(rng.zipf(2.0, len(order_of_item)), 500)
+        unit_price = catalog.base_price[products]
+        line_total = np.round(quantity * unit_price, 2)
+
+        subtotal = np.round(np.bincount(order_of_item, weights=line_total, minlength=count), 2)
+        tax = np.round(subtotal * 0.08, 2)
+        shipping = np.where(subtotal >= 500, 0.0, 25.0)
+        created = timestamps(rng, count)
+        order_ids = make_uuids("orders", idx)
+
+        order_writer.write([
+            order_ids,
+            make_uuids("organizations", first_customer + rng.integers(0, customer_count, count)),
+            [users[u] for u in rng.integers(0, len(users), count).tolist()],
+            [f"ORD-SYN-{i:010d}" for i in idx.tolist()],
+            ORDER_STATUSES[np.searchsorted(np.cumsum(ORDER_STATUS_WEIGHTS), rng.random(count), side="right").clip(0, len(ORDER_STATUSES) - 1)].tolist(),
+            subtotal.tolist(),
+            tax.tolist(),
+            shipping.tolist(),
+            np.round(subtotal + tax + shipping, 2).tolist(),
+            created
+        ])
+
+        item_idx = np.arange(item_offset, item_offset + len(order_of_item))
+        item_offset += len(order_of_item)
+        item_writer.write([
+            make_uuids("order_items", item_idx),
+            [order_ids[o] for o in order_of_item.tolist()],
+            make_uuids("products", products),
+            catalog.sku(products),
+            catalog.name(products),
+            quantity.tolist(),
+            unit_price.tolist(),
+            line_total.tolist(),
+            [created[o] for o in order_of_item.tolist()]
+        ])
+
+def generate_cart_items(writer, seed, catalog, users, customers, cart_size_sigma):
+    """One cart per user; (user_id, product_id) is unique as the schema requires"""
+    first_customer, customer_count = customers
+    item_offset = 0
+    for block, start in enumerate(range(0, len(users), BLOCK_SIZE)):
+        rng = block_rng(seed, "cart_items", block)
+        block_users = np.arange(start, min(start + BLOCK_SIZE, len(users)))
+        sizes = heavy_tail(rng, len(block_users), cart_size_sigma, cap=min(catalog.count, 100))
+        owners = np.repeat(block_users, sizes)
+        products = catalog.sample(rng, len(owners))
+        # Popular products repeat within a cart; keep the first of each pair
+        _, first = np.unique(owners * catalog.count + products, return_index=True)
+        first.sort()
+        owners, products = owners[first], products[first]
+
+        idx = np.arange(item_offset, item_offset + len(owners))
+        item_offset += len(owners)
+        writer.write([
+            make_uuids("cart_items", idx),
+            make_uuids("organizations", first_customer + owners % customer_count),
+            [users[u] for u in owners.tolist()],
+            make_uuids("products", products),
+            np.minimum(rng.zipf(2.0, len(owners)), 100).tolist(),
+            timestamps(rng, len(owners))
+        ])
+
+def check_schema(tables):
+    """Fail fast if a generated column is missing from the migrations"""
+    schema = {table["name"]: {column["name"] for column in table["columns"]} for table in tables}
+    for table, columns in TABLE_COLUMNS.items():
+        # pricing_tiers is created by seed_pricing.sql rather than a migration
+        if table not in schema:
+            continue
+        missing = [column for column in columns if column not in schema[table]]
+        if missing:
+            raise SystemExit(f"Error: {table} has no column(s) {', '.join(missing)} in the migrations")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic B2B+ dataset for load testing")
+    parser.add_argument("--out", type=Path, required=True, help="output directory")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument("--organizations", type=int, default=1000)
+    parser.add_argument("--distributor-share", type=float, default=0.1,
+                        help="fraction of organizations that sell products (default: 0.1)")
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100,
+                        help="number of synthetic user ids when --user-id is not given")
+    parser.add_argument("--user-id", action="append", default=[],
+                        help="existing auth.users id to attach orders and carts to (repeatable)")
+    parser.add_argument("--zipf-exponent", type=float, default=1.1,
+                        help="skew of product popularity (default: 1.1)")
+    parser.add_argument("--order-size-sigma", type=float, default=0.9,
+                        help="tail weight of line items per order (default: 0.9)")
+    parser.add_argument("--cart-size-sigma", type=float, default=0.8)
+    args = parser.parse_args()
+
+    if args.organizations < 2 or args.products < 1:
+        raise SystemExit("Error: need at least 2 organizations and 1 product")
+
+    check_schema(load_schema_tables())
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    distributors = min(args.organizations - 1, max(1, int(args.organizations * args.distributor_share)))
+    customers = (distributors, args.organizations - distributors)
+    users = args.user_id or make_uuids("users", np.arange(args.users))
+    if not args.user_id:
+        print(f"Note: orders and carts reference {len(users)} synthetic user ids; "
+              f"pass --user-id to use existing auth.users")
+
+    catalog = Catalog(args.seed, args.products, args.organizations, distributors, args.zipf_exponent)
+    writers = {table: TableWriter(args.out, table, args.format) for table in TABLE_COLUMNS}
+    try:
+        generate_organizations(writers["organizations"], args.seed, args.organizations, distributors)
+        generate_products(writers["products"], args.seed, catalog)
+        generate_pricing_tiers(writers["pricing_tiers"], args.seed, catalog)
+        generate_orders(writers["orders"], writers["order_items"], args.seed, catalog,
+                        args.orders, customers, users, args.order_size_sigma)
+        generate_cart_items(writers["cart_items"], args.seed, catalog, users, customers, args.cart_size_sigma)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    manifest = {
+        "seed": args.seed,
+        "format": args.format,
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("out", "format", "user_id")},
+        "rows": {table: writer.rows for table, writer in writers.items()}
+    }
+    with open(args.out / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print("="*60)
+    print("SYNTHETIC DATASET")
+    print("="*60)
+    for table, writer in writers.items():
+        print(f"{table.ljust(25)}: {writer.rows} rows -> {writer.path}")
+    print("="*60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Local PostgREST Stand-in
+
+Serves the endpoints scripts/seed_data.py uses, backed by in-memory tables:
+
+    POST /rest/v1/{table}       bulk insert; upsert with Prefer: resolution=merge-duplicates
+    GET|HEAD /rest/v1/{table}   row count in Content-Range for Prefer: count=...
+
+Latency, error rate and a request rate limit are configurable so the seeder's
+batching, retry and backoff paths can be exercised and benchmarked offline.
+
+Usage: python3 scripts/mock_postgrest.py --port 54321 --latency-ms 20 --error-rate 0.02
+       SUPABASE_KEY=test python3 scripts/seed_data.py --url http://127.0.0.1:54321
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+class MockPostgrest(ThreadingHTTPServer):
+    """In-memory PostgREST with configurable latency, failures and rate limiting"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0.0, jitter_ms=0.0, per_row_us=0.0,
+                 error_rate=0.0, rate_limit=0.0, seed=None):
+        super().__init__(address, MockPostgrestHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.per_row_us = per_row_us
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all tables and counters"""
+        with self.lock:
+            # Rows keyed by id so upserts replace instead of duplicating
+            self.tables = {}
+            self.requests = 0
+            self.rejected = {"errors": 0, "rate_limited": 0, "conflicts": 0}
+            self.tokens = self.rate_limit
+            self.refilled = time.monotonic()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def take_token(self):
+        """Token bucket holding one second of requests; returns seconds until the next token, or 0"""
+        if self.rate_limit <= 0:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled) * self.rate_limit)
+            self.refilled = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate_limit
+
+    def delay(self, rows=0):
+        jitter = self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        seconds = (self.latency_ms + jitter) / 1000 + rows * self.per_row_us / 1e6
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def start(self):
+        """Serve from a daemon thread; returns the server for chaining"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class MockPostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def table_name(self):
+        path = urlparse(self.path).path
+        prefix = "/rest/v1/"
+        if not path.startswith(prefix) or "/" in path[len(prefix):] or len(path) == len(prefix):
+            return None
+        return path[len(prefix):]
+
+    def reply(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def admit(self, rows=0):
+        """Apply rate limit, latency and injected failures; False once a reply was sent"""
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        wait = server.take_token()
+        if wait:
+            with server.lock:
+                server.rejected["rate_limited"] += 1
+            self.reply(429, {"message": "rate limit exceeded"}, {"Retry-After": f"{wait:.3f}"})
+            return False
+        server.delay(rows)
+        if server.error_rate and server.random.random() < server.error_rate:
+            with server.lock:
+                server.rejected["errors"] += 1
+            self.reply(server.random.choice([500, 502, 503]), {"message": "injected failure"})
+            return False
+        return True
+
+    def do_POST(self):
+        table = self.table_name()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if table is None:
+            self.reply(404, {"message": "not found"})
+            return
+        try:
+            rows = json.loads(body or b"[]")
+        except ValueError:
+            self.reply(400, {"message": "invalid JSON"})
+            return
+        rows = rows if isinstance(rows, list) else [rows]
+        if not self.admit(len(rows)):
+            return
+
+        upsert = "resolution=merge-duplicates" in self.headers.get("Prefer", "")
+        server = self.server
+        with server.lock:
+            stored = server.tables.setdefault(table, {})
+            keys = [row.get("id") if row.get("id") is not None else object() for row in rows]
+            if not upsert and any(key in stored for key in keys):
+                server.rejected["conflicts"] += 1
+                conflict = True
+            else:
+                stored.update(zip(keys, rows))
+                conflict = False
+        if conflict:
+            self.reply(409, {"code": "23505", "message": "duplicate key value violates unique constraint"})
+        else:
+            self.reply(201)
+
+    def do_GET(self):
+        table = self.table_name()
+        if table is None:
+            self.reply(404, {"message": "not found"})
+            return
+        if not self.admit():
+            return
+        with self.server.lock:
+            count = len(self.server.tables.get(table, {}))
+        prefer = self.headers.get("Prefer", "")
+        if "count=planned" in prefer or "count=estimated" in prefer:
+            # Planner estimates are close but rarely exact
+            count = int(count * self.server.random.uniform(0.95, 1.05))
+        total = str(count) if "count=" in prefer else "*"
+        self.reply(200, [], {"Content-Range": f"*/{total}"})
+
+    do_HEAD = do_GET
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an in-memory PostgREST stand-in for the seeder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform random extra latency")
+    parser.add_argument("--per-row-us", type=float, default=0.0, help="extra latency per inserted row")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 5xx")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before 429 (0: unlimited)")
+    parser.add_argument("--seed", type=int, help="random seed for jitter and failures")
+    args = parser.parse_args()
+
+    server = MockPostgrest((args.host, args.port), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           per_row_us=args.per_row_us, error_rate=args.error_rate,
+                           rate_limit=args.rate_limit, seed=args.seed)
+    print(f"Mock PostgREST listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
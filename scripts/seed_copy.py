@@ -0,0 +1,716 @@
+#!/usr/bin/env python3
+"""
+B2B+ Seed SQL to COPY Converter
+
+Expands the INSERT ... VALUES statements of the seed_*.sql files into one
+tabular stream per table and writes them as COPY ... FROM STDIN scripts, plus a
+load.sql that applies everything in foreign-key order inside one transaction.
+Secondary indexes of the bulk-loaded tables are dropped before their first COPY
+and rebuilt after their last one.
+
+Statements that cannot be expanded offline (INSERT ... SELECT, DO blocks,
+UPDATE, rows referencing PL/pgSQL variables) are kept verbatim and scheduled
+after every statement they depend on. NOW() and gen_random_uuid() are resolved
+at conversion time, so regenerate the files as part of each reset.
+
+Usage: python3 scripts/seed_copy.py [--out DIR] [seed.sql ...]
+       psql "$DATABASE_URL" -f .seed_copy/load.sql
+"""
+
+import re
+import json
+import heapq
+import uuid
+import argparse
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+from seed_data import PROJECT_ROOT, load_fk_graph
+from sql_lexer import dollar_body, iter_statements, tokenize_sql
+
+# Same order as scripts/seed-database.js
+DEFAULT_SEED_FILES = [
+    "seed_organizations.sql",
+    "seed_members_addresses.sql",
+    "seed_products.sql",
+    "seed_pricing.sql",
+    "seed_promotional_codes.sql",
+    "seed_orders.sql",
+    "seed_carts_templates.sql",
+    "seed_containers_campaigns.sql",
+    "seed_notifications.sql",
+    "seed_final.sql"
+]
+
+DEFAULT_OUT_DIR = PROJECT_ROOT / ".seed_copy"
+
+# Drops and rebuilds the non-unique, non-constraint indexes of a table
+LOAD_PRELUDE = """\\set ON_ERROR_STOP on
+BEGIN;
+
+CREATE TEMP TABLE _seed_deferred_indexes (table_name regclass, definition text) ON COMMIT DROP;
+
+CREATE FUNCTION pg_temp.seed_defer_indexes(target regclass) RETURNS void AS $$
+DECLARE
+  idx record;
+BEGIN
+  FOR idx IN
+    SELECT i.indexrelid::regclass AS name, pg_get_indexdef(i.indexrelid) AS definition
+    FROM pg_index i
+    WHERE i.indrelid = target
+      AND NOT i.indisunique
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+  LOOP
+    INSERT INTO _seed_deferred_indexes VALUES (target, idx.definition);
+    EXECUTE format('DROP INDEX %s', idx.name);
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION pg_temp.seed_rebuild_indexes(target regclass) RETURNS void AS $$
+DECLARE
+  definition text;
+BEGIN
+  FOR definition IN SELECT d.definition FROM _seed_deferred_indexes d WHERE d.table_name = target LOOP
+    EXECUTE definition;
+  END LOOP;
+  DELETE FROM _seed_deferred_indexes WHERE table_name = target;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRANSACTION_CONTROL = {"BEGIN", "COMMIT", "END", "ROLLBACK", "START"}
+
+INTERVAL_UNITS = {
+    "year": ("months", 12), "month": ("months", 1), "mon": ("months", 1),
+    "week": ("days", 7), "day": ("days", 1),
+    "hour": ("seconds", 3600), "minute": ("seconds", 60), "min": ("seconds", 60),
+    "second": ("seconds", 1), "sec": ("seconds", 1)
+}
+INTERVAL_PART = re.compile(r"([+-]?\d+(?:\.\d+)?)\s*([a-z]+)")
+E_STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+class NotConstant(Exception):
+    """Raised when a VALUES expression cannot be evaluated offline"""
+
+class Interval(NamedTuple):
+    months: int
+    days: int
+    seconds: float
+
+class Literal(NamedTuple):
+    """Numeric literal kept in its source spelling"""
+    text: str
+
+class JsonValue(NamedTuple):
+    """Result of json(b)_build_object / json(b)_build_array over constants"""
+    value: object
+
+class Variable(NamedTuple):
+    """PL/pgSQL variable of a DO block, resolved by a lookup at load time"""
+    name: str
+
+def parse_interval(text):
+    parts = {"months": 0, "days": 0, "seconds": 0}
+    matched = INTERVAL_PART.findall(text.lower())
+    if not matched or INTERVAL_PART.sub("", text.lower()).strip():
+        raise NotConstant(f"interval '{text}'")
+    for amount, unit in matched:
+        unit = unit[:-1] if unit.endswith("s") and unit[:-1] in INTERVAL_UNITS else unit
+        if unit not in INTERVAL_UNITS:
+            raise NotConstant(f"interval unit {unit}")
+        field, factor = INTERVAL_UNITS[unit]
+        parts[field] += float(amount) * factor
+    return Interval(int(parts["months"]), int(parts["days"]), parts["seconds"])
+
+def add_interval(value, interval, sign):
+    """Postgres timestamp + interval: months first (day clamped), then days and seconds"""
+    months = value.month - 1 + sign * interval.months
+    year = value.year + months // 12
+    month = months % 12 + 1
+    value = value.replace(year=year, month=month, day=min(value.day, monthrange(year, month)[1]))
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value + sign * timedelta(days=interval.days, seconds=interval.seconds)
+
+def decode_string(token):
+    value = token.value
+    if value[0] in "eE":
+        body = value[2:-1].replace("''", "'")
+        return re.sub(r"\\(.)", lambda m: E_STRING_ESCAPES.get(m.group(1), m.group(1)), body)
+    return value[1:-1].replace("''", "'")
+
+class ExpressionEvaluator:
+    """Evaluate the constant subset of SQL used in seed VALUES lists"""
+
+    def __init__(self, now):
+        self.now = now
+        self.variables = set()
+
+    def evaluate(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        value = self.expression()
+        if self.pos != len(tokens):
+            raise NotConstant(tokens[self.pos].value)
+        return value
+
+    def peek(self, value=None):
+        if self.pos >= len(self.tokens):
+            return None
+        tok = self.tokens[self.pos]
+        if value is None:
+            return tok
+        return tok if tok.value.upper() == value else None
+
+    def expect(self, value):
+        if not self.peek(value):
+            raise NotConstant(f"expected {value}")
+        self.pos += 1
+
+    def expression(self):
+        value = self.term()
+        while self.peek("+") or self.peek("-"):
+            sign = 1 if self.tokens[self.pos].value == "+" else -1
+            self.pos += 1
+            value = self.combine(value, self.term(), sign)
+        return value
+
+    def combine(self, left, right, sign):
+        if isinstance(left, (datetime, date)) and isinstance(right, Interval):
+            return add_interval(left, right, sign)
+        if isinstance(left, Interval) and isinstance(right, Interval):
+            return Interval(left.months + sign * right.months, left.days + sign * right.days,
+                            left.seconds + sign * right.seconds)
+        if type(left) is date and isinstance(right, Literal) and right.text.isdigit():
+            return left + sign * timedelta(days=int(right.text))
+        raise NotConstant("arithmetic")
+
+    def term(self):
+        value = self.primary()
+        while self.peek("::"):
+            self.pos += 1
+            value = self.cast(value, self.type_name())
+        return value
+
+    def type_name(self):
+        words = []
+        while self.peek() is not None and self.peek().kind in ("word", "quoted_ident"):
+            words.append(self.tokens[self.pos].value.lower())
+            self.pos += 1
+            if self.peek("."):
+                self.pos += 1
+        if self.peek("("):
+            while not self.peek(")"):
+                self.pos += 1
+                if self.pos >= len(self.tokens):
+                    raise NotConstant("type modifier")
+            self.pos += 1
+        if self.peek("[") and self.pos + 1 < len(self.tokens) and self.tokens[self.pos + 1].value == "]":
+            self.pos += 2
+            words.append("[]")
+        if not words:
+            raise NotConstant("type name")
+        return " ".join(words)
+
+    def cast(self, value, type_name):
+        if type_name == "interval" and isinstance(value, str):
+            return parse_interval(value)
+        if type_name == "date" and isinstance(value, (datetime, date)):
+            return value.date() if isinstance(value, datetime) else value
+        if type_name == "date" and isinstance(value, str):
+            return date.fromisoformat(value)
+        # Every other cast is performed by COPY when it parses the text
+        return value
+
+    def primary(self):
+        tok = self.peek()
+        if tok is None:
+            raise NotConstant("empty expression")
+        self.pos += 1
+        word = tok.value.upper() if tok.kind == "word" else None
+        if tok.kind == "string":
+            return decode_string(tok)
+        if tok.kind == "number":
+            return Literal(tok.value)
+        if tok.kind == "op" and tok.value in "+-" and self.peek() is not None and self.peek().kind == "number":
+            self.pos += 1
+            return Literal(tok.value.lstrip("+") + self.tokens[self.pos - 1].value)
+        if tok.kind == "op" and tok.value == "(":
+            value = self.expression()
+            self.expect(")")
+            return value
+        if word == "NULL":
+            return None
+        if word in ("TRUE", "FALSE"):
+            return word == "TRUE"
+        if word in ("NOW", "GEN_RANDOM_UUID", "UUID_GENERATE_V4"):
+            self.expect("(")
+            self.expect(")")
+            return self.now if word == "NOW" else str(uuid.uuid4())
+        if word in ("CURRENT_TIMESTAMP", "LOCALTIMESTAMP"):
+            return self.now
+        if word == "CURRENT_DATE":
+            return self.now.date()
+        if word == "INTERVAL" and self.peek() is not None and self.peek().kind == "string":
+            self.pos += 1
+            return parse_interval(decode_string(self.tokens[self.pos - 1]))
+        if word == "ARRAY" and self.peek("["):
+            self.pos += 1
+            items = []
+            while not self.peek("]"):
+                items.append(self.expression())
+                if self.peek(","):
+                    self.pos += 1
+                elif not self.peek("]"):
+                    raise NotConstant("array")
+            self.pos += 1
+            return items
+        if word in ("JSONB_BUILD_OBJECT", "JSON_BUILD_OBJECT", "JSONB_BUILD_ARRAY", "JSON_BUILD_ARRAY"):
+            items = [json_value(item) for item in self.arguments()]
+            if word.endswith("ARRAY"):
+                return JsonValue(items)
+            if len(items) % 2 or not all(isinstance(key, str) for key in items[::2]):
+                raise NotConstant(word)
+            return JsonValue(dict(zip(items[::2], items[1::2])))
+        if tok.kind == "word" and tok.value.lower() in self.variables:
+            return Variable(tok.value.lower())
+        if word == "CAST":
+            self.expect("(")
+            value = self.expression()
+            self.expect("AS")
+            value = self.cast(value, self.type_name())
+            self.expect(")")
+            return value
+        raise NotConstant(tok.value)
+
+    def arguments(self):
+        self.expect("(")
+        items = []
+        while not self.peek(")"):
+            items.append(self.expression())
+            if self.peek(","):
+                self.pos += 1
+            elif not self.peek(")"):
+                raise NotConstant("argument list")
+        self.pos += 1
+        return items
+
+def json_value(value):
+    """Convert an evaluated argument of a JSON builder to a Python JSON value"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Literal):
+        return json.loads(value.text)
+    if isinstance(value, JsonValue):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise NotConstant("JSON argument")
+
+def array_element(value):
+    if value is None:
+        return "NULL"
+    text = copy_text(value, escape=False)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def copy_text(value, escape=True):
+    """Render an evaluated value in COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        text = "t" if value else "f"
+    elif isinstance(value, Literal):
+        text = value.text
+    elif isinstance(value, datetime):
+        text = value.isoformat(sep=" ")
+    elif isinstance(value, date):
+        text = value.isoformat()
+    elif isinstance(value, Interval):
+        text = f"{value.months} mons {value.days} days {value.seconds} seconds"
+    elif isinstance(value, JsonValue):
+        text = json.dumps(value.value)
+    elif isinstance(value, list):
+        text = "{" + ",".join(array_element(item) for item in value) + "}"
+    else:
+        text = value
+    return text.translate(COPY_ESCAPES) if escape else text
+
+def split_top_level(tokens, start, end):
+    """Split tokens[start:end] on commas outside parentheses and brackets"""
+    parts, current, depth = [], [], 0
+    for tok in tokens[start:end]:
+        if tok.kind == "op" and tok.value in "([":
+            depth += 1
+        elif tok.kind == "op" and tok.value in ")]":
+            depth -= 1
+        elif tok.kind == "op" and tok.value == "," and depth == 0:
+            parts.append(current)
+            current = []
+            continue
+        current.append(tok)
+    parts.append(current)
+    return parts
+
+def matching_paren(tokens, i):
+    depth = 0
+    for k in range(i, len(tokens)):
+        if tokens[k].kind == "op" and tokens[k].value == "(":
+            depth += 1
+        elif tokens[k].kind == "op" and tokens[k].value == ")":
+            depth -= 1
+            if depth == 0:
+                return k
+    return -1
+
+def words_at(tokens, i, *words):
+    return all(i + k < len(tokens) and tokens[i + k].kind == "word" and tokens[i + k].value.upper() == word
+               for k, word in enumerate(words))
+
+def qualified_name(tokens, i):
+    """Return the dotted name at i and the index after it"""
+    if i >= len(tokens) or tokens[i].kind not in ("word", "quoted_ident"):
+        return None, i
+    parts = [tokens[i].value]
+    i += 1
+    while i + 1 < len(tokens) and tokens[i].value == "." and tokens[i + 1].kind in ("word", "quoted_ident"):
+        parts.append(tokens[i + 1].value)
+        i += 2
+    return ".".join(parts), i
+
+def expand_insert(text, tokens, evaluator):
+    """Turn INSERT INTO t (cols) VALUES ... [ON CONFLICT ...] into rows.
+
+    Returns None when the statement needs the server to evaluate it.
+    """
+    if not words_at(tokens, 0, "INSERT", "INTO"):
+        return None
+    table, i = qualified_name(tokens, 2)
+    if table is None or i >= len(tokens) or tokens[i].value != "(":
+        return None
+    close = matching_paren(tokens, i)
+    columns = [part[0].value for part in split_top_level(tokens, i + 1, close) if len(part) == 1]
+    if close < 0 or not columns or len(columns) != len(split_top_level(tokens, i + 1, close)):
+        return None
+    i = close + 1
+    if not words_at(tokens, i, "VALUES"):
+        return None
+    i += 1
+
+    rows = []
+    while i < len(tokens) and tokens[i].value == "(":
+        close = matching_paren(tokens, i)
+        if close < 0:
+            return None
+        try:
+            row = [evaluator.evaluate(part) for part in split_top_level(tokens, i + 1, close)]
+        except (NotConstant, ValueError):
+            return None
+        if len(row) != len(columns):
+            return None
+        rows.append(row)
+        i = close + 1
+        if i < len(tokens) and tokens[i].value == ",":
+            i += 1
+
+    end = len(tokens) - 1 if tokens[-1].value == ";" else len(tokens)
+    on_conflict = None
+    if i < end:
+        if not words_at(tokens, i, "ON", "CONFLICT"):
+            return None
+        if any(tok.kind == "word" and tok.value.upper() == "RETURNING" for tok in tokens[i:end]):
+            return None
+        on_conflict = text[tokens[i].start:tokens[end - 1].end]
+    return {"table": table, "columns": columns, "on_conflict": on_conflict, "rows": rows, "lookups": {}}
+
+def expand_do_block(tokens, evaluator):
+    """Expand a DO block made only of SELECT ... INTO lookups and INSERT ... VALUES.
+
+    This is the shape the seed files use to attach rows to auth.users by
+    email. Each lookup becomes a scalar subquery evaluated when the staged
+    rows are inserted. Any other control flow keeps the block verbatim.
+    """
+    body_token = next((tok for tok in tokens if tok.kind == "dollar_string"), None)
+    if body_token is None or not words_at(tokens, 0, "DO"):
+        return None
+    body = dollar_body(body_token)
+    toks = list(tokenize_sql(body))
+
+    declared = set()
+    i = 0
+    if words_at(toks, 0, "DECLARE"):
+        i = 1
+        while i < len(toks) and not words_at(toks, i, "BEGIN"):
+            end = next((k for k in range(i, len(toks)) if toks[k].value == ";"), len(toks))
+            if toks[i].kind != "word" or any(tok.value.upper() in (":=", "=", "DEFAULT") for tok in toks[i:end]):
+                return None
+            declared.add(toks[i].value.lower())
+            i = end + 1
+    if not words_at(toks, i, "BEGIN"):
+        return None
+
+    statements, current = [], []
+    for tok in toks[i + 1:]:
+        if tok.value == ";":
+            statements.append(current)
+            current = []
+        else:
+            current.append(tok)
+    if current:
+        statements.append(current)
+    if not statements or [tok.value.upper() for tok in statements[-1]] != ["END"]:
+        return None
+
+    units = []
+    lookups = {}
+    evaluator.variables = declared
+    try:
+        for statement in statements[:-1]:
+            into = next((k for k, tok in enumerate(statement) if words_at(statement, k, "INTO")), None)
+            if words_at(statement, 0, "SELECT") and into is not None and into + 1 < len(statement) \
+                    and statement[into + 1].value.lower() in declared:
+                rest = statement[into + 2:]
+                query = f"SELECT {body[statement[1].start:statement[into - 1].end]}"
+                if rest:
+                    query += f" {body[rest[0].start:rest[-1].end]}"
+                if not any(words_at(rest, k, "LIMIT") for k in range(len(rest))):
+                    query += " LIMIT 1"
+                lookups[statement[into + 1].value.lower()] = f"({query})"
+                continue
+            expanded = expand_insert(body, statement, evaluator)
+            if expanded is None:
+                return None
+            # A variable never assigned is NULL, as in PL/pgSQL
+            expanded["lookups"] = {name: lookups.get(name, "NULL") for name in declared}
+            units.append(expanded)
+    finally:
+        evaluator.variables = set()
+    return units
+
+def statement_tables(tokens, known):
+    """Return (tables mentioned, tables written) by a statement, looking inside DO bodies"""
+    mentioned, written = set(), set()
+    for k, tok in enumerate(tokens):
+        if tok.kind == "dollar_string":
+            inner = list(tokenize_sql(dollar_body(tok)))
+            inner_mentioned, inner_written = statement_tables(inner, known)
+            mentioned |= inner_mentioned
+            written |= inner_written
+        elif tok.kind == "word" and tok.value.lower() in known:
+            mentioned.add(tok.value.lower())
+            previous = [t.value.upper() for t in tokens[max(0, k - 2):k] if t.kind == "word"]
+            if previous[-1:] in (["INTO"], ["UPDATE"]) or previous[-2:] == ["DELETE", "FROM"] or previous[-1:] == ["TRUNCATE"]:
+                written.add(tok.value.lower())
+    return mentioned, written
+
+def read_units(paths, evaluator, known):
+    """Split seed files into COPY units and verbatim SQL units, in file order"""
+    units = []
+    for path in paths:
+        text = path.read_text()
+        for tokens in iter_statements(tokenize_sql(text), lenient=True):
+            if tokens[0].value.upper() in TRANSACTION_CONTROL:
+                # load.sql owns the transaction
+                continue
+            expanded = expand_insert(text, tokens, evaluator)
+            expanded = [expanded] if expanded is not None else expand_do_block(tokens, evaluator)
+            if expanded:
+                for unit in expanded:
+                    table = unit["table"].split(".")[-1].lower()
+                    unit.update(kind="copy", source=path.name, mentioned={table}, written={table})
+                    units.append(unit)
+                continue
+            mentioned, written = statement_tables(tokens, known)
+            units.append({
+                "kind": "sql",
+                "source": path.name,
+                "sql": text[tokens[0].start:tokens[-2 if tokens[-1].value == ";" else -1].end],
+                "mentioned": mentioned,
+                "written": written
+            })
+    return units
+
+def table_depths(graph):
+    """Depth of each table in the FK graph; parents come before children"""
+    depths = {}
+
+    def depth(table, visiting):
+        if table in depths:
+            return depths[table]
+        if table in visiting:
+            return 0
+        visiting.add(table)
+        parents = [parent for parent in graph.get(table, ()) if parent != table]
+        depths[table] = 1 + max((depth(parent, visiting) for parent in parents), default=-1)
+        return depths[table]
+
+    for table in graph:
+        depth(table, set())
+    return depths
+
+def related(a, b, graph):
+    """Whether unit b must stay after unit a"""
+    if a["mentioned"] & b["mentioned"]:
+        return True
+    # Foreign keys of tables outside the migrations are unknown; keep file order
+    if any(table not in graph for table in a["written"] | b["written"]):
+        return True
+    return any(graph[child] & b["written"] for child in a["written"]) or \
+        any(graph[child] & a["written"] for child in b["written"])
+
+def schedule_units(units, graph):
+    """Order units by FK depth while keeping related statements in file order.
+
+    Two units are related when they touch a common table, write tables linked
+    by a foreign key, or write a table the migrations do not define; the later
+    one always waits for the earlier one, so the result replays the files
+    faithfully and can never deadlock.
+    """
+    depths = table_depths(graph)
+    successors = [[] for _ in units]
+    waiting = [0] * len(units)
+    for i in range(len(units)):
+        for j in range(i + 1, len(units)):
+            if related(units[i], units[j], graph):
+                successors[i].append(j)
+                waiting[j] += 1
+
+    def key(i):
+        tables = units[i]["written"] or units[i]["mentioned"]
+        return (max((depths.get(t, 0) for t in tables), default=0), i)
+
+    ready = [key(i) for i in range(len(units)) if waiting[i] == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        ordered.append(units[i])
+        for j in successors[i]:
+            waiting[j] -= 1
+            if waiting[j] == 0:
+                heapq.heappush(ready, key(j))
+    return merge_adjacent(ordered)
+
+def merge_adjacent(units):
+    """Fold consecutive COPY units of one table into a single stream"""
+    merged = []
+    for unit in units:
+        last = merged[-1] if merged else None
+        if (last is not None and unit["kind"] == "copy" and last["kind"] == "copy"
+                and last["table"] == unit["table"] and last["columns"] == unit["columns"]
+                and last["on_conflict"] == unit["on_conflict"]
+                and all(last["lookups"].get(name, sql) == sql for name, sql in unit["lookups"].items())
+                and "DO UPDATE" not in (unit["on_conflict"] or "").upper()):
+            last["rows"] = last["rows"] + unit["rows"]
+            last["lookups"] = {**last["lookups"], **unit["lookups"]}
+            continue
+        if last is not None and unit["kind"] == "sql" and last["kind"] == "sql" and last["source"] == unit["source"]:
+            last["sql"] += ";\n\n" + unit["sql"]
+            continue
+        merged.append(dict(unit))
+    return merged
+
+def copy_script(unit):
+    columns = unit["columns"]
+    column_list = ", ".join(columns)
+    # Columns holding a DO-block variable in at least one row
+    variable_columns = [k for k in range(len(columns))
+                        if any(isinstance(row[k], Variable) for row in unit["rows"])]
+
+    lines = []
+    for row in unit["rows"]:
+        cells = ["\\N" if isinstance(value, Variable) else copy_text(value) for value in row]
+        cells += [row[k].name if isinstance(row[k], Variable) else "\\N" for k in variable_columns]
+        lines.append("\t".join(cells) + "\n")
+    data = "".join(lines) + "\\.\n"
+
+    if unit["on_conflict"] is None and not variable_columns:
+        return f"COPY {unit['table']} ({column_list}) FROM STDIN;\n{data}"
+
+    # COPY can neither resolve conflicts nor run lookups; stage the rows and insert them set-based
+    stage_columns = column_list + "".join(f", _var_{k}" for k in variable_columns)
+    select = []
+    for k, column in enumerate(columns):
+        if k not in variable_columns:
+            select.append(column)
+            continue
+        names = sorted({row[k].name for row in unit["rows"] if isinstance(row[k], Variable)})
+        branches = " ".join(f"WHEN '{name}' THEN {unit['lookups'].get(name, 'NULL')}" for name in names)
+        select.append(f"CASE _var_{k} {branches} ELSE {column} END")
+    script = f"CREATE TEMP TABLE _seed_stage ON COMMIT DROP AS SELECT {column_list} FROM {unit['table']} WITH NO DATA;\n"
+    if variable_columns:
+        script += f"ALTER TABLE _seed_stage {', '.join(f'ADD COLUMN _var_{k} text' for k in variable_columns)};\n"
+    script += f"COPY _seed_stage ({stage_columns}) FROM STDIN;\n{data}"
+    script += f"INSERT INTO {unit['table']} ({column_list})\nSELECT {', '.join(select)}\nFROM _seed_stage"
+    script += f" {unit['on_conflict']};\n" if unit["on_conflict"] else ";\n"
+    return script + "DROP TABLE _seed_stage;\n"
+
+def write_load_scripts(units, out_dir, now):
+    """Write one script per unit and the load.sql that includes them in order"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in list(out_dir.glob("[0-9][0-9][0-9]_*.sql")) + list(out_dir.glob("load.sql")):
+        stale.unlink()
+
+    last_copy = {}
+    for position, unit in enumerate(units):
+        if unit["kind"] == "copy":
+            last_copy[unit["table"]] = position
+
+    lines = [f"-- Generated by scripts/seed_copy.py; NOW() resolved as {now.isoformat()}", LOAD_PRELUDE]
+    deferred = set()
+    for position, unit in enumerate(units):
+        if unit["kind"] == "copy":
+            name = f"{position + 1:03d}_{unit['table'].replace('.', '_')}.sql"
+            body = copy_script(unit)
+            if unit["table"] not in deferred:
+                deferred.add(unit["table"])
+                lines.append(f"SELECT pg_temp.seed_defer_indexes('{unit['table']}');")
+        else:
+            name = f"{position + 1:03d}_{Path(unit['source']).stem}.sql"
+            body = f"-- From {unit['source']}\n{unit['sql']};\n"
+        (out_dir / name).write_text(body)
+        lines.append(f"\\ir {name}")
+        if unit["kind"] == "copy" and last_copy[unit["table"]] == position:
+            lines.append(f"SELECT pg_temp.seed_rebuild_indexes('{unit['table']}');")
+    lines.append("COMMIT;\n")
+    (out_dir / "load.sql").write_text("\n".join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert seed SQL files into COPY bulk loads")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="seed files in load order (default: the files seed-database.js applies)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR, help="output directory")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="timestamp NOW() resolves to (default: current time, UTC)")
+    args = parser.parse_args()
+
+    paths = args.files or [PROJECT_ROOT / name for name in DEFAULT_SEED_FILES]
+    missing = [str(path) for path in paths if not path.exists()]
+    if missing:
+        raise SystemExit(f"Error: seed file(s) not found: {', '.join(missing)}")
+
+    now = args.now or datetime.now(timezone.utc)
+    graph = load_fk_graph()
+    units = read_units(paths, ExpressionEvaluator(now), set(graph))
+    ordered = schedule_units(units, graph)
+    write_load_scripts(ordered, args.out, now)
+
+    copied = [unit for unit in units if unit["kind"] == "copy"]
+    print("="*60)
+    print("SEED COPY CONVERSION")
+    print("="*60)
+    print(f"Statements expanded to COPY: {len(copied)} ({sum(len(unit['rows']) for unit in copied)} rows)")
+    print(f"Statements kept as SQL:      {len(units) - len(copied)}")
+    rows_by_table = {}
+    for unit in copied:
+        rows_by_table[unit["table"]] = rows_by_table.get(unit["table"], 0) + len(unit["rows"])
+    for table, count in rows_by_table.items():
+        print(f"  {table.ljust(25)}: {count} rows")
+    print(f"\nLoad with: psql \"$DATABASE_URL\" -f {args.out / 'load.sql'}")
+    print("="*60)
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,33 @@
 B2B+ Database Seeding Script
 
 This script seeds the database with comprehensive test data using the Supabase REST API.
-It inserts data row by row to ensure reliability.
+Rows are sent as PostgREST array payloads in batches over a pooled keep-alive session,
+with retries and backoff on rate limiting and server errors.
 """
 
 import os
+import re
 import sys
 import json
+import hashlib
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 
-# Supabase configuration
-SUPABASE_URL = "https://ksprdklquoskvjqsicvv.supabase.co"
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
+# Repository root, so the schema analyzers can be imported
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
-if not SUPABASE_KEY:
-    print("Error: SUPABASE_KEY environment variable is required")
-    print("Usage: SUPABASE_KEY=your_key python3 scripts/seed_data.py")
-    sys.exit(1)
+# Supabase configuration
+DEFAULT_SUPABASE_URL = "https://ksprdklquoskvjqsicvv.supabase.co"
+SUPABASE_URL = os.environ.get("SUPABASE_URL") or DEFAULT_SUPABASE_URL
+SUPABASE_KEY = os.environ.get("SUPABASE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY") or ""
 
 # Supabase REST API headers
 headers = {
@@ -29,26 +39,211 @@ headers = {
     "Prefer": "return=minimal"
 }
 
+# Bulk insert tuning
+DEFAULT_BATCH_SIZE = 500
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# (connect, read) seconds; a stalled request is retried like a dropped connection
+REQUEST_TIMEOUT = (10, 60)
+POOL_SIZE = 10
+
+# Upserts make replayed batches idempotent on primary-key conflicts
+UPSERT_HEADERS = {"Prefer": "return=minimal,resolution=merge-duplicates"}
+JOURNAL_PATH = PROJECT_ROOT / ".seed_journal.ndjson"
+
+batch_size = DEFAULT_BATCH_SIZE
+journal = None
+# Row positions per table rejected by validate_datasets; never sent
+invalid_rows = {}
+# Seconds taken by every POST attempt, retries included
+request_latencies = []
+
+def create_session(pool_size=POOL_SIZE):
+    """Create a keep-alive session with a connection pool sized for concurrent seeding"""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    http.headers.update(headers)
+    return http
+
+session = create_session()
+
+# Per-table throughput: rows, batches, retries, failed rows, rows skipped on
+# resume and elapsed seconds
+seed_stats = {}
+
+def table_stats(table):
+    return seed_stats.setdefault(table, {"rows": 0, "batches": 0, "retries": 0, "failed_rows": 0,
+                                         "skipped_rows": 0, "invalid_rows": 0, "seconds": 0.0})
+
+def batch_digest(batch):
+    """Fingerprint of a batch, so a changed dataset is never mistaken for a committed one"""
+    return hashlib.sha256(json.dumps(batch, sort_keys=True, default=str).encode()).hexdigest()
+
+class SeedJournal:
+    """Append-only record of the batches each table has committed.
+
+    Every line is one committed batch, flushed and fsynced before the next
+    one is recorded, so a crash loses at most the batches still in flight.
+    """
+
+    def __init__(self, path=JOURNAL_PATH, resume=False):
+        self.path = Path(path)
+        self.committed_batches = {}
+        if resume and self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-write
+                        continue
+                    self.committed_batches[(entry["table"], entry["batch"], entry["size"])] = entry["digest"]
+        self.file = open(self.path, "a" if resume else "w")
+
+    def is_committed(self, table, index, size, digest):
+        return self.committed_batches.get((table, index, size)) == digest
+
+    def record(self, table, index, size, digest, rows):
+        self.committed_batches[(table, index, size)] = digest
+        entry = {"table": table, "batch": index, "size": size, "digest": digest, "rows": rows}
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+def cut_batches(table, rows, size):
+    """Yield (index, digest, batch) for each batch of rows the journal has not recorded"""
+    for index, batch in enumerate(iter(lambda: list(islice(rows, size)), [])):
+        digest = batch_digest(batch)
+        if journal is not None and journal.is_committed(table, index, size, digest):
+            table_stats(table)["skipped_rows"] += len(batch)
+            continue
+        rejected = invalid_rows.get(table)
+        if rejected:
+            valid = [row for k, row in enumerate(batch) if index * size + k not in rejected]
+            table_stats(table)["invalid_rows"] += len(batch) - len(valid)
+            batch = valid
+            if not batch:
+                continue
+        yield index, digest, batch
+
+def backoff_delay(attempt, response=None):
+    """Seconds to wait before retry number attempt, honoring Retry-After"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    # Full jitter keeps concurrent writers from retrying in lockstep
+    return random.uniform(0, delay)
+
+def post_with_retry(url, payload, params=None, extra_headers=None):
+    """POST a payload, retrying with backoff on 429/5xx, timeouts and connection errors.
+
+    Returns (response or None, retries used). Once the retries are exhausted the
+    response is None, so the caller counts the batch as failed.
+    """
+    retries = 0
+    while True:
+        response = None
+        started = time.perf_counter()
+        try:
+            response = session.post(url, json=payload, params=params, headers=extra_headers,
+                                    timeout=REQUEST_TIMEOUT)
+            request_latencies.append(time.perf_counter() - started)
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response, retries
+        except requests.RequestException as e:
+            request_latencies.append(time.perf_counter() - started)
+            if retries >= MAX_RETRIES:
+                print(f"  Request failed: {e}")
+                return None, retries
+        if retries >= MAX_RETRIES:
+            print(f"  Giving up after {retries} retries: {response.status_code}")
+            return None, retries
+        time.sleep(backoff_delay(retries, response))
+        retries += 1
+
 def insert_data(table, data):
     """Insert data into a Supabase table"""
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    response = requests.post(url, headers=headers, json=data)
+    response, _ = post_with_retry(url, data, extra_headers=UPSERT_HEADERS)
     
-    if response.status_code in [200, 201]:
+    if response is not None and response.status_code in [200, 201]:
         print(f"✓ Inserted into {table}")
         return True
     else:
-        print(f"✗ Failed to insert into {table}: {response.status_code}")
-        print(f"  Response: {response.text[:200]}")
+        status = response.status_code if response is not None else "no response"
+        print(f"✗ Failed to insert into {table}: {status}")
+        if response is not None:
+            print(f"  Response: {response.text[:200]}")
         return False
 
-def seed_organizations():
-    """Seed organizations table"""
+def insert_batch(table, rows):
+    """Insert a list of rows with a single PostgREST array payload.
+
+    Returns (inserted row count, retries used).
+    """
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    # PostgREST requires matching keys in bulk payloads; naming the columns
+    # lets rows omit optional fields and fall back to column defaults
+    columns = sorted({key for row in rows for key in row})
+    response, retries = post_with_retry(url, rows, params={"columns": ",".join(columns)},
+                                        extra_headers=UPSERT_HEADERS)
+    
+    if response is not None and response.status_code in [200, 201]:
+        return len(rows), retries
+    status = response.status_code if response is not None else "no response"
+    print(f"✗ Failed to insert batch of {len(rows)} into {table}: {status}")
+    if response is not None:
+        print(f"  Response: {response.text[:200]}")
+    return 0, retries
+
+def bulk_insert(table, rows, size=None):
+    """Insert rows into a table in batches and record throughput"""
+    size = size or batch_size
+    stats = table_stats(table)
+    started = time.perf_counter()
+    
+    for index, digest, batch in cut_batches(table, iter(rows), size):
+        inserted, retries = insert_batch(table, batch)
+        stats["batches"] += 1
+        stats["retries"] += retries
+        stats["rows"] += inserted
+        stats["failed_rows"] += len(batch) - inserted
+        if journal is not None and inserted == len(batch):
+            journal.record(table, index, size, digest, inserted)
+    
+    stats["seconds"] += time.perf_counter() - started
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] > 0 else 0
+    print(f"✓ Inserted {stats['rows']} rows into {table} in {stats['batches']} batches ({rate:.0f} rows/s)")
+    return stats["failed_rows"] == 0
+
+def print_seed_stats():
+    """Print per-table throughput collected by bulk_insert"""
     print("\n" + "="*60)
-    print("SEEDING ORGANIZATIONS")
+    print("THROUGHPUT")
     print("="*60)
-    
-    organizations = [
+    for table, stats in seed_stats.items():
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] > 0 else 0
+        resumed = f", {stats['skipped_rows']} already seeded" if stats["skipped_rows"] else ""
+        rejected = f", {stats['invalid_rows']} invalid" if stats["invalid_rows"] else ""
+        print(f"{table.ljust(25)}: {stats['rows']} rows, {rate:.0f} rows/s, "
+              f"{stats['retries']} retries, {stats['failed_rows']} failed{rejected}{resumed}")
+    print("="*60)
+
+def get_organizations():
+    """Rows for the organizations table"""
+    return [
         {
             "id": "44444444-4444-4444-4444-444444444444",
             "name": "Metro School District",
@@ -77,17 +272,10 @@ def seed_organizations():
             "website": "https://luxury-resort.example.com"
         }
     ]
-    
-    for org in organizations:
-        insert_data("organizations", org)
 
-def seed_products():
-    """Seed products table"""
-    print("\n" + "="*60)
-    print("SEEDING PRODUCTS")
-    print("="*60)
-    
-    products = [
+def get_products():
+    """Rows for the products table"""
+    return [
         {
             "id": "22222222-2222-2222-2222-222222222201",
             "organization_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -169,62 +357,441 @@ def seed_products():
             "in_stock": True
         }
     ]
-    
-    for product in products:
-        insert_data("products", product)
 
-def get_table_count(table):
-    """Get the count of rows in a table"""
-    url = f"{SUPABASE_URL}/rest/v1/{table}?select=count"
-    headers_count = headers.copy()
-    headers_count["Prefer"] = "count=exact"
+# Row providers for the scheduler, keyed by table
+SEED_DATASETS = {
+    "organizations": get_organizations,
+    "products": get_products
+}
+
+def load_schema_tables(project_root=PROJECT_ROOT):
+    """Return the table definitions of the schema.
+
+    Migrations are parsed directly when present; database_analysis.json is
+    the fallback.
+    """
+    tables = []
+    migrations_path = project_root / "supabase" / "migrations"
+    analysis_path = project_root / "database_analysis.json"
+    if migrations_path.exists():
+        from analyze_database import analyze_migration_file
+        seen = set()
+        for migration_file in sorted(migrations_path.glob("*.sql")):
+            for table in analyze_migration_file(migration_file)["tables"]:
+                if table["name"] not in seen:
+                    seen.add(table["name"])
+                    tables.append(table)
+    elif analysis_path.exists():
+        with open(analysis_path) as f:
+            tables = json.load(f).get("tables", [])
+    return tables
+
+def load_fk_graph(project_root=PROJECT_ROOT, tables=None):
+    """Map each schema table to the set of tables its foreign keys reference.
+
+    References outside the schema (auth.users) are dropped.
+    """
+    if tables is None:
+        tables = load_schema_tables(project_root)
+    graph = {table["name"]: set() for table in tables}
+    for table in tables:
+        references = [column.get("references") for column in table["columns"]]
+        references += [constraint.get("references") for constraint in table.get("constraints", [])
+                       if constraint["type"] == "foreign_key"]
+        for reference in references:
+            if reference and reference["table"] in graph:
+                graph[table["name"]].add(reference["table"])
+    return graph
+
+UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+INTEGER_TYPES = {"smallint", "int2", "integer", "int", "int4", "bigint", "int8", "serial", "bigserial", "smallserial"}
+NUMERIC_TYPES = {"decimal", "numeric", "real", "float4", "float8", "double precision"}
+TEXT_TYPES = {"text", "varchar", "character varying", "char", "character", "citext"}
+TEMPORAL_TYPES = {"timestamptz", "timestamp", "date", "time", "timetz"}
+SERIAL_TYPES = {"serial", "bigserial", "smallserial"}
+# Rejections printed per table before the rest are only counted
+MAX_REPORTED_ERRORS = 5
+
+def value_error(value, sql_type):
+    """Describe why value cannot be stored in a column of sql_type, or return None.
+
+    Types the seeder has no rule for (enums, tsvector, vector, ...) are accepted.
+    """
+    sql_type = sql_type.lower().strip()
+    if sql_type.endswith("[]"):
+        if not isinstance(value, list):
+            return f"expected an array for {sql_type}"
+        errors = [value_error(item, sql_type[:-2]) for item in value if item is not None]
+        return next((error for error in errors if error), None)
+    base, _, modifier = sql_type.partition("(")
+    base = base.strip()
+    if base == "uuid" and not (isinstance(value, str) and UUID_PATTERN.match(value)):
+        return f"{value!r} is not a UUID"
+    if base in INTEGER_TYPES and (isinstance(value, bool) or not isinstance(value, int)):
+        return f"{value!r} is not an integer"
+    if base in NUMERIC_TYPES:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return f"{value!r} is not numeric"
+        precision, _, scale = modifier.rstrip(")").partition(",")
+        if precision.strip().isdigit() and abs(value) >= 10 ** (int(precision) - int(scale or 0)):
+            return f"{value!r} overflows {sql_type}"
+    if base == "boolean" or base == "bool":
+        if not isinstance(value, bool):
+            return f"{value!r} is not a boolean"
+    if base in TEXT_TYPES:
+        if not isinstance(value, str):
+            return f"{value!r} is not text"
+        if modifier.rstrip(")").strip().isdigit() and len(value) > int(modifier.rstrip(")")):
+            return f"text longer than {sql_type}"
+    if base in TEMPORAL_TYPES:
+        try:
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return f"{value!r} is not a valid {base}"
+    return None
+
+def load_sql_seed_keys(project_root=PROJECT_ROOT):
+    """Column values inserted by the SQL seed files, which REST-seeded rows may reference"""
+    from seed_copy import DEFAULT_SEED_FILES, ExpressionEvaluator, Literal, read_units
+    paths = [project_root / "supabase" / "seed.sql"] + [project_root / name for name in DEFAULT_SEED_FILES]
+    units = read_units([path for path in paths if path.exists()], ExpressionEvaluator(datetime.now()), set())
+    keys = {}
+    for unit in units:
+        if unit["kind"] != "copy":
+            continue
+        table = keys.setdefault(unit["table"].split(".")[-1], {})
+        for k, column in enumerate(unit["columns"]):
+            values = table.setdefault(column, set())
+            for row in unit["rows"]:
+                value = row[k]
+                if isinstance(value, Literal) and value.text.lstrip("-").isdigit():
+                    values.add(int(value.text))
+                elif isinstance(value, str):
+                    values.add(value)
+    return keys
+
+def fk_order(tables, graph):
+    """Tables with parents first; cycles fall back to the given order"""
+    ordered = []
+    remaining = list(tables)
+    while remaining:
+        ready = [table for table in remaining
+                 if not any(parent in remaining and parent != table for parent in graph.get(table, ()))]
+        ready = ready or remaining[:1]
+        ordered += ready
+        remaining = [table for table in remaining if table not in ready]
+    return ordered
+
+def validate_datasets(datasets, tables, graph, known_keys):
+    """Check every seed row against the migrations before anything is sent.
+
+    Rows with unknown columns, missing NOT NULL values without a default, values
+    of the wrong type or foreign keys that match neither another seed row nor a
+    row of the SQL seed files are rejected. Returns the rejected row positions
+    per table.
+    """
+    schema = {table["name"]: table for table in tables}
+    foreign_keys = {}
+    for name in datasets:
+        if name not in schema:
+            continue
+        table = schema[name]
+        references = {column["name"]: column["references"] for column in table["columns"] if column.get("references")}
+        for constraint in table.get("constraints", []):
+            if constraint["type"] == "foreign_key" and len(constraint["columns"]) == 1:
+                references[constraint["columns"][0]] = constraint["references"]
+        # Self-references depend on row order within a table and are left to the database
+        foreign_keys[name] = {column: (ref["table"], ref.get("column") or "id")
+                              for column, ref in references.items()
+                              if ref["table"] in schema and ref["table"] != name}
+    referenced = {ref for refs in foreign_keys.values() for ref in refs.values()}
+
+    keys = {}
+    rejected = {}
+    print("\n" + "="*60)
+    print("VALIDATION")
+    print("="*60)
+    for name in fk_order(list(datasets), graph):
+        if name not in schema:
+            print(f"⚠ {name}: not defined in the migrations, sent unchecked")
+            continue
+        columns = {column["name"]: column for column in schema[name]["columns"]}
+        required = [column["name"] for column in columns.values()
+                    if (column["is_not_null"] or column["is_primary_key"]) and not column["has_default"]
+                    and column["type"].lower() not in SERIAL_TYPES]
+        collected = {column: set() for table, column in referenced if table == name}
+        errors = []
+        bad = set()
+        for position, row in enumerate(datasets[name]()):
+            problems = [f"unknown column {column}" for column in row if column not in columns]
+            problems += [f"missing required column {column}" for column in required if row.get(column) is None]
+            for column, value in row.items():
+                if value is None or column not in columns:
+                    continue
+                problem = value_error(value, columns[column]["type"])
+                if problem:
+                    problems.append(f"{column}: {problem}")
+            for column, (parent, parent_column) in foreign_keys[name].items():
+                value = row.get(column)
+                if value is None:
+                    continue
+                # Parents outside this run are checked against the SQL seed files when they insert any rows
+                known = keys.get((parent, parent_column)) if parent in datasets else None
+                seeded = known_keys.get(parent, {}).get(parent_column)
+                if known is None and seeded is None:
+                    continue
+                if value not in (known or set()) and value not in (seeded or set()):
+                    problems.append(f"{column}: no {parent}.{parent_column} = {value}")
+            if problems:
+                bad.add(position)
+                errors.append(f"row {position}: {'; '.join(problems)}")
+                continue
+            for column, values in collected.items():
+                if row.get(column) is not None:
+                    values.add(row[column])
+        for column, values in collected.items():
+            keys[(name, column)] = values
+        if bad:
+            rejected[name] = bad
+            print(f"✗ {name}: {len(bad)} invalid rows")
+            for error in errors[:MAX_REPORTED_ERRORS]:
+                print(f"  {error}")
+            if len(errors) > MAX_REPORTED_ERRORS:
+                print(f"  ... and {len(errors) - MAX_REPORTED_ERRORS} more")
+        else:
+            print(f"✓ {name}: all rows valid")
+    print("="*60)
+    return rejected
+
+def seed_sequentially(datasets, graph, size=None):
+    """Seed one table at a time, parents before children"""
+    for table in fk_order(list(datasets), graph):
+        print("\n" + "="*60)
+        print(f"SEEDING {table.upper()}")
+        print("="*60)
+        bulk_insert(table, datasets[table](), size)
+
+def seed_concurrently(datasets, graph, workers=4, per_table_concurrency=2, size=None):
+    """Seed tables in parallel as soon as every parent table is loaded.
+
+    At most `workers` batches are in flight overall and at most
+    `per_table_concurrency` per table. Self-referencing tables are loaded one
+    batch at a time so parent rows land before their children.
+    """
+    size = size or batch_size
+    # Batches are cut lazily so providers may stream rows from disk;
+    # pending holds the next unjournaled batch of each table, None once exhausted
+    batches = {}
+    pending = {}
+    for table, provider in datasets.items():
+        batches[table] = cut_batches(table, iter(provider()), size)
+        pending[table] = next(batches[table], None)
+    # Only ordering between tables seeded in this run matters
+    parents = {table: {parent for parent in graph.get(table, set()) if parent in datasets and parent != table}
+               for table in datasets}
+    limits = {table: 1 if table in graph.get(table, set()) else per_table_concurrency for table in datasets}
     
-    response = requests.get(url, headers=headers_count)
+    in_flight = {table: 0 for table in datasets}
+    started = {}
+    done = set()
+    futures = {}
+    wall_started = time.perf_counter()
     
-    if response.status_code == 200:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while len(done) < len(datasets):
+            ready = [table for table in datasets if table not in done and parents[table] <= done]
+            if not ready and not futures:
+                # A foreign key cycle: load the rest in declaration order
+                print(f"⚠ Foreign key cycle between {', '.join(sorted(set(datasets) - done))}")
+                ready = [table for table in datasets if table not in done]
+                for table in ready:
+                    parents[table] = set()
+            
+            for table in ready:
+                while pending[table] is not None and in_flight[table] < limits[table] and len(futures) < workers:
+                    index, digest, batch = pending[table]
+                    pending[table] = next(batches[table], None)
+                    started.setdefault(table, time.perf_counter())
+                    futures[executor.submit(insert_batch, table, batch)] = (table, index, digest, len(batch))
+                    in_flight[table] += 1
+                if pending[table] is None and in_flight[table] == 0 and table not in done:
+                    done.add(table)
+            
+            if not futures:
+                continue
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table, index, digest, batch_rows = futures.pop(future)
+                try:
+                    inserted, retries = future.result()
+                except Exception as e:
+                    # Count the batch as failed and keep seeding; it is not journaled so a rerun replays it
+                    print(f"✗ Batch {index} of {table} raised {type(e).__name__}: {e}")
+                    inserted, retries = 0, 0
+                if journal is not None and inserted == batch_rows:
+                    journal.record(table, index, size, digest, inserted)
+                stats = table_stats(table)
+                stats["batches"] += 1
+                stats["retries"] += retries
+                stats["rows"] += inserted
+                stats["failed_rows"] += batch_rows - inserted
+                in_flight[table] -= 1
+                if pending[table] is None and in_flight[table] == 0:
+                    stats["seconds"] += time.perf_counter() - started[table]
+                    done.add(table)
+                    print(f"✓ Seeded {table}: {stats['rows']} rows in {stats['batches']} batches")
+    
+    wall = time.perf_counter() - wall_started
+    serial = sum(seed_stats[table]["seconds"] for table in datasets if table in seed_stats)
+    print(f"Seeded {len(datasets)} tables in {wall:.2f}s (sum of per-table times: {serial:.2f}s)")
+
+VERIFY_TABLES = [
+    "organizations",
+    "profiles",
+    "products",
+    "orders",
+    "order_items",
+    "cart_items",
+    "pricing_tiers",
+    "promotional_codes",
+    "campaigns"
+]
+
+# PostgREST count strategies: exact scans the table, planned reads the planner
+# estimate, estimated is exact below the server's max-rows and planned above it
+COUNT_MODES = ("exact", "planned", "estimated")
+
+def get_table_count(table, mode="exact"):
+    """Get the count of rows in a table.
+
+    Returns (count or None on failure, request latency in seconds).
+    """
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    started = time.perf_counter()
+    try:
+        # HEAD returns only the Content-Range header, never a body
+        response = session.head(url, params={"select": "*"}, headers={"Prefer": f"count={mode}"},
+                                timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        return None, time.perf_counter() - started
+    latency = time.perf_counter() - started
+    
+    if response.status_code in [200, 206]:
         # Extract count from Content-Range header
         content_range = response.headers.get("Content-Range", "")
-        if "/" in content_range:
-            return int(content_range.split("/")[1])
-    return 0
+        total = content_range.rpartition("/")[2]
+        if total.isdigit():
+            return int(total), latency
+    return None, latency
 
-def verify_seeding():
-    """Verify the seeded data"""
+def verify_seeding(tables=VERIFY_TABLES, mode="exact", workers=len(VERIFY_TABLES)):
+    """Verify the seeded data, fetching all table counts concurrently"""
     print("\n" + "="*60)
-    print("VERIFICATION")
+    print(f"VERIFICATION ({mode} counts)")
     print("="*60)
     
-    tables = [
-        "organizations",
-        "profiles",
-        "products",
-        "orders",
-        "order_items",
-        "cart_items",
-        "pricing_tiers",
-        "promotional_codes",
-        "campaigns"
-    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda table: get_table_count(table, mode), tables))
+    elapsed = time.perf_counter() - started
     
-    for table in tables:
-        count = get_table_count(table)
-        print(f"{table.ljust(25)}: {count} rows")
+    marker = "" if mode == "exact" else "~"
+    for table, (count, latency) in zip(tables, results):
+        shown = f"{marker}{count} rows" if count is not None else "count failed"
+        print(f"{table.ljust(25)}: {shown.ljust(18)} ({latency * 1000:.0f} ms)")
     
+    print(f"\nVerified {len(tables)} tables in {elapsed:.2f}s "
+          f"(slowest request {max((latency for _, latency in results), default=0) * 1000:.0f} ms)")
     print("="*60)
+    return {table: {"count": count, "latency_seconds": latency} for table, (count, latency) in zip(tables, results)}
+
+def ndjson_rows(path):
+    """Stream rows from an NDJSON file"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def load_data_dir(data_dir):
+    """Build scheduler datasets from <table>.ndjson files, e.g. generate_dataset.py output"""
+    datasets = {}
+    for path in sorted(Path(data_dir).glob("*.ndjson")):
+        datasets[path.stem] = lambda path=path: ndjson_rows(path)
+    return datasets
 
 def main():
+    global batch_size, session, journal, invalid_rows, SUPABASE_URL
+    parser = argparse.ArgumentParser(description="Seed the B2B+ database through the Supabase REST API")
+    parser.add_argument("--url", default=SUPABASE_URL,
+                        help="Supabase project URL (default: $SUPABASE_URL or the hosted project)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"rows per bulk insert request (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="batches in flight across all tables (default: 4)")
+    parser.add_argument("--per-table-concurrency", type=int, default=2,
+                        help="batches in flight per table (default: 2)")
+    parser.add_argument("--sequential", action="store_true",
+                        help="seed tables one after another in foreign key order")
+    parser.add_argument("--data-dir", type=Path,
+                        help="seed <table>.ndjson files from this directory instead of the built-in rows")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip batches the journal records as committed by an earlier run")
+    parser.add_argument("--journal", type=Path, default=JOURNAL_PATH,
+                        help=f"checkpoint journal path (default: {JOURNAL_PATH.name} in the project root)")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="send rows without checking them against the migrations first")
+    parser.add_argument("--verify-only", action="store_true",
+                        help="skip seeding and only report table counts")
+    parser.add_argument("--estimated", nargs="?", const="estimated", choices=COUNT_MODES[1:],
+                        help="use planner row estimates instead of exact counts when verifying "
+                             "(estimated, or planned to never scan)")
+    args = parser.parse_args()
+    
+    if not SUPABASE_KEY:
+        print("Error: SUPABASE_KEY environment variable is required")
+        print("Usage: SUPABASE_KEY=your_key python3 scripts/seed_data.py")
+        sys.exit(1)
+    
+    SUPABASE_URL = args.url.rstrip("/")
+    batch_size = max(1, args.batch_size)
+    workers = max(1, args.workers)
+    
     print("="*60)
     print("B2B+ DATABASE SEEDING")
     print("="*60)
     print(f"Supabase URL: {SUPABASE_URL}")
     print(f"Using API key: {SUPABASE_KEY[:20]}...")
     
+    if args.verify_only:
+        verify_seeding(mode=args.estimated or "exact")
+        return
+    
+    datasets = load_data_dir(args.data_dir) if args.data_dir else SEED_DATASETS
+    schema_tables = load_schema_tables()
+    fk_graph = load_fk_graph(tables=schema_tables)
+    if not args.no_validate:
+        invalid_rows = validate_datasets(datasets, schema_tables, fk_graph, load_sql_seed_keys())
+    
+    journal = SeedJournal(args.journal, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(journal.committed_batches)} batches already committed")
+    
     # Seed data
-    seed_organizations()
-    seed_products()
+    if args.sequential:
+        seed_sequentially(datasets, fk_graph)
+    else:
+        session = create_session(max(POOL_SIZE, workers))
+        print("\n" + "="*60)
+        print("SEEDING (FK-ordered, concurrent)")
+        print("="*60)
+        seed_concurrently(datasets, fk_graph, workers=workers,
+                          per_table_concurrency=max(1, args.per_table_concurrency))
+    
+    journal.close()
+    print_seed_stats()
     
     # Verify
-    verify_seeding()
+    verify_seeding(mode=args.estimated or "exact")
     
     print("\n✓ Seeding completed")
 
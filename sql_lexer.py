@@ -0,0 +1,779 @@
+#!/usr/bin/env python3
+"""
+Single-pass SQL lexer and DDL extractor for migration files and planning documents.
+
+The tokenizer understands string literals, quoted identifiers, dollar-quoted
+bodies and comments, so keywords inside them are never mistaken for DDL.
+Statements are split on top-level semicolons and only the ones that can carry
+DDL are kept, which keeps analysis linear in the size of the input.
+"""
+
+import re
+from typing import Dict, List, Any, Iterator, NamedTuple, Optional, TextIO, Tuple
+
+# Bump whenever the extracted output changes so cached analyses are rebuilt
+LEXER_VERSION = '4'
+
+class Token(NamedTuple):
+    """A lexical token with its offsets in the source text."""
+    kind: str
+    value: str
+    start: int
+    end: int
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<line_comment>--[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<dollar>\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$)
+  | (?P<string>[Ee]?')
+  | (?P<quoted_ident>"[^"\n]*(?:""[^"\n]*)*")
+  | (?P<word>[A-Za-z_][A-Za-z_0-9$]*)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<op>::|<=|>=|<>|!=|\|\||.)
+""", re.VERBOSE | re.DOTALL)
+
+# Words that can start a statement worth keeping in strict mode
+_DDL_LEADERS = {'CREATE', 'DO'}
+
+_TABLE_CONSTRAINT_WORDS = {'CONSTRAINT', 'PRIMARY', 'FOREIGN', 'UNIQUE', 'CHECK', 'EXCLUDE', 'LIKE'}
+_COLUMN_CONSTRAINT_WORDS = {
+    'NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'REFERENCES', 'UNIQUE', 'CHECK',
+    'CONSTRAINT', 'COLLATE', 'GENERATED',
+}
+_TABLE_MODIFIERS = {'GLOBAL', 'LOCAL', 'TEMP', 'TEMPORARY', 'UNLOGGED'}
+
+def _scan_string(text: str, pos: int, escapes: bool, lenient: bool) -> int:
+    """Return the end offset of the string literal opening at pos, or -1 if unterminated."""
+    i = pos + 1
+    limit = len(text)
+    if lenient:
+        # Prose apostrophes must not swallow the rest of a document
+        eol = text.find('\n', i)
+        if eol >= 0:
+            limit = eol
+    while True:
+        j = text.find("'", i, limit)
+        if j < 0:
+            return -1
+        if escapes:
+            backslashes = 0
+            k = j - 1
+            while k > pos and text[k] == '\\':
+                backslashes += 1
+                k -= 1
+            if backslashes % 2:
+                i = j + 1
+                continue
+        if text.startswith("'", j + 1):
+            i = j + 2
+            continue
+        return j + 1
+
+def _scan_block_comment(text: str, pos: int) -> int:
+    """Return the end offset of the (possibly nested) block comment opening at pos."""
+    depth = 0
+    i = pos
+    while True:
+        close = text.find('*/', i)
+        if close < 0:
+            return len(text)
+        nested = text.find('/*', i, close)
+        if nested >= 0:
+            depth += 1
+            i = nested + 2
+            continue
+        depth -= 1
+        i = close + 2
+        if depth == 0:
+            return i
+
+def _find_dollar_close(text: str, tag: str, pos: int, lenient: bool) -> int:
+    """Return the offset of the closing dollar tag, or -1 if there is none.
+
+    In lenient mode the closing tag must be followed by whitespace or a
+    semicolon, so template literals such as `$${price}` in prose are skipped.
+    """
+    close = text.find(tag, pos)
+    if not lenient:
+        return close
+    while close >= 0:
+        after = close + len(tag)
+        if after >= len(text) or text[after].isspace() or text[after] == ';':
+            return close
+        close = text.find(tag, after)
+    return -1
+
+def tokenize_sql(text: str, lenient: bool = False, skip_trivia: bool = True) -> Iterator[Token]:
+    """Tokenize SQL text in a single forward pass.
+
+    In lenient mode (used for planning documents) unterminated quotes are
+    treated as plain punctuation instead of running to the end of the text.
+    """
+    pos = 0
+    length = len(text)
+    match = _TOKEN_PATTERN.match
+    while pos < length:
+        m = match(text, pos)
+        kind = m.lastgroup
+        end = m.end()
+
+        if kind == 'string':
+            end = _scan_string(text, end - 1, escapes=(end - pos == 2), lenient=lenient)
+            if end < 0:
+                if lenient:
+                    kind, end = 'op', m.end()
+                else:
+                    end = length
+        elif kind == 'dollar':
+            tag = m.group()
+            close = -1
+            if not lenient or pos == 0 or text[pos - 1].isspace():
+                close = _find_dollar_close(text, tag, end, lenient)
+            if close >= 0:
+                kind, end = 'dollar_string', close + len(tag)
+            elif lenient:
+                kind, end = 'op', pos + 1
+            else:
+                kind, end = 'dollar_string', length
+        elif kind == 'block_comment':
+            end = _scan_block_comment(text, pos)
+
+        if not (skip_trivia and kind in ('space', 'line_comment', 'block_comment')):
+            yield Token(kind, text[pos:end], pos, end)
+        pos = end
+
+def iter_statements(tokens: Iterator[Token], lenient: bool = False) -> Iterator[List[Token]]:
+    """Group tokens into statements split on semicolons.
+
+    In strict mode only statements starting with a DDL leader are buffered;
+    everything else (INSERT, UPDATE, ...) is drained without being stored.
+    """
+    statement = []
+    keep = None
+    for tok in tokens:
+        if tok.kind == 'op' and tok.value == ';':
+            if keep and statement:
+                statement.append(tok)
+                yield statement
+            statement = []
+            keep = None
+            continue
+        if keep is None:
+            keep = lenient or (tok.kind == 'word' and tok.value.upper() in _DDL_LEADERS)
+        if keep:
+            statement.append(tok)
+    if keep and statement:
+        yield statement
+
+def dollar_body(tok: Token) -> str:
+    """Return the body of a dollar-quoted string without its delimiters."""
+    tag_end = tok.value.index('$', 1) + 1
+    tag = tok.value[:tag_end]
+    if len(tok.value) >= 2 * tag_end and tok.value.endswith(tag):
+        return tok.value[tag_end:-tag_end]
+    return tok.value[tag_end:]
+
+def render_tokens(tokens: List[Token]) -> str:
+    """Render tokens back to SQL with comments dropped and whitespace collapsed."""
+    parts = []
+    prev = None
+    for tok in tokens:
+        if prev is not None and tok.start > prev.end:
+            parts.append(' ')
+        parts.append(tok.value)
+        prev = tok
+    return ''.join(parts)
+
+def _word(tok: Token) -> Optional[str]:
+    """Return the upper-cased keyword for word tokens, None otherwise."""
+    return tok.value.upper() if tok.kind == 'word' else None
+
+def _is_op(toks: List[Token], i: int, value: str) -> bool:
+    return i < len(toks) and toks[i].kind == 'op' and toks[i].value == value
+
+def _is_word(toks: List[Token], i: int, *words: str) -> bool:
+    return i < len(toks) and _word(toks[i]) in words
+
+def _skip_words(toks: List[Token], i: int, *words: str) -> int:
+    """Skip an exact keyword sequence if present."""
+    for k, word in enumerate(words):
+        if not _is_word(toks, i + k, word):
+            return i
+    return i + len(words)
+
+def _ident(tok: Token) -> str:
+    if tok.kind == 'quoted_ident':
+        return tok.value[1:-1].replace('""', '"')
+    return tok.value
+
+def _parse_name(toks: List[Token], i: int) -> Tuple[Optional[str], int]:
+    """Parse a possibly schema-qualified name and return its last component."""
+    if i >= len(toks) or toks[i].kind not in ('word', 'quoted_ident'):
+        return None, i
+    name = _ident(toks[i])
+    i += 1
+    while _is_op(toks, i, '.') and i + 1 < len(toks) and toks[i + 1].kind in ('word', 'quoted_ident'):
+        name = _ident(toks[i + 1])
+        i += 2
+    return name, i
+
+def _parse_qualified_name(toks: List[Token], i: int) -> Tuple[Optional[str], int]:
+    """Parse a possibly schema-qualified name and return it in dotted form."""
+    if i >= len(toks) or toks[i].kind not in ('word', 'quoted_ident'):
+        return None, i
+    parts = [_ident(toks[i])]
+    i += 1
+    while _is_op(toks, i, '.') and i + 1 < len(toks) and toks[i + 1].kind in ('word', 'quoted_ident'):
+        parts.append(_ident(toks[i + 1]))
+        i += 2
+    return '.'.join(parts), i
+
+def _paren_elements(toks: List[Token], i: int) -> Tuple[Optional[List[List[Token]]], int]:
+    """Split the parenthesised group opening at i on top-level commas.
+
+    Returns the element token lists and the index just past the closing paren.
+    """
+    elements = []
+    current = []
+    depth = 0
+    for k in range(i, len(toks)):
+        tok = toks[k]
+        if tok.kind == 'op':
+            if tok.value in ('(', '['):
+                depth += 1
+                if depth == 1:
+                    continue
+            elif tok.value in (')', ']'):
+                depth -= 1
+                if depth == 0:
+                    if current:
+                        elements.append(current)
+                    return elements, k + 1
+            elif tok.value == ',' and depth == 1:
+                elements.append(current)
+                current = []
+                continue
+        current.append(tok)
+    return None, i
+
+def _parse_column_list(toks: List[Token], i: int) -> Tuple[List[str], int]:
+    """Parse '(a, b, ...)' at i into column names."""
+    if not _is_op(toks, i, '('):
+        return [], i
+    elements, end = _paren_elements(toks, i)
+    if elements is None:
+        return [], i
+    columns = [_ident(element[0]) for element in elements if element[0].kind in ('word', 'quoted_ident')]
+    return columns, end
+
+def _parse_references(toks: List[Token], i: int) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse the target of a REFERENCES clause; i points just past REFERENCES."""
+    table, i = _parse_qualified_name(toks, i)
+    if table is None:
+        return None, i
+    columns, i = _parse_column_list(toks, i)
+    on_delete = None
+    while i < len(toks):
+        if _is_word(toks, i, 'ON') and _is_word(toks, i + 1, 'DELETE'):
+            action = []
+            k = i + 2
+            while _is_word(toks, k, 'CASCADE', 'RESTRICT', 'NO', 'ACTION', 'SET', 'NULL', 'DEFAULT'):
+                action.append(toks[k].value.upper())
+                k += 1
+            on_delete = ' '.join(action) or None
+            i = k
+        elif _is_word(toks, i, 'ON', 'UPDATE', 'MATCH', 'FULL', 'PARTIAL', 'SIMPLE', 'DEFERRABLE',
+                      'INITIALLY', 'DEFERRED', 'IMMEDIATE', 'NOT', 'CASCADE', 'RESTRICT', 'NO',
+                      'ACTION', 'SET', 'NULL', 'DEFAULT'):
+            i += 1
+        else:
+            break
+    reference = {
+        'table': table,
+        'column': columns[0] if columns else None,
+        'on_delete': on_delete
+    }
+    return reference, i
+
+def _parse_table_constraint(element: List[Token]) -> Optional[Dict[str, Any]]:
+    """Parse a table-level PRIMARY KEY, UNIQUE, FOREIGN KEY or CHECK constraint."""
+    i = 0
+    if _is_word(element, i, 'CONSTRAINT'):
+        i += 2
+    word = _word(element[i]) if i < len(element) else None
+
+    if word == 'PRIMARY' and _is_word(element, i + 1, 'KEY'):
+        columns, _ = _parse_column_list(element, i + 2)
+        return {'type': 'primary_key', 'columns': columns}
+    if word == 'UNIQUE':
+        i = _skip_words(element, i + 1, 'NULLS', 'NOT', 'DISTINCT')
+        i = _skip_words(element, i, 'NULLS', 'DISTINCT')
+        columns, _ = _parse_column_list(element, i)
+        return {'type': 'unique', 'columns': columns}
+    if word == 'FOREIGN' and _is_word(element, i + 1, 'KEY'):
+        columns, i = _parse_column_list(element, i + 2)
+        reference = None
+        if _is_word(element, i, 'REFERENCES'):
+            reference, _ = _parse_references(element, i + 1)
+        return {'type': 'foreign_key', 'columns': columns, 'references': reference}
+    if word == 'CHECK':
+        return {'type': 'check', 'columns': []}
+    return None
+
+def _parse_column(text: str, element: List[Token], include_source: bool) -> Optional[Dict[str, Any]]:
+    """Parse a column definition from a CREATE TABLE element."""
+    if len(element) < 2 or _word(element[0]) in _TABLE_CONSTRAINT_WORDS:
+        return None
+    if element[0].kind not in ('word', 'quoted_ident'):
+        return None
+
+    # The type runs until the first column constraint keyword
+    depth = 0
+    type_end = len(element)
+    for k in range(1, len(element)):
+        tok = element[k]
+        if tok.kind == 'op' and tok.value in ('(', '['):
+            depth += 1
+        elif tok.kind == 'op' and tok.value in (')', ']'):
+            depth -= 1
+        elif depth == 0 and _word(tok) in _COLUMN_CONSTRAINT_WORDS:
+            type_end = k
+            break
+    if type_end == 1:
+        return None
+
+    constraint_words = []
+    reference = None
+    depth = 0
+    for k in range(type_end, len(element)):
+        tok = element[k]
+        if tok.kind == 'op' and tok.value == '(':
+            depth += 1
+        elif tok.kind == 'op' and tok.value == ')':
+            depth -= 1
+        elif depth == 0 and tok.kind == 'word':
+            constraint_words.append(tok.value.upper())
+            if reference is None and constraint_words[-1] == 'REFERENCES':
+                reference, _ = _parse_references(element, k + 1)
+    pairs = set(zip(constraint_words, constraint_words[1:]))
+
+    column = {
+        'name': _ident(element[0]),
+        'type': render_tokens(element[1:type_end]),
+        'is_primary_key': ('PRIMARY', 'KEY') in pairs,
+        'is_foreign_key': 'REFERENCES' in constraint_words,
+        'is_not_null': ('NOT', 'NULL') in pairs,
+        'has_default': 'DEFAULT' in constraint_words,
+        'is_unique': 'UNIQUE' in constraint_words,
+        'references': reference
+    }
+    if include_source:
+        column['definition'] = text[element[0].start:element[-1].end]
+    return column
+
+def _parse_table(text: str, toks: List[Token], i: int, start: Token, include_source: bool) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse CREATE TABLE; i points just past the TABLE keyword."""
+    i = _skip_words(toks, i, 'IF', 'NOT', 'EXISTS')
+    name, i = _parse_name(toks, i)
+    if name is None or not _is_op(toks, i, '('):
+        return None, i
+    elements, end = _paren_elements(toks, i)
+    if elements is None:
+        return None, i
+
+    columns = []
+    constraints = []
+    for element in elements:
+        if _word(element[0]) in _TABLE_CONSTRAINT_WORDS:
+            constraint = _parse_table_constraint(element)
+            if constraint:
+                constraints.append(constraint)
+            continue
+        column = _parse_column(text, element, include_source)
+        if column:
+            columns.append(column)
+
+    table = {
+        'name': name,
+        'column_count': len(columns),
+        'columns': columns,
+        'constraints': constraints
+    }
+    if include_source:
+        stop = toks[end] if _is_op(toks, end, ';') else toks[end - 1]
+        table['full_definition'] = text[start.start:stop.end]
+    return table, end
+
+def _index_element(element: List[Token]) -> Tuple[str, bool]:
+    """Return (column or expression text, is_expression) for one index element."""
+    if element[0].kind in ('word', 'quoted_ident'):
+        # A bare column may be followed by an opclass, COLLATE, ASC/DESC or NULLS
+        if all(tok.kind in ('word', 'quoted_ident') or (tok.kind == 'op' and tok.value == '.') for tok in element[1:]):
+            return _ident(element[0]), False
+    return render_tokens(element), True
+
+def _parse_index(toks: List[Token], i: int, unique: bool) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse CREATE INDEX; i points just past the INDEX keyword."""
+    i = _skip_words(toks, i, 'CONCURRENTLY')
+    i = _skip_words(toks, i, 'IF', 'NOT', 'EXISTS')
+    name = None
+    if not _is_word(toks, i, 'ON'):
+        name, i = _parse_name(toks, i)
+    if not _is_word(toks, i, 'ON'):
+        return None, i
+    i = _skip_words(toks, i + 1, 'ONLY')
+    table, i = _parse_name(toks, i)
+    if table is None:
+        return None, i
+
+    index = {
+        'name': name,
+        'table': table,
+        'unique': unique,
+        'method': 'btree',
+        'columns': [],
+        'has_expressions': False,
+        'where': None
+    }
+    if _is_word(toks, i, 'USING') and i + 1 < len(toks):
+        index['method'] = toks[i + 1].value.lower()
+        i += 2
+    if _is_op(toks, i, '('):
+        elements, end = _paren_elements(toks, i)
+        if elements is not None:
+            for element in elements:
+                column, is_expression = _index_element(element)
+                index['columns'].append(column)
+                index['has_expressions'] = index['has_expressions'] or is_expression
+            i = end
+
+    # INCLUDE, WITH and TABLESPACE clauses do not change what the index covers
+    while i < len(toks) and not _is_word(toks, i, 'WHERE') and not _is_op(toks, i, ';'):
+        if _is_op(toks, i, '('):
+            _, end = _paren_elements(toks, i)
+            i = max(end, i + 1)
+        else:
+            i += 1
+    if _is_word(toks, i, 'WHERE'):
+        end = i + 1
+        while end < len(toks) and not _is_op(toks, end, ';'):
+            end += 1
+        index['where'] = render_tokens(toks[i + 1:end])
+        i = end
+    return index, i
+
+def _parse_function(toks: List[Token], i: int) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse CREATE FUNCTION; i points just past the FUNCTION keyword."""
+    name, i = _parse_name(toks, i)
+    if name is None or not _is_op(toks, i, '('):
+        return None, i
+    _, i = _paren_elements(toks, i)
+
+    function = {
+        'name': name,
+        'language': None,
+        'volatility': 'VOLATILE',
+        'security_definer': False
+    }
+    # Attributes may appear before or after the body, in any order
+    while i < len(toks) and not _is_op(toks, i, ';'):
+        word = _word(toks[i])
+        if word == 'LANGUAGE' and i + 1 < len(toks):
+            function['language'] = _ident(toks[i + 1]).lower()
+            i += 1
+        elif word in ('STABLE', 'IMMUTABLE', 'VOLATILE'):
+            function['volatility'] = word
+        elif word == 'SECURITY' and _is_word(toks, i + 1, 'DEFINER'):
+            function['security_definer'] = True
+        elif word == 'CREATE':
+            break
+        i += 1
+    return function, i
+
+def _parse_trigger(toks: List[Token], i: int) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse CREATE TRIGGER; i points just past the TRIGGER keyword."""
+    name, i = _parse_name(toks, i)
+    if name is None:
+        return None, i
+    while i < len(toks) and _word(toks[i]) != 'ON':
+        i += 1
+    table, i = _parse_name(toks, i + 1)
+    if table is None:
+        return None, i
+    return {'name': name, 'table': table}, i
+
+def _parse_policy(toks: List[Token], i: int) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse CREATE POLICY; i points just past the POLICY keyword."""
+    name, i = _parse_name(toks, i)
+    if name is None or not _is_word(toks, i, 'ON'):
+        return None, i
+    table, i = _parse_name(toks, i + 1)
+    if table is None:
+        return None, i
+
+    policy = {
+        'name': name,
+        'table': table,
+        'command': 'ALL',
+        'roles': [],
+        'using': None,
+        'with_check': None
+    }
+    while i < len(toks):
+        word = _word(toks[i])
+        if word == 'AS' and i + 1 < len(toks):
+            i += 2
+        elif word == 'FOR' and i + 1 < len(toks):
+            policy['command'] = toks[i + 1].value.upper()
+            i += 2
+        elif word == 'TO':
+            i += 1
+            while i < len(toks) and toks[i].kind in ('word', 'quoted_ident'):
+                policy['roles'].append(_ident(toks[i]))
+                i += 1
+                if not _is_op(toks, i, ','):
+                    break
+                i += 1
+        elif word in ('USING', 'WITH'):
+            key = 'using' if word == 'USING' else 'with_check'
+            i = _skip_words(toks, i + 1, 'CHECK')
+            if not _is_op(toks, i, '('):
+                break
+            elements, end = _paren_elements(toks, i)
+            if elements is None:
+                break
+            policy[key] = render_tokens(toks[i + 1:end - 1])
+            i = end
+        else:
+            break
+    return policy, i
+
+def _empty_result() -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        'tables': [],
+        'indexes': [],
+        'functions': [],
+        'triggers': [],
+        'policies': []
+    }
+
+def _parse_statement(text: str, toks: List[Token], result: Dict[str, List[Dict[str, Any]]], include_source: bool):
+    """Extract every DDL object found in one statement into result."""
+    i = 0
+    while i < len(toks):
+        word = _word(toks[i])
+
+        if word == 'DO':
+            # Anonymous blocks run their DDL at migration time, so parse the body too
+            k = i + 1
+            while k < len(toks) and toks[k].kind != 'dollar_string':
+                k += 1
+            if k < len(toks):
+                _parse_block_body(dollar_body(toks[k]), result, include_source)
+            i = k + 1
+            continue
+
+        if word != 'CREATE':
+            i += 1
+            continue
+
+        start = toks[i]
+        k = _skip_words(toks, i + 1, 'OR', 'REPLACE')
+        while _is_word(toks, k, *_TABLE_MODIFIERS):
+            k += 1
+        unique = _is_word(toks, k, 'UNIQUE')
+        k = _skip_words(toks, k, 'UNIQUE')
+        k = _skip_words(toks, k, 'CONSTRAINT')
+        kind = _word(toks[k]) if k < len(toks) else None
+
+        if kind == 'TABLE':
+            item, end = _parse_table(text, toks, k + 1, start, include_source)
+            key = 'tables'
+        elif kind == 'INDEX':
+            item, end = _parse_index(toks, k + 1, unique)
+            key = 'indexes'
+        elif kind == 'FUNCTION':
+            item, end = _parse_function(toks, k + 1)
+            key = 'functions'
+        elif kind == 'TRIGGER':
+            item, end = _parse_trigger(toks, k + 1)
+            key = 'triggers'
+        elif kind == 'POLICY':
+            item, end = _parse_policy(toks, k + 1)
+            key = 'policies'
+        else:
+            item, end = None, k
+
+        if item is not None:
+            result[key].append(item)
+        i = max(end, i + 1)
+
+def _parse_block_body(body: str, result: Dict[str, List[Dict[str, Any]]], include_source: bool):
+    """Extract the DDL of a DO block body into result.
+
+    Body statements rarely start with CREATE (BEGIN, IF ... THEN), so every
+    statement is kept and searched for CREATE wherever it appears.
+    """
+    for statement in iter_statements(tokenize_sql(body), lenient=True):
+        _parse_statement(body, statement, result, include_source)
+
+def parse_sql(text: str, lenient: bool = False, include_source: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract tables, indexes, functions, triggers and policies in one pass.
+
+    Set lenient for SQL embedded in prose; include_source adds the raw
+    column and table definitions to the output. DDL inside DO blocks counts:
+
+    >>> [t['name'] for t in parse_sql("DO $$ BEGIN CREATE TABLE inner_t (x int); END $$;")['tables']]
+    ['inner_t']
+    >>> [p['name'] for p in parse_sql(
+    ...     "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE policyname = 'p') THEN "
+    ...     "CREATE POLICY p ON orders FOR SELECT USING (true); END IF; END $$;")['policies']]
+    ['p']
+    """
+    result = _empty_result()
+    for statement in iter_statements(tokenize_sql(text, lenient=lenient), lenient=lenient):
+        _parse_statement(text, statement, result, include_source)
+    return result
+
+# Streaming mode: statements are cut from a chunked reader so that only the
+# statement being kept (plus one chunk) is ever held in memory.
+
+_STREAM_SPECIAL = re.compile(r"""['";]|--|/\*|(?<![A-Za-z0-9_$])\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$""")
+_STREAM_SPACE = re.compile(r'\s*')
+_STREAM_WORD = re.compile(r'[A-Za-z_]+')
+_STREAM_ESCAPE_STRING = re.compile(r"[\\']")
+_STREAM_BLOCK_COMMENT = re.compile(r'/\*|\*/')
+
+# Unscanned tail kept between chunks so openers such as $tag$ are never split
+_STREAM_MARGIN = 256
+
+def iter_statement_texts(stream: TextIO, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """Yield the text of each DDL statement read incrementally from stream.
+
+    Statements that do not start with a DDL leader (INSERT ... VALUES blocks,
+    UPDATEs, COPY data) are scanned for their terminating semicolon but
+    never accumulated, so memory stays bounded by the chunk size and the
+    largest DDL statement.
+    """
+    buf = ''
+    pos = 0
+    eof = False
+    mode = 'normal'
+    tag = ''
+    depth = 0
+    started = False
+    stmt_start = None
+
+    while True:
+        limit = len(buf) if eof else len(buf) - _STREAM_MARGIN
+        need_data = False
+
+        if mode == 'normal' and not started:
+            pos = _STREAM_SPACE.match(buf, pos).end()
+            if pos >= limit:
+                need_data = True
+            elif buf.startswith('--', pos):
+                mode, pos = 'line_comment', pos + 2
+            elif buf.startswith('/*', pos):
+                mode, depth, pos = 'block_comment', 1, pos + 2
+            else:
+                started = True
+                word = _STREAM_WORD.match(buf, pos)
+                if word and word.group().upper() in _DDL_LEADERS:
+                    stmt_start = pos
+        elif mode == 'normal':
+            m = _STREAM_SPECIAL.search(buf, pos)
+            if m is None or m.start() >= limit:
+                pos = max(pos, limit)
+                need_data = True
+            else:
+                token = m.group()
+                pos = m.end()
+                if token == ';':
+                    if stmt_start is not None:
+                        yield buf[stmt_start:pos]
+                    started = False
+                    stmt_start = None
+                elif token == "'":
+                    escaped = (m.start() > 0 and buf[m.start() - 1] in 'Ee'
+                               and (m.start() < 2 or not (buf[m.start() - 2].isalnum() or buf[m.start() - 2] == '_')))
+                    mode = 'escape_string' if escaped else 'string'
+                elif token == '"':
+                    mode = 'quoted'
+                elif token == '--':
+                    mode = 'line_comment'
+                elif token == '/*':
+                    mode, depth = 'block_comment', 1
+                else:
+                    mode, tag = 'dollar', token
+        elif mode in ('string', 'quoted'):
+            quote = "'" if mode == 'string' else '"'
+            j = buf.find(quote, pos)
+            if j < 0 or (j + 1 == len(buf) and not eof):
+                # A quote at the very end may be the first half of a doubled quote
+                pos = len(buf) if j < 0 else j
+                need_data = True
+            elif buf.startswith(quote, j + 1):
+                pos = j + 2
+            else:
+                mode, pos = 'normal', j + 1
+        elif mode == 'escape_string':
+            m = _STREAM_ESCAPE_STRING.search(buf, pos)
+            if m is None or (m.end() == len(buf) and not eof):
+                pos = len(buf) if m is None else m.start()
+                need_data = True
+            elif m.group() == '\\':
+                pos = m.end() + 1
+            elif buf.startswith("'", m.end()):
+                pos = m.end() + 1
+            else:
+                mode, pos = 'normal', m.end()
+        elif mode == 'line_comment':
+            j = buf.find('\n', pos)
+            if j < 0:
+                pos = len(buf)
+                need_data = True
+            else:
+                mode, pos = 'normal', j + 1
+        elif mode == 'block_comment':
+            m = _STREAM_BLOCK_COMMENT.search(buf, pos)
+            if m is None:
+                pos = max(pos, len(buf) - 1)
+                need_data = True
+            else:
+                depth += 1 if m.group() == '/*' else -1
+                pos = m.end()
+                if depth == 0:
+                    mode = 'normal'
+        else:
+            j = buf.find(tag, pos)
+            if j < 0:
+                pos = max(pos, len(buf) - len(tag) + 1)
+                need_data = True
+            else:
+                mode, pos = 'normal', j + len(tag)
+
+        if not need_data:
+            continue
+        if eof:
+            if stmt_start is not None and buf[stmt_start:].strip():
+                yield buf[stmt_start:]
+            return
+
+        # Drop everything already consumed, unless it belongs to a kept statement
+        drop = stmt_start if stmt_start is not None else pos
+        chunk = stream.read(chunk_size)
+        buf = buf[drop:] + chunk
+        pos -= drop
+        if stmt_start is not None:
+            stmt_start = 0
+        eof = not chunk
+
+def parse_sql_stream(stream: TextIO, chunk_size: int = 1 << 20) -> Dict[str, List[Dict[str, Any]]]:
+    """Streaming counterpart of parse_sql for files too large to load at once."""
+    result = _empty_result()
+    for statement_text in iter_statement_texts(stream, chunk_size):
+        for statement in iter_statements(tokenize_sql(statement_text)):
+            _parse_statement(statement_text, statement, result, include_source=False)
+    return result